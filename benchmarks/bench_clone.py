@@ -0,0 +1,48 @@
+"""Game cloning benchmark.
+
+Run from the repository root with ``python -m benchmarks.bench_clone``.
+Compares ``Game.clone`` with ``copy.deepcopy`` on a card game with a shoe,
+dealt hands, tableaus and a board.
+"""
+import copy
+import time
+
+from component import Card
+from container import Board, CardContainer, ContainerContainer
+from examples.blackjack import create_blackjack_deck, deal_initial_cards
+from game import CardGame
+from player import Player
+
+
+def build_game(number_of_decks: int = 6, number_of_players: int = 4) -> CardGame:
+    deck = create_blackjack_deck(number_of_decks)
+    players = [Player(f"Player {i}") for i in range(number_of_players)]
+    for left, right in zip(players[::2], players[1::2]):
+        deal_initial_cards(deck, left.hand, right.hand)
+    game = CardGame(players=players, deck=deck)
+    # extra state hung off the game the way examples/mottainai.py does
+    game.tableaus = [ContainerContainer(containers=[CardContainer(name="works"), CardContainer(name="materials")])
+                     for _ in players]
+    for tableau in game.tableaus:
+        tableau.containers[0].add_component(Card("Work"))
+    game.board = Board(width=8, height=8, board_type="hex")
+    return game
+
+
+def time_per_call(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(repeat: int = 200):
+    game = build_game()
+    deepcopy_time = time_per_call(lambda: copy.deepcopy(game), repeat)
+    clone_time = time_per_call(game.clone, repeat)
+    print(f"deepcopy: {deepcopy_time * 1e6:8.1f} us")
+    print(f"   clone: {clone_time * 1e6:8.1f} us  ({deepcopy_time / clone_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Component construction benchmark.
+
+Run from the repository root with ``python -m benchmarks.bench_components``.
+Compares building playing cards with the regular dataclasses against the
+slotted ``Compact*`` classes, reporting time and retained memory per card.
+"""
+import time
+import tracemalloc
+
+from component import StandardPlayingCard, CompactStandardPlayingCard, IdAllocator, use_id_allocator
+
+SUITS = "HDCS"
+VALUES = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+
+
+def build_cards(card_class, number_of_decks: int) -> list:
+    return [card_class(name=value, suit=suit, value=value)
+            for _ in range(number_of_decks)
+            for suit in SUITS
+            for value in VALUES]
+
+
+def measure(card_class, number_of_decks: int):
+    """Return (seconds per card, bytes per card) for building the cards."""
+    start = time.perf_counter()
+    cards = build_cards(card_class, number_of_decks)
+    elapsed = time.perf_counter() - start
+    del cards
+
+    tracemalloc.start()
+    cards = build_cards(card_class, number_of_decks)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / len(cards), retained / len(cards)
+
+
+def main(number_of_decks: int = 2000):
+    with use_id_allocator(IdAllocator()):
+        for card_class in (StandardPlayingCard, CompactStandardPlayingCard):
+            per_card, size = measure(card_class, number_of_decks)
+            print(f"{card_class.__name__:>28}: {per_card * 1e9:7.1f} ns, {size:6.1f} bytes per card")
+
+
+if __name__ == "__main__":
+    main()
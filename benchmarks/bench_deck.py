@@ -0,0 +1,37 @@
+"""Deck draw benchmark.
+
+Run from the repository root with ``python -m benchmarks.bench_deck``. The cost
+per drawn card should stay flat as the number of decks in the shoe grows.
+"""
+import time
+
+from component import StandardPlayingCard
+from container import Deck
+
+
+def build_shoe(number_of_decks: int) -> Deck:
+    cards = [StandardPlayingCard(name=str(value), suit=suit, value=str(value))
+             for _ in range(number_of_decks)
+             for suit in "HDCS"
+             for value in range(13)]
+    return Deck(components=cards)
+
+
+def time_draw_all(number_of_decks: int) -> float:
+    """Return the seconds per card spent dealing a whole shoe one card at a time."""
+    deck = build_shoe(number_of_decks)
+    size = deck.deck_size()
+    start = time.perf_counter()
+    while deck.deck_size():
+        deck.draw_card()
+    return (time.perf_counter() - start) / size
+
+
+def main():
+    for number_of_decks in (1, 8, 64, 512):
+        per_card = time_draw_all(number_of_decks)
+        print(f"{number_of_decks:>4} decks: {per_card * 1e9:8.1f} ns per draw")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Type filtering benchmark.
+
+Run from the repository root with ``python -m benchmarks.bench_filter``.
+Compares ``Container.of_type``/``count_of_type`` with an ``isinstance`` scan
+over containers holding tens of thousands of mixed components.
+"""
+import time
+
+from component import Card, Piece, StandardPlayingCard, TwoSidedCard
+from container import Container
+
+
+def build_container(size: int) -> Container:
+    container = Container()
+    for i in range(size):
+        kind = i % 10
+        if kind == 0:
+            container.add_component(Piece(f"Piece {i}"))
+        elif kind == 1:
+            container.add_component(TwoSidedCard(front=Card("Front"), back=Card("Back")))
+        else:
+            container.add_component(StandardPlayingCard(suit="H", value=str(i % 13)))
+    return container
+
+
+def time_per_call(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(repeat: int = 200):
+    for size in (10_000, 50_000):
+        container = build_container(size)
+        container.count_of_type(Piece)  # build the buckets outside the timing
+        scan = time_per_call(lambda: sum(1 for c in container.components if isinstance(c, Piece)), repeat)
+        counted = time_per_call(lambda: container.count_of_type(Piece), repeat)
+        scan_list = time_per_call(lambda: [c for c in container.components if isinstance(c, Piece)], repeat)
+        bucketed = time_per_call(lambda: container.of_type(Piece), repeat)
+        print(f"{size:>6} components: count scan {scan * 1e6:9.1f} us, count_of_type {counted * 1e6:6.2f} us; "
+              f"filter scan {scan_list * 1e6:9.1f} us, of_type {bucketed * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Benchmark suite for the core library with stored regression baselines.
+
+Run from the repository root::
+
+    python -m benchmarks.suite                  # compare with the saved baseline, warn on regressions
+    python -m benchmarks.suite --save-baseline  # record this machine's baseline
+    python -m benchmarks.suite --fail           # exit with status 1 on a regression (for CI)
+
+Every case reports the best time per operation over several repeats. A case
+regresses when it is more than ``--threshold`` (default 25%) slower than its
+baseline. Baselines are specific to the machine they were recorded on, so
+``baseline.json`` is not committed; record one locally before comparing.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.bench_deck import build_shoe
+from catalog import CardCatalog
+from component import Card
+from container import Board, Container
+from controller.action import MoveCard
+from controller.controller import ActionController
+from evaluation import blackjack_total, poker_score_codes
+from examples.blackjack import create_blackjack_deck
+from game import CardGame
+from player import Player
+from rng import RandomStream
+import snapshot
+
+try:
+    import numpy as np
+    import card_array
+except ImportError:  # NumPy is optional
+    np = card_array = None
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# name -> factory returning (operation to time, operations per call)
+CASES: Dict[str, Callable[[], "Case"]] = {}
+
+
+@dataclass
+class Case:
+    run: Callable[[], None]
+    operations: int = 1
+
+
+def benchmark(name: str):
+    """Register a case factory. The factory does the setup and returns a ``Case``."""
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+@benchmark("deck.build")
+def _deck_build():
+    return Case(lambda: create_blackjack_deck())
+
+
+@benchmark("deck.build_catalog")
+def _deck_build_catalog():
+    catalog = CardCatalog()
+    return Case(lambda: create_blackjack_deck(catalog=catalog))
+
+
+@benchmark("deck.shuffle_6_decks")
+def _deck_shuffle():
+    deck = create_blackjack_deck(6)
+    return Case(deck.shuffle)
+
+
+@benchmark("deck.lazy_shuffle_draw_10")
+def _deck_lazy_shuffle():
+    deck = create_blackjack_deck(6)
+    deck.rng = RandomStream(0)
+    deck.lazy_shuffle = True
+    cards = deck.get_components()
+
+    def shuffle_and_draw():
+        deck.components = list(cards)
+        deck.shuffle()
+        deck.draw_card(10)
+    return Case(shuffle_and_draw)
+
+
+@benchmark("deck.deal_6_decks")
+def _deck_deal():
+    cards = create_blackjack_deck(6).get_components()
+    deck = build_shoe(0)
+
+    def deal():
+        deck.components = list(cards)
+        while deck.deck_size():
+            deck.draw_card()
+    return Case(deal, len(cards))
+
+
+def _container_case(size: int, indexed: bool):
+    def factory():
+        cards = [Card(f"Card {i}") for i in range(size)]
+        container = Container(components=list(cards), indexed=indexed)
+        probes = random.Random(size).sample(cards, min(size, 100))
+
+        def add_remove_contains():
+            for card in probes:
+                container.remove_component(card)
+                container.add_component(card)
+                container.contains(card)
+        return Case(add_remove_contains, len(probes))
+    return factory
+
+
+for _size in (100, 1_000, 10_000):
+    benchmark(f"container.add_remove_contains_{_size}")(_container_case(_size, indexed=False))
+    benchmark(f"container.indexed.add_remove_contains_{_size}")(_container_case(_size, indexed=True))
+
+
+def _board_build_case(board_type: str):
+    return lambda: Case(lambda: Board(width=100, height=100, board_type=board_type))
+
+
+def _board_access_case(board_type: str):
+    def factory():
+        board = Board(width=100, height=100, board_type=board_type)
+        rng = random.Random(0)
+        coordinates = [(rng.randrange(100), rng.randrange(100)) for _ in range(1_000)]
+
+        def access():
+            for x, y in coordinates:
+                board.get_cell(x, y)
+        return Case(access, len(coordinates))
+    return factory
+
+
+for _board_type in ("square", "hex"):
+    benchmark(f"board.build_{_board_type}_100x100")(_board_build_case(_board_type))
+    benchmark(f"board.get_cell_{_board_type}")(_board_access_case(_board_type))
+
+
+@benchmark("controller.undo_redo")
+def _undo_redo():
+    source = [Card(f"Card {i}") for i in range(500)]
+    destination = []
+    controller = ActionController()
+    for card in list(source):
+        controller.execute(MoveCard(card, source, destination))
+
+    def undo_redo():
+        for _ in range(500):
+            controller.undo()
+        for _ in range(500):
+            controller.redo()
+    return Case(undo_redo, 1_000)
+
+
+@benchmark("controller.undo_redo_indexed")
+def _undo_redo_indexed():
+    source = Container(components=[Card(f"Card {i}") for i in range(500)], indexed=True)
+    destination = Container(indexed=True)
+    controller = ActionController()
+    for card in list(source.get_components()):
+        controller.execute(MoveCard(card, source, destination))
+
+    def undo_redo():
+        for _ in range(500):
+            controller.undo()
+        for _ in range(500):
+            controller.redo()
+    return Case(undo_redo, 1_000)
+
+
+def _random_hands(count: int, size: int) -> List[List[int]]:
+    rng = random.Random(0)
+    return [rng.sample(range(52), size) for _ in range(count)]
+
+
+@benchmark("evaluation.blackjack_total")
+def _blackjack_total():
+    deck = create_blackjack_deck(6).get_components()
+    hands = [deck[start:start + 3] for start in range(0, 300, 3)]
+
+    def score():
+        for hand in hands:
+            blackjack_total(hand)
+    return Case(score, len(hands))
+
+
+@benchmark("evaluation.poker_7")
+def _poker_7():
+    hands = _random_hands(1_000, 7)
+    # Build the lookup tables before timing.
+    poker_score_codes(hands[0])
+
+    def score():
+        for hand in hands:
+            poker_score_codes(hand)
+    return Case(score, len(hands))
+
+
+if card_array is not None:
+    @benchmark("evaluation.poker_7_batch")
+    def _poker_7_batch():
+        codes = np.array(_random_hands(10_000, 7), dtype=card_array.CODE_DTYPE)
+        card_array.poker_scores(codes)
+        return Case(lambda: card_array.poker_scores(codes), len(codes))
+
+
+def _dealt_game() -> CardGame:
+    game = CardGame(players=[Player(f"Player {i}") for i in range(4)], deck=create_blackjack_deck(6))
+    for player in game.players:
+        for card in game.deck.draw_card(5):
+            player.hand.add_component(card)
+    return game
+
+
+@benchmark("snapshot.dumps")
+def _snapshot_dumps():
+    game = _dealt_game()
+    return Case(lambda: snapshot.dumps(game))
+
+
+@benchmark("snapshot.loads")
+def _snapshot_loads():
+    data = snapshot.dumps(_dealt_game())
+    return Case(lambda: snapshot.loads(data))
+
+
+def measure(case: Case, repeat: int = 5, min_time: float = 0.05) -> float:
+    """Best seconds per operation over ``repeat`` runs of at least ``min_time`` each."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            case.run()
+        best = min(best, time.perf_counter() - start)
+    return best / loops / case.operations
+
+
+def run(names: Optional[List[str]] = None, repeat: int = 5, min_time: float = 0.05) -> Dict[str, float]:
+    results = {}
+    for name, factory in CASES.items():
+        if names is None or any(pattern in name for pattern in names):
+            results[name] = measure(factory(), repeat, min_time)
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> Dict[str, float]:
+    """Cases slower than ``baseline`` by more than ``threshold``, mapped to their slowdown ratio."""
+    return {name: seconds / baseline[name] for name, seconds in results.items()
+            if baseline.get(name) and seconds / baseline[name] > 1 + threshold}
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path: str, results: Dict[str, float]):
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--fail", action="store_true", help="exit with status 1 when a case regresses")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = run(args.cases or None, args.repeat)
+    baseline = load_baseline(args.baseline)
+    regressions = compare(results, baseline, args.threshold)
+    for name, seconds in results.items():
+        line = f"{name:<48}{seconds * 1e9:>12.1f} ns/op"
+        if baseline.get(name):
+            line += f"  {seconds / baseline[name]:>6.2f}x baseline"
+        if name in regressions:
+            line += "  REGRESSION"
+        print(line)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+    elif not baseline:
+        print("No baseline found; run with --save-baseline to record one.")
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}.", file=sys.stderr)
+        return 1 if args.fail else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
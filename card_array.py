@@ -0,0 +1,259 @@
+"""NumPy backend storing batches of decks and hands as integer card codes.
+
+Row ``b`` of every array belongs to the ``b``-th simulated deck or hand, so one
+call shuffles, deals or counts the whole batch. Codes come from a ``CardCodec``
+(``card_codes.default_codec`` unless given), and ``from_deck``/``to_decks``
+convert to and from the object model in ``component``/``container``. Card ids
+travel alongside the codes in an object array, so converting back yields cards
+equal to the originals.
+
+NumPy is only needed for this module; the rest of the library does not import it.
+"""
+import weakref
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from component import Card
+from container import Deck, Hand
+from card_codes import CardCodec, default_codec, RANK_INDEX, STANDARD_CARD_COUNT, SUIT_INDEX, VALUES
+from evaluation import BLACKJACK_POINTS, poker_tables
+
+CODE_DTYPE = np.int16
+
+
+# Per codec: (standard code, rank index) of every code seen so far. Codecs only
+# ever grow, so the tables are extended with the codes added since the last call.
+_code_tables: "weakref.WeakKeyDictionary[CardCodec, Tuple[np.ndarray, np.ndarray]]" = weakref.WeakKeyDictionary()
+
+
+def _tables_for(codec: CardCodec) -> Tuple[np.ndarray, np.ndarray]:
+    tables = _code_tables.get(codec)
+    known = 0 if tables is None else len(tables[0])
+    if known == len(codec):
+        return tables
+    added = np.full(len(codec) - known, -1, dtype=np.int16)
+    for code in range(max(known, STANDARD_CARD_COUNT), len(codec)):
+        card = codec.decode(code)
+        value, suit = getattr(card, "value", None), getattr(card, "suit", None)
+        if card.front_side_up and value in RANK_INDEX and suit in SUIT_INDEX:
+            added[code - known] = RANK_INDEX[value] * 4 + SUIT_INDEX[suit]
+    if known < STANDARD_CARD_COUNT:
+        added[:STANDARD_CARD_COUNT - known] = np.arange(known, STANDARD_CARD_COUNT)
+    ranks = np.where(added >= 0, added >> 2, -1).astype(np.int8)
+    if tables is not None:
+        added, ranks = np.concatenate([tables[0], added]), np.concatenate([tables[1], ranks])
+    added.flags.writeable = ranks.flags.writeable = False
+    tables = _code_tables[codec] = added, ranks
+    return tables
+
+
+def standard_table(codec: CardCodec = default_codec) -> np.ndarray:
+    """Read-only array mapping every code of ``codec`` to the standard code of the same card, -1 for others.
+
+    Codes 0-51 map to themselves. Other face-up cards with a standard suit and
+    value, such as ``catalog.CatalogCard``s, map to the standard code they
+    stand for, so they count and score like ``StandardPlayingCard``s.
+    """
+    return _tables_for(codec)[0]
+
+
+def rank_table(codec: CardCodec = default_codec) -> np.ndarray:
+    """Read-only array mapping every code of ``codec`` to its rank index, -1 for non-standard cards."""
+    return _tables_for(codec)[1]
+
+
+def _standard_codes(codes: np.ndarray) -> np.ndarray:
+    codes = np.asarray(codes)
+    if codes.ndim == 1:
+        codes = codes[np.newaxis, :]
+    if codes.size and (codes.min() < 0 or codes.max() >= STANDARD_CARD_COUNT):
+        raise ValueError("Hands must hold standard face-up cards only.")
+    return codes
+
+
+def blackjack_totals(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Best blackjack total and softness of every row of standard codes."""
+    codes = _standard_codes(codes)
+    points = np.asarray(BLACKJACK_POINTS, dtype=np.int16)[codes >> 2]
+    totals = points.sum(axis=1, dtype=np.int32)
+    soft = (points == 1).any(axis=1) & (totals <= 11)
+    return totals + 10 * soft, soft
+
+
+_poker_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+
+def _poker_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # evaluation's tables as sorted rank keys, their scores and the flush table.
+    global _poker_arrays
+    if _poker_arrays is None:
+        tables = poker_tables()
+        keys = np.fromiter(tables.ranks.keys(), dtype=np.int64, count=len(tables.ranks))
+        scores = np.fromiter(tables.ranks.values(), dtype=np.int32, count=len(tables.ranks))
+        order = keys.argsort()
+        _poker_arrays = keys[order], scores[order], np.asarray(tables.flushes, dtype=np.int32)
+    return _poker_arrays
+
+
+def poker_scores(codes: np.ndarray) -> np.ndarray:
+    """``evaluation.poker_score`` of every row of 5 to 7 distinct standard codes."""
+    codes = _standard_codes(codes)
+    keys, key_scores, flushes = _poker_tables()
+    ranks = (codes >> 2).astype(np.int64)
+    hand_keys = (np.int64(1) << 3 * ranks).sum(axis=1)
+    found = np.searchsorted(keys, hand_keys).clip(max=len(keys) - 1)
+    if (keys[found] != hand_keys).any():
+        raise ValueError("Poker hands must be 5 to 7 cards with at most four of a rank.")
+    scores = key_scores[found]
+    bits = np.int64(1) << ranks
+    suits = codes & 3
+    for suit in range(4):
+        masks = np.where(suits == suit, bits, 0).sum(axis=1)
+        np.maximum(scores, flushes[masks], out=scores)
+    return scores
+
+
+class _CodeArray:
+    """Shared conversion helpers for ``ArrayDeck`` and ``ArrayHand``."""
+
+    def __init__(self, codes: np.ndarray, ids: Optional[np.ndarray] = None, codec: CardCodec = default_codec):
+        codes = np.asarray(codes, dtype=CODE_DTYPE)
+        if codes.ndim == 1:
+            codes = codes[np.newaxis, :]
+        if ids is not None:
+            ids = np.asarray(ids, dtype=object).reshape(codes.shape)
+        self.codes = codes
+        self.ids = ids
+        self.codec = codec
+
+    @property
+    def batch_size(self) -> int:
+        return self.codes.shape[0]
+
+    @staticmethod
+    def _encode(cards: Iterable[Card], batch_size: int, codec: CardCodec):
+        cards = list(cards)
+        codes = np.array(codec.encode_all(cards), dtype=CODE_DTYPE)
+        ids = np.empty(len(cards), dtype=object)
+        ids[:] = [card.id for card in cards]
+        return np.tile(codes, (batch_size, 1)), np.tile(ids, (batch_size, 1))
+
+    def _decode_row(self, codes: np.ndarray, ids: Optional[np.ndarray]) -> List[Card]:
+        decode = self.codec.decode
+        if ids is None:
+            return [decode(int(code)) for code in codes]
+        return [decode(int(code), card_id) for code, card_id in zip(codes, ids)]
+
+    def _counts(self, codes: np.ndarray, table: np.ndarray, bins: int) -> np.ndarray:
+        keys = table[codes].astype(np.int64)
+        valid = keys >= 0
+        keys = np.where(valid, keys + bins * np.arange(codes.shape[0])[:, np.newaxis], 0)
+        counts = np.bincount(keys[valid], minlength=bins * codes.shape[0])
+        return counts.reshape(codes.shape[0], bins)
+
+
+class ArrayDeck(_CodeArray):
+    """A batch of equally sized decks; column ``top`` is the top of each deck.
+
+    All decks are dealt in lockstep, so drawing ``k`` cards moves one shared top
+    pointer and costs O(batch * k).
+    """
+
+    def __init__(self, codes: np.ndarray, ids: Optional[np.ndarray] = None,
+                 codec: CardCodec = default_codec, rng: Optional[np.random.Generator] = None):
+        super().__init__(codes, ids, codec)
+        self.top = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    @classmethod
+    def from_deck(cls, deck: Iterable[Card], batch_size: int = 1, codec: CardCodec = default_codec,
+                  rng: Optional[np.random.Generator] = None) -> "ArrayDeck":
+        """Encode a ``Deck`` (or any card iterable) and repeat it ``batch_size`` times."""
+        codes, ids = cls._encode(deck, batch_size, codec)
+        return cls(codes, ids, codec, rng)
+
+    def remaining(self) -> np.ndarray:
+        """View of the undrawn codes, shape ``(batch_size, deck_size())``."""
+        return self.codes[:, self.top:]
+
+    def deck_size(self) -> int:
+        return self.codes.shape[1] - self.top
+
+    def shuffle(self):
+        """Independently shuffle the undrawn cards of every deck in the batch."""
+        order = self.rng.random(self.remaining().shape).argsort(axis=1)
+        self.codes[:, self.top:] = np.take_along_axis(self.remaining(), order, axis=1)
+        if self.ids is not None:
+            self.ids[:, self.top:] = np.take_along_axis(self.ids[:, self.top:], order, axis=1)
+
+    def draw(self, number_of_cards: int = 1) -> "ArrayHand":
+        """Draw from the top of every deck, returning the cards as an ``ArrayHand``."""
+        hand = self.peek(number_of_cards)
+        self.top += number_of_cards
+        return hand
+
+    def peek(self, number_of_cards: int = 1) -> "ArrayHand":
+        if number_of_cards > self.deck_size():
+            raise ValueError("Not enough cards in the deck to draw the requested number of cards.")
+        window = slice(self.top, self.top + number_of_cards)
+        ids = self.ids[:, window].copy() if self.ids is not None else None
+        return ArrayHand(self.codes[:, window].copy(), ids, self.codec)
+
+    def count(self, codes: Iterable[int]) -> np.ndarray:
+        """Number of undrawn cards per deck whose code is in ``codes``."""
+        return np.isin(self.remaining(), list(codes)).sum(axis=1)
+
+    def rank_counts(self) -> np.ndarray:
+        """Undrawn cards per deck and rank, shape ``(batch_size, 13)``."""
+        return self._counts(self.remaining(), rank_table(self.codec), len(VALUES))
+
+    def to_decks(self) -> List[Deck]:
+        """Decode the undrawn cards of every deck into ``Deck`` objects."""
+        ids = self.ids[:, self.top:] if self.ids is not None else [None] * self.batch_size
+        return [Deck(components=self._decode_row(codes, row_ids))
+                for codes, row_ids in zip(self.remaining(), ids)]
+
+
+class ArrayHand(_CodeArray):
+    """A batch of equally sized hands, one row per hand."""
+
+    @classmethod
+    def empty(cls, batch_size: int, codec: CardCodec = default_codec) -> "ArrayHand":
+        return cls(np.empty((batch_size, 0), dtype=CODE_DTYPE), np.empty((batch_size, 0), dtype=object), codec)
+
+    @classmethod
+    def from_hand(cls, hand: Iterable[Card], batch_size: int = 1, codec: CardCodec = default_codec) -> "ArrayHand":
+        codes, ids = cls._encode(hand, batch_size, codec)
+        return cls(codes, ids, codec)
+
+    def hand_size(self) -> int:
+        return self.codes.shape[1]
+
+    def add(self, cards: "ArrayHand"):
+        """Append the cards of another batch (e.g. the result of ``ArrayDeck.draw``)."""
+        if cards.batch_size != self.batch_size:
+            raise ValueError("Batch sizes do not match.")
+        self.codes = np.concatenate([self.codes, cards.codes], axis=1)
+        if self.ids is not None and cards.ids is not None:
+            self.ids = np.concatenate([self.ids, cards.ids], axis=1)
+        else:
+            self.ids = None
+
+    def count(self, codes: Iterable[int]) -> np.ndarray:
+        return np.isin(self.codes, list(codes)).sum(axis=1)
+
+    def rank_counts(self) -> np.ndarray:
+        return self._counts(self.codes, rank_table(self.codec), len(VALUES))
+
+    def standard_codes(self) -> np.ndarray:
+        """The hands as standard codes; raises ``ValueError`` if any card is not a face-up standard card."""
+        return _standard_codes(standard_table(self.codec)[self.codes])
+
+    def blackjack_totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        return blackjack_totals(self.standard_codes())
+
+    def poker_scores(self) -> np.ndarray:
+        return poker_scores(self.standard_codes())
+
+    def to_hands(self) -> List[Hand]:
+        ids = self.ids if self.ids is not None else [None] * self.batch_size
+        return [Hand(components=self._decode_row(codes, row_ids)) for codes, row_ids in zip(self.codes, ids)]
@@ -0,0 +1,82 @@
+from dataclasses import fields
+from typing import Any, Dict, List, Optional, Tuple
+from component import Card, StandardPlayingCard
+
+# Standard 52-card layout: code = rank * 4 + suit, with ranks ordered low to high.
+VALUES = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+SUITS = ("C", "D", "H", "S")
+STANDARD_NAMES = {"J": "Jack", "Q": "Queen", "K": "King", "A": "Ace"}
+RANK_INDEX = {value: rank for rank, value in enumerate(VALUES)}
+SUIT_INDEX = {suit: index for index, suit in enumerate(SUITS)}
+STANDARD_CARD_COUNT = len(VALUES) * len(SUITS)
+
+
+def standard_code(suit: str, value: str) -> int:
+    """Return the code of a standard face-up card, e.g. ``standard_code("H", "A")``."""
+    return RANK_INDEX[value] * 4 + SUIT_INDEX[suit]
+
+
+def code_rank(code: int) -> int:
+    """Rank index (0 for "2" up to 12 for "A") of a standard code."""
+    return code >> 2
+
+
+def code_suit(code: int) -> int:
+    """Suit index into ``SUITS`` of a standard code."""
+    return code & 3
+
+
+class CardCodec:
+    """Two-way mapping between card objects and small integer codes.
+
+    Every distinct card definition (concrete type plus all fields except ``id``)
+    gets one code. Codes 0-51 are reserved for the face-up standard cards in the
+    ``rank * 4 + suit`` layout, using the names ``create_blackjack_deck`` gives
+    them; any other definition, including face-down cards, is appended on first
+    use. Decoding a code therefore rebuilds an equal card, apart from ``id``,
+    which callers pass through separately when they need it.
+    """
+
+    def __init__(self):
+        self.definitions: List[Tuple[type, Tuple[Any, ...]]] = []
+        self._codes: Dict[Tuple[type, Tuple[Any, ...]], int] = {}
+        self._field_names: Dict[type, Tuple[str, ...]] = {}
+        for value in VALUES:
+            for suit in SUITS:
+                self.encode(StandardPlayingCard(name=STANDARD_NAMES.get(value, value), suit=suit, value=value))
+
+    def _fields_of(self, card_type: type) -> Tuple[str, ...]:
+        names = self._field_names.get(card_type)
+        if names is None:
+            names = tuple(f.name for f in fields(card_type) if f.name != "id")
+            self._field_names[card_type] = names
+        return names
+
+    def encode(self, card: Card) -> int:
+        card_type = type(card)
+        key = (card_type, tuple(getattr(card, name) for name in self._fields_of(card_type)))
+        code = self._codes.get(key)
+        if code is None:
+            code = len(self.definitions)
+            self._codes[key] = code
+            self.definitions.append(key)
+        return code
+
+    def encode_all(self, cards) -> List[int]:
+        return [self.encode(card) for card in cards]
+
+    def decode(self, code: int, id: Optional[Any] = None) -> Card:
+        card_type, values = self.definitions[code]
+        card = card_type(**dict(zip(self._field_names[card_type], values)))
+        if id is not None:
+            card.id = id
+        return card
+
+    def is_standard(self, code: int) -> bool:
+        return 0 <= code < STANDARD_CARD_COUNT
+
+    def __len__(self) -> int:
+        return len(self.definitions)
+
+
+default_codec = CardCodec()
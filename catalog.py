@@ -0,0 +1,135 @@
+"""Flyweight card catalog.
+
+A ``CardCatalog`` interns immutable ``CardDefinition`` objects: defining the same
+card twice returns the same definition. ``CatalogCard`` instances hold only
+per-instance state (id, ``front_side_up``, owner) and a reference to their
+definition, so a thousand six-deck shoes built from one catalog share 52
+definitions between them instead of each card carrying its own name, suit and
+value.
+
+Definition attributes read through the card (``card.suit``, ``card.value``, or
+any extra attribute such as ``card.cost`` for collectible-style cards), so code
+written against ``StandardPlayingCard`` keeps working.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from card_codes import STANDARD_NAMES, SUITS, VALUES
+from component import AbstractComponent, Card, next_id
+
+
+@dataclass(frozen=True)
+class CardDefinition:
+    """What a card is, independent of any copy of it. ``attributes`` holds extra
+    ``(name, value)`` pairs in name order."""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    suit: Optional[str] = None
+    value: Optional[str] = None
+    attributes: Tuple[Tuple[str, Any], ...] = ()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        for key, value in self.attributes:
+            if key == name:
+                return value
+        return default
+
+    def clone(self, memo: Optional[Dict[int, Any]] = None):
+        # Definitions are immutable and shared by clones of their cards.
+        return self
+
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class CatalogCard(AbstractComponent):
+    definition: CardDefinition
+    id: Any = field(default_factory=next_id)
+    front_side_up: bool = True
+    owner: Any = None
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.definition.name
+
+    @property
+    def description(self) -> Optional[str]:
+        return self.definition.description
+
+    @property
+    def suit(self) -> Optional[str]:
+        return self.definition.suit
+
+    @property
+    def value(self) -> Optional[str]:
+        return self.definition.value
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names that are not slots or properties.
+        if name == "definition":
+            raise AttributeError(name)
+        value = self.definition.get(name, _MISSING)
+        if value is _MISSING:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return value
+
+    def flip(self):
+        self.front_side_up = not self.front_side_up
+
+    def get_info(self):
+        if self.suit is not None and self.value is not None:
+            return f"{self.value} of {self.suit}"
+        return f"{self.name} ({type(self).__name__})"
+
+    def clone(self, memo: Optional[Dict[int, Any]] = None):
+        copied = CatalogCard(self.definition, self.id, self.front_side_up, self.owner)
+        if memo is not None:
+            memo[id(self)] = copied
+        return copied
+
+
+Card.register(CatalogCard)
+
+
+class CardCatalog:
+    """Interned card definitions, each stored once however many cards use it."""
+
+    def __init__(self):
+        self._definitions: Dict[CardDefinition, CardDefinition] = {}
+        self._standard_deck: Optional[List[CardDefinition]] = None
+
+    def define(self, name: Optional[str] = None, description: Optional[str] = None, suit: Optional[str] = None,
+               value: Optional[str] = None, **attributes: Any) -> CardDefinition:
+        """Return the catalog's definition with these values, adding it on first use.
+
+        Extra attributes must be hashable.
+        """
+        return self.intern(CardDefinition(name, description, suit, value, tuple(sorted(attributes.items()))))
+
+    def intern(self, definition: CardDefinition) -> CardDefinition:
+        """Return the catalog's copy of ``definition`` (e.g. one loaded from a snapshot)."""
+        return self._definitions.setdefault(definition, definition)
+
+    def standard_deck(self) -> List[CardDefinition]:
+        """Definitions of the 52 standard playing cards, named as ``create_blackjack_deck`` names them."""
+        if self._standard_deck is None:
+            self._standard_deck = [self.define(name=STANDARD_NAMES.get(value, value), suit=suit, value=value)
+                                   for suit in SUITS for value in VALUES]
+        return list(self._standard_deck)
+
+    def cards(self, definitions: List[CardDefinition], copies: int = 1, owner: Any = None) -> List[CatalogCard]:
+        """New cards, ``copies`` of each definition in turn."""
+        return [CatalogCard(definition, owner=owner) for _ in range(copies) for definition in definitions]
+
+    def __contains__(self, definition: CardDefinition) -> bool:
+        return definition in self._definitions
+
+    def __iter__(self) -> Iterator[CardDefinition]:
+        return iter(self._definitions)
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+
+default_catalog = CardCatalog()
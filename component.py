@@ -1,11 +1,56 @@
-from dataclasses import dataclass, field
-from typing import Any, List, Dict, Type, Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, List, Dict, Type, Optional
+from contextlib import contextmanager
+import itertools
 import uuid
 from abc import ABC, abstractmethod
+from utils import clone_object, clone_value
+
+
+class IdAllocator:
+    """Hands out monotonically increasing integer ids, e.g. one allocator per game."""
+
+    def __init__(self, start: int = 0):
+        self._counter = itertools.count(start)
+
+    def __call__(self) -> int:
+        return next(self._counter)
+
+
+def uuid_ids() -> uuid.UUID:
+    """Id allocator producing random uuids, for ids that must be globally unique."""
+    return uuid.uuid4()
+
+
+_id_allocator: Callable[[], Any] = IdAllocator()
+
+
+def next_id() -> Any:
+    """Return an id from the current allocator (used by the compact components)."""
+    return _id_allocator()
+
+
+def set_id_allocator(allocator: Callable[[], Any]) -> Callable[[], Any]:
+    """Replace the allocator used by ``next_id`` and return the previous one."""
+    global _id_allocator
+    previous, _id_allocator = _id_allocator, allocator
+    return previous
+
+
+@contextmanager
+def use_id_allocator(allocator: Callable[[], Any]):
+    """Temporarily allocate ids from ``allocator``, e.g. while building one game."""
+    previous = set_id_allocator(allocator)
+    try:
+        yield allocator
+    finally:
+        set_id_allocator(previous)
 
 
 @dataclass
 class AbstractComponent(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_info(self):
         """Return information about the component."""
@@ -21,6 +66,10 @@ class Component(AbstractComponent):
     def get_info(self):
         return f"{self.name} ({type(self).__name__})"
 
+    def clone(self, memo: Optional[Dict[int, Any]] = None):
+        """Copy the component, sharing immutable field values such as names and ids."""
+        return clone_object(self, memo)
+
 
 @dataclass
 class Card(Component):
@@ -58,3 +107,64 @@ class StandardPlayingCard(Card):
 @dataclass
 class Piece(Component):
     pass
+
+
+_slot_names_cache: Dict[type, tuple] = {}
+
+
+def _slot_names(cls: type) -> tuple:
+    names = _slot_names_cache.get(cls)
+    if names is None:
+        names = _slot_names_cache[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+# Slotted counterparts of the classes above for building very large numbers of
+# components. They have no per-instance __dict__ and take their id from
+# ``next_id`` (a per-process integer counter unless another allocator is
+# installed). Each is registered as a virtual subclass of its regular
+# counterpart, so type checks such as CardContainer's accept them.
+@dataclass(slots=True)
+class CompactComponent(AbstractComponent):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    id: Any = field(default_factory=next_id)
+
+    def get_info(self):
+        return f"{self.name} ({type(self).__name__})"
+
+    def clone(self, memo: Optional[Dict[int, Any]] = None):
+        memo = {} if memo is None else memo
+        copied = object.__new__(type(self))
+        memo[id(self)] = copied
+        for name in _slot_names(type(self)):
+            object.__setattr__(copied, name, clone_value(getattr(self, name), memo))
+        return copied
+
+
+@dataclass(slots=True)
+class CompactCard(CompactComponent):
+    front_side_up: bool = True
+
+    def flip(self):
+        self.front_side_up = not self.front_side_up
+
+
+@dataclass(slots=True)
+class CompactStandardPlayingCard(CompactCard):
+    suit: str = None
+    value: str = None
+
+    def get_info(self):
+        return f"{self.value} of {self.suit}"
+
+
+@dataclass(slots=True)
+class CompactPiece(CompactComponent):
+    pass
+
+
+Component.register(CompactComponent)
+Card.register(CompactCard)
+StandardPlayingCard.register(CompactStandardPlayingCard)
+Piece.register(CompactPiece)
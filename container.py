@@ -1,9 +1,14 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Type, Optional, Set, Any
+from typing import List, Dict, Type, Optional, Set, Any, Tuple
 from abc import ABC, abstractmethod
 from component import Component, Card
+from utils import clone_object
+from events import bus
+import logging
 import random
 import json
+from collections.abc import Sequence
+from functools import lru_cache
 from os.path import exists
 
 
@@ -29,44 +34,447 @@ class AbstractContainer(ABC):
         """Clear all components from container."""
         pass  # pragma: no cover
 
+    def clone(self, memo: Optional[Dict[int, Any]] = None):
+        """Copy the container structure and the components it holds.
+
+        Immutable values (names, ids, suits, ...) are shared with the original;
+        every list, container and component is copied, so mutating the clone
+        never affects the original. ``memo`` maps ``id()`` of already copied
+        objects to their copies, as with ``copy.deepcopy``.
+        """
+        return clone_object(self, memo)
+
+
+logger = logging.getLogger(__name__)
+
+
+class _ComponentIndex:
+    """Maps ``Component.id`` to a position in a container's component list.
+
+    Every component owns a slot, and slots are in list order. Removing a
+    component only marks its slot dead (a tombstone), and a Fenwick tree over
+    the live slots turns a slot into a position in O(log n), so neither removal
+    nor lookup renumbers the components after it. Slots below ``first`` belong
+    to components already removed from the front, so drawing from the top of a
+    deck costs O(1) per card. An insertion reuses a tombstone between its
+    neighbours (as undoing a removal does); when there is none, or once
+    tombstones outnumber live slots, the index is marked ``stale`` and rebuilt
+    on the next lookup. Membership (``slots``) is always exact.
+    """
+    __slots__ = ("slots", "alive", "tree", "first", "skipped", "stale")
+
+    def __init__(self, components: List[Component]):
+        self.rebuild(components)
+
+    def __contains__(self, component_id) -> bool:
+        return component_id in self.slots
+
+    def rebuild(self, components: List[Component]):
+        count = len(components)
+        # Free slots in front of the first component, for insertions at the front.
+        padding = count // 8 + 8
+        self.slots = {component.id: padding + position for position, component in enumerate(components)}
+        self.alive = bytearray(padding) + b"\x01" * count
+        tree = [0]
+        tree.extend(self.alive)
+        size = len(tree)
+        for node in range(1, size):
+            parent = node + (node & -node)
+            if parent < size:
+                tree[parent] += tree[node]
+        self.tree = tree
+        self.first = padding
+        # Live bits counted in the tree below ``first``.
+        self.skipped = 0
+        self.stale = False
+
+    def _prefix(self, slot: int) -> int:
+        """Number of live bits in slots ``[0, slot)``."""
+        tree, total = self.tree, 0
+        while slot:
+            total += tree[slot]
+            slot &= slot - 1
+        return total
+
+    def _add(self, slot: int, delta: int):
+        tree = self.tree
+        slot += 1
+        size = len(tree)
+        while slot < size:
+            tree[slot] += delta
+            slot += slot & -slot
+
+    def position(self, component_id, components: List[Component]) -> Optional[int]:
+        """Position of ``component_id`` in ``components``, checked against the list before it is returned."""
+        slot = self.slots.get(component_id)
+        if slot is None:
+            return None
+        if not self.stale:
+            position = self._prefix(slot) - self.skipped
+            if position < len(components) and components[position].id == component_id:
+                return position
+        # Stale, or the list was changed behind the index's back.
+        self.rebuild(components)
+        slot = self.slots.get(component_id)
+        return None if slot is None else slot - self.first
+
+    def appended(self, component: Component, position: int):
+        if self.stale:
+            self.slots[component.id] = -1
+            return
+        slot = len(self.alive)
+        self.alive.append(1)
+        # A new Fenwick node covers the live bits of (slot + 1 - lowbit, slot + 1].
+        node = slot + 1
+        self.tree.append(1 + self._prefix(slot) - self._prefix(node - (node & -node)))
+        self.slots[component.id] = slot
+
+    def inserted(self, component: Component, position: int, components: List[Component]):
+        """Record ``component`` inserted at ``position`` of ``components`` (not at the end)."""
+        if not self.stale:
+            if position == 0:
+                slot = self.first - 1
+            else:
+                before, after = self.slots[components[position - 1].id], self.slots[components[position + 1].id]
+                slot = after - 1 if after - before > 1 and before >= 0 else -1
+            if slot >= 0:
+                if position == 0:
+                    self.first = slot
+                    if self.alive[slot]:
+                        self.skipped -= 1
+                if not self.alive[slot]:
+                    self.alive[slot] = 1
+                    self._add(slot, 1)
+                self.slots[component.id] = slot
+                return
+            self.stale = True
+        self.slots[component.id] = -1
+
+    def _kill(self, slot: int):
+        self.alive[slot] = 0
+        self._add(slot, -1)
+
+    def _check_tombstones(self):
+        if len(self.alive) > 2 * len(self.slots) + 64:
+            self.stale = True
+
+    def removed(self, component: Component, position: int):
+        slot = self.slots.pop(component.id)
+        if self.stale:
+            return
+        if position == 0:
+            # Every slot between ``first`` and this one is already dead.
+            self.first = slot + 1
+            self.skipped += 1
+        else:
+            self._kill(slot)
+        self._check_tombstones()
+
+    def removed_front(self, components: List[Component]):
+        slots = self.slots
+        for component in components:
+            slot = slots.pop(component.id)
+        if components and not self.stale:
+            self.first = slot + 1
+            self.skipped += len(components)
+            self._check_tombstones()
+
+    def removed_back(self, components: List[Component], remaining: int):
+        slots = self.slots
+        for component in components:
+            slot = slots.pop(component.id)
+            if not self.stale:
+                self._kill(slot)
+        self._check_tombstones()
+
+    def reordered(self):
+        self.stale = True
+
+
+class _TypeBuckets:
+    """Components of a container grouped by concrete type.
+
+    Each bucket maps ``id(component)`` to the component, so adding and removing
+    is O(1); ``extra`` counts additional references to an object that was added
+    more than once. Queries by a base class combine the buckets of every
+    matching concrete type, found with ``issubclass`` (so registered virtual
+    subclasses match too) and cached until a new concrete type shows up.
+    ``size`` counts the references held, so the container can tell when its
+    list changed without going through it.
+    """
+    __slots__ = ("buckets", "extra", "matching", "size")
+
+    def __init__(self, components: List[Component]):
+        self.buckets: Dict[type, Dict[int, Component]] = {}
+        self.extra: Dict[int, int] = {}
+        self.matching: Dict[type, List[Dict[int, Component]]] = {}
+        self.size = 0
+        for component in components:
+            self.add(component)
+
+    def add(self, component: Component):
+        self.size += 1
+        component_type = type(component)
+        bucket = self.buckets.get(component_type)
+        if bucket is None:
+            bucket = self.buckets[component_type] = {}
+            self.matching.clear()
+        key = id(component)
+        if key in bucket:
+            self.extra[key] = self.extra.get(key, 0) + 1
+        else:
+            bucket[key] = component
+
+    def remove(self, component: Component):
+        self.size -= 1
+        key = id(component)
+        extra = self.extra.get(key)
+        if extra:
+            if extra == 1:
+                del self.extra[key]
+            else:
+                self.extra[key] = extra - 1
+            return
+        del self.buckets[type(component)][key]
+
+    def _matching(self, component_type: type) -> List[Dict[int, Component]]:
+        found = self.matching.get(component_type)
+        if found is None:
+            found = self.matching[component_type] = [
+                bucket for bucket_type, bucket in self.buckets.items() if issubclass(bucket_type, component_type)]
+        return found
+
+    def of_type(self, component_type: type) -> List[Component]:
+        found = []
+        for bucket in self._matching(component_type):
+            found.extend(bucket.values())
+        if self.extra:
+            found.extend(component for component in list(found)
+                         for _ in range(self.extra.get(id(component), 0)))
+        return found
+
+    def count(self, component_type: type) -> int:
+        buckets = self._matching(component_type)
+        count = sum(len(bucket) for bucket in buckets)
+        if self.extra:
+            count += sum(extra for key, extra in self.extra.items() if any(key in bucket for bucket in buckets))
+        return count
+
 
 @dataclass
 class Container(AbstractContainer):
+    """Generic holder of components.
+
+    By default membership follows the list semantics of ``components``:
+    ``remove_component`` drops the first component that is *equal* to the
+    argument, comparing every dataclass field. With ``indexed=True`` the container
+    also keeps a dictionary keyed on ``Component.id``; membership, removal and
+    position lookups then match on the id (the same logical component, even if a
+    field such as ``front_side_up`` differs), and a component can only be held
+    once. Membership is O(1); finding a position is O(log n), and so is the
+    index's share of a removal, though removing from the middle still shifts the
+    rest of the list down (a fast C-level move, but O(n)). The index tracks changes made through the container's methods, so
+    code mutating ``components`` directly should do so on unindexed containers.
+    """
     allowable_component_types: Set[Type[Component]] = field(default_factory=set)
     components: List[Component] = field(default_factory=list)
     # Sets limit on how many components can be within the given container.
     max_capacity: Optional[int] = None
     name: str = None
-
-    def add_component(self, component: Component):
+    # Keep an id-keyed index for fast contains/remove/index_of.
+    indexed: bool = False
+    _index: Optional[_ComponentIndex] = field(default=None, init=False, repr=False, compare=False)
+    # Built by the first of_type/count_of_type query, then kept up to date.
+    _buckets: Optional[_TypeBuckets] = field(default=None, init=False, repr=False, compare=False)
+
+    def _component_index(self) -> _ComponentIndex:
+        if self._index is None:
+            self._index = _ComponentIndex(self.components)
+        return self._index
+
+    def _check_addable(self, component: Component):
         if self.allowable_component_types and not isinstance(component, tuple(self.allowable_component_types)):
             raise ValueError(f"Component of type {type(component).__name__} is not allowed in this container.")
 
         if self.max_capacity is not None and len(self.components) >= self.max_capacity:
             raise ValueError("Maximum capacity reached, cannot add more components.")
 
+        if self.indexed and component.id in self._component_index():
+            raise ValueError("Component is already in this container.")
+
+    def check_addable(self, components: List[Component]):
+        """Raise ValueError if adding ``components`` one after another would fail, without adding any."""
+        for component in components:
+            self._check_addable(component)
+        if self.max_capacity is not None and len(self.components) + len(components) > self.max_capacity:
+            raise ValueError("Maximum capacity reached, cannot add more components.")
+        if self.indexed and len({component.id for component in components}) != len(components):
+            raise ValueError("Component is already in this container.")
+
+    def add_component(self, component: Component):
+        self._check_addable(component)
         self.components.append(component)
+        if self._index is not None:
+            self._index.appended(component, len(self.components) - 1)
+        if self._buckets is not None:
+            self._buckets.add(component)
+        if bus.active:
+            bus.emit("container.add", self, component)
+
+    def insert_component(self, component: Component, position: int):
+        """Add a component at ``position`` (clamped to the list), subject to the same checks as ``add_component``.
+
+        Inserting where a component was removed from (as undo does), or at the
+        front, is O(log n) for the index; elsewhere the index is rebuilt on the
+        next lookup.
+        """
+        self._check_addable(component)
+        components = self.components
+        position = max(0, min(position, len(components)))
+        components.insert(position, component)
+        if self._index is not None:
+            if position == len(components) - 1:
+                self._index.appended(component, position)
+            else:
+                self._index.inserted(component, position, components)
+        if self._buckets is not None:
+            self._buckets.add(component)
+        if bus.active:
+            bus.emit("container.add", self, component)
 
     def remove_component(self, component: Component):
-        if component in self.components:
-            self.components.remove(component)
+        if self.indexed:
+            position = self.index_of(component)
+            if position is not None:
+                self._pop_at(position)
+        elif component in self.components:
+            self._pop_at(self.components.index(component))
+
+    def pop_component(self, position: int = -1) -> Component:
+        """Remove and return the component at ``position`` (the last one by default)."""
+        if position < 0:
+            position += len(self.components)
+        if not 0 <= position < len(self.components):
+            raise IndexError("Container position out of range.")
+        return self._pop_at(position)
+
+    def _pop_at(self, position: int) -> Component:
+        component = self.components.pop(position)
+        if self._index is not None:
+            self._index.removed(component, position)
+        if self._buckets is not None:
+            self._buckets.remove(component)
+        if bus.active:
+            bus.emit("container.remove", self, component)
+        return component
+
+    def _size(self) -> int:
+        return len(self.components)
+
+    def _type_buckets(self) -> _TypeBuckets:
+        # Rebuild after ``components`` was changed directly, e.g. by a MoveCard on
+        # ``get_components()``; changes that keep the length cannot be seen.
+        if self._buckets is None or self._buckets.size != self._size():
+            self._buckets = _TypeBuckets(self.components)
+        return self._buckets
+
+    def of_type(self, component_type: type) -> List[Component]:
+        """Components that are instances of ``component_type``, grouped by concrete type.
+
+        The first call builds per-type buckets in O(n); later calls only touch
+        the buckets of matching types. Within a type, components are listed in
+        the order they were added. The buckets follow the container's methods;
+        if ``components`` is changed directly they are rebuilt once its length
+        no longer matches, but a same-length edit (replacing an item in place)
+        goes unnoticed.
+        """
+        return self._type_buckets().of_type(component_type)
+
+    def count_of_type(self, component_type: type) -> int:
+        """Number of components that are instances of ``component_type``."""
+        return self._type_buckets().count(component_type)
+
+    def contains(self, component: Component) -> bool:
+        """Return whether a component with the same ``id`` is held."""
+        if self.indexed:
+            return component.id in self._component_index()
+        component_id = component.id
+        return any(held.id == component_id for held in self.components)
+
+    def index_of(self, component: Component) -> Optional[int]:
+        """Return the position of the component with the same ``id``, or None."""
+        if self.indexed:
+            return self._component_index().position(component.id, self.components)
+        component_id = component.id
+        for position, held in enumerate(self.components):
+            if held.id == component_id:
+                return position
+        return None
 
     def get_components(self) -> List[Component]:
         return self.components
 
     def clear_components(self):
+        removed = list(self.components) if bus.active else None
         self.components.clear()
+        self._index = None
+        self._buckets = None
+        if removed:
+            bus.emit("container.clear", self, removed)
+
+    def clone(self, memo: Optional[Dict[int, Any]] = None):
+        return clone_object(self, memo, reset=("_index", "_buckets"))
 
 
 @dataclass
 class ContainerContainer(AbstractContainer):
     """Container with the purpose of holding other containers.
-    Can be used as a starting point for things like a tableau."""
+    Can be used as a starting point for things like a tableau.
+
+    Children are indexed by ``name`` so ``get_child``/``resolve`` are dictionary
+    lookups, and the number of children of each type limited by
+    ``max_capacity_per_type`` is counted incrementally. Both stay correct for
+    changes made through ``add_component``, ``remove_component`` and
+    ``clear_components``; renaming a child after adding it is not tracked."""
     # Define which subtypes of containers are allowed
     allowable_container_types: Set[Type[Container]] = field(default_factory=set)
     containers: List[Container] = field(default_factory=list)
     max_capacity_per_type: Optional[Dict[Type[Container], Optional[int]]] = None
     name: str = None
+    # Children by name (in insertion order) and counts of children per limited type.
+    _children_by_name: Dict[str, List[AbstractContainer]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _type_counts: Dict[type, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for container in self.containers:
+            self._index_child(container)
+
+    def _index_child(self, container: AbstractContainer):
+        if container.name is not None:
+            self._children_by_name.setdefault(container.name, []).append(container)
+        for counted_type in self._type_counts:
+            if isinstance(container, counted_type):
+                self._type_counts[counted_type] += 1
+
+    def _unindex_child(self, container: AbstractContainer):
+        named = self._children_by_name.get(container.name)
+        if named is not None:
+            for position, child in enumerate(named):
+                if child is container:
+                    del named[position]
+                    break
+            if not named:
+                del self._children_by_name[container.name]
+        for counted_type in self._type_counts:
+            if isinstance(container, counted_type):
+                self._type_counts[counted_type] -= 1
+
+    def count_of_type(self, container_type: type) -> int:
+        """Number of children that are instances of ``container_type``."""
+        count = self._type_counts.get(container_type)
+        if count is None:
+            count = self._type_counts[container_type] = sum(1 for c in self.containers if isinstance(c, container_type))
+        return count
 
     def add_component(self, container: AbstractContainer):
         if self.allowable_container_types and type(container) not in self.allowable_container_types:
@@ -77,54 +485,90 @@ class ContainerContainer(AbstractContainer):
             max_capacity = self.max_capacity_per_type.get(container_type)
 
             if max_capacity is not None:
-                current_count = sum(1 for c in self.containers if isinstance(c, container_type))
-                if current_count >= max_capacity:
+                if self.count_of_type(container_type) >= max_capacity:
                     raise ValueError(f"Maximum capacity for {container_type.__name__} reached.")
 
         self.containers.append(container)
+        self._index_child(container)
+        if bus.active:
+            bus.emit("container.add", self, container)
 
     def remove_component(self, container: Container):
         if container in self.containers:
-            self.containers.remove(container)
+            position = self.containers.index(container)
+            removed = self.containers.pop(position)
+            self._unindex_child(removed)
+            if bus.active:
+                bus.emit("container.remove", self, removed)
 
     def get_components(self) -> List[Container]:
         return self.containers
 
+    def get_child(self, name: str) -> Optional[AbstractContainer]:
+        """First child with the given name, or None."""
+        named = self._children_by_name.get(name)
+        return named[0] if named else None
+
+    def resolve(self, path: str) -> AbstractContainer:
+        """Follow a ``/``-separated path of child names, e.g. ``"left_wing/works"``."""
+        current = self
+        for name in path.split("/"):
+            child = current.get_child(name) if isinstance(current, ContainerContainer) else None
+            if child is None:
+                raise KeyError(f"No container at {path!r} (missing {name!r}).")
+            current = child
+        return current
+
     def clear_components(self):
         """Not sure how to implement this... since containers are not components and don't(?) have clear() function"""
+        removed = list(self.containers) if bus.active else None
         self.containers.clear()
+        self._children_by_name.clear()
+        for counted_type in self._type_counts:
+            self._type_counts[counted_type] = 0
+        if removed:
+            bus.emit("container.clear", self, removed)
 
 
 @dataclass
 class LoggingContainer(Container):
+    """Container that logs every call to the ``container`` logger at DEBUG level.
+
+    Messages are only formatted when that level is enabled. For structured,
+    low-overhead tracing of all containers, subscribe to ``events.bus`` instead.
+    """
     def add_component(self, component: Component):
-        print(f"Adding component: {component}")
+        logger.debug("Adding component: %s", component)
         super().add_component(component)
 
     def remove_component(self, component: Component):
-        print(f"Removing component: {component}")
+        logger.debug("Removing component: %s", component)
         super().remove_component(component)
 
     def get_components(self) -> List[Component]:
-        print("Retrieving components")
+        logger.debug("Retrieving components")
         return super().get_components()
 
     def clear_components(self):
-        print("Clearing components")
+        logger.debug("Clearing components")
         super().clear_components()
 
 
 @dataclass
 class CardContainer(Container):
-    def add_component(self, component: Component):
+    def _check_addable(self, component: Component):
         if not isinstance(component, Card):
             raise ValueError(f"Only Card objects can be added to Deck.")
-        super().add_component(component)
+        super()._check_addable(component)
 
     def contains_card(self, card: Card) -> bool:
+        if self.indexed:
+            return self.contains(card)
         return card in self.components
 
     def find_card(self, card: Card) -> Optional[int]:
+        if self.indexed:
+            return self.index_of(card)
         try:
             return self.components.index(card)
         except ValueError:
@@ -136,20 +580,115 @@ class CardContainer(Container):
 
 @dataclass
 class Deck(CardContainer):
+    """Card container whose top is ``components[0]``.
+
+    Cards are kept in a backing list with a moving top pointer, so drawing from
+    either end costs O(k) in the number of cards drawn rather than rebuilding the
+    list. Drawn cards are trimmed from the backing list lazily, once they make up
+    more than half of it or when ``components`` is accessed.
+
+    ``rng`` is the random stream the deck shuffles with (the global ``random``
+    module when None). With ``lazy_shuffle`` a shuffle only marks the cards as
+    unordered; each draw then picks its cards with one step of Fisher-Yates, so
+    drawing k cards costs O(k) however big the deck is. Reading ``components``
+    finishes the shuffle. For a given ``rng`` state, lazy and eager shuffles
+    give different (equally random) orders.
+    """
     shuffle_on_init: bool = False
+    rng: Optional[random.Random] = field(default=None, repr=False, compare=False)
+    lazy_shuffle: bool = False
 
     def __post_init__(self):
         if self.shuffle_on_init:
             self.shuffle()
 
+    @property
+    def components(self) -> List[Component]:
+        self._settle(len(self._cards))
+        self._compact()
+        return self._cards
+
+    @components.setter
+    def components(self, cards: List[Component]):
+        self._cards = cards
+        self._top = 0
+        # Cards in _cards[_pending:_pending_end] are still to be shuffled.
+        self._pending = self._pending_end = 0
+        self._index = None
+        self._buckets = None
+
+    def _compact(self):
+        if self._top:
+            del self._cards[:self._top]
+            if self._pending < self._pending_end:
+                self._pending -= self._top
+                self._pending_end -= self._top
+            self._top = 0
+
+    def _settle(self, stop: int):
+        """Finish the lazy shuffle for the backing list up to position ``stop``."""
+        start, end = self._pending, self._pending_end
+        stop = min(stop, end)
+        if start >= stop:
+            return
+        cards = self._cards
+        randrange = (self.rng or random).randrange
+        for position in range(start, min(stop, end - 1)):
+            other = randrange(position, end)
+            cards[position], cards[other] = cards[other], cards[position]
+        self._pending = stop
+
     def shuffle(self):
-        random.shuffle(self.components)
+        if self.lazy_shuffle:
+            self._pending, self._pending_end = self._top, len(self._cards)
+            # Positions are unknown until the cards are settled.
+            self._index = None
+        else:
+            (self.rng or random).shuffle(self.components)
+            if self._index is not None:
+                self._index.reordered()
+        if bus.active:
+            bus.emit("deck.shuffle", self)
 
     def draw_card(self, number_of_cards: int = 1) -> List[Component]:
-        if number_of_cards > len(self.components):
+        """Draw cards from the top of the deck, top card first."""
+        if number_of_cards < 0:
+            raise ValueError("Cannot draw a negative number of cards.")
+        top = self._top
+        if number_of_cards > len(self._cards) - top:
             raise ValueError("Not enough cards in the deck to draw the requested number of cards.")
-        drawn_cards = self.components[:number_of_cards]
-        self.components = self.components[number_of_cards:]
+        if self._pending < self._pending_end:
+            self._settle(top + number_of_cards)
+        drawn_cards = self._cards[top:top + number_of_cards]
+        self._top = top + number_of_cards
+        if self._index is not None:
+            self._index.removed_front(drawn_cards)
+        if self._buckets is not None:
+            for card in drawn_cards:
+                self._buckets.remove(card)
+        if bus.active:
+            bus.emit("deck.draw", self, drawn_cards)
+        if self._top * 2 > len(self._cards):
+            self._compact()
+        return drawn_cards
+
+    def draw_bottom(self, number_of_cards: int = 1) -> List[Component]:
+        """Draw cards from the bottom of the deck, bottom card first."""
+        if number_of_cards > len(self._cards) - self._top:
+            raise ValueError("Not enough cards in the deck to draw the requested number of cards.")
+        if number_of_cards <= 0:
+            return []
+        self._settle(len(self._cards))
+        drawn_cards = self._cards[-number_of_cards:]
+        del self._cards[-number_of_cards:]
+        if self._index is not None:
+            self._index.removed_back(drawn_cards, self.deck_size())
+        if self._buckets is not None:
+            for card in drawn_cards:
+                self._buckets.remove(card)
+        drawn_cards.reverse()
+        if bus.active:
+            bus.emit("deck.draw", self, drawn_cards)
         return drawn_cards
 
     # def return_card(self, card: Card):
@@ -159,18 +698,32 @@ class Deck(CardContainer):
     #
 
     def peek(self, number_of_cards: int = 1) -> List[Component]:
-        if number_of_cards <= len(self.components):
-            return self.components[:number_of_cards]
+        top = self._top
+        if number_of_cards <= len(self._cards) - top:
+            self._settle(top + number_of_cards)
+            return self._cards[top:top + number_of_cards]
         raise ValueError(f"Not enough cards in the deck to peek at the requested number of cards.")
 
     def __iter__(self):
         return iter(self.components)
 
     def deck_size(self) -> int:
-        return len(self.components)
+        return len(self._cards) - self._top
+
+    def clone(self, memo: Optional[Dict[int, Any]] = None):
+        self._compact()
+        return super().clone(memo)
+
+    def card_count(self):
+        return self.deck_size()
+
+    def _size(self) -> int:
+        return self.deck_size()
 
     def rebuild_and_shuffle(self, cards: List[Card]):
         self.components = cards
+        if bus.active:
+            bus.emit("deck.rebuild", self, cards)
         self.shuffle()
 
 
@@ -185,15 +738,105 @@ class TokenContainer(Container):
     pass  # pragma: no cover
 
 
+class BoardLine(Sequence):
+    """Read-only row or column of a ``Board`` that indexes its flat cell list without copying."""
+    __slots__ = ("_cells", "_start", "_step", "_length")
+
+    def __init__(self, cells: List[Container], start: int, step: int, length: int):
+        self._cells = cells
+        self._start = start
+        self._step = step
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Board line index out of range.")
+        return self._cells[self._start + index * self._step]
+
+    def __iter__(self):
+        cells = self._cells
+        for position in range(self._start, self._start + self._length * self._step, self._step):
+            yield cells[position]
+
+    def __eq__(self, other):
+        if isinstance(other, (BoardLine, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"BoardLine({list(self)!r})"
+
+
+# (dx, dy) offsets of the edge-sharing neighbors, for even and odd rows.
+_SQUARE_OFFSETS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+_SQUARE_DIAGONAL_OFFSETS = _SQUARE_OFFSETS + ((1, 1), (-1, 1), (-1, -1), (1, -1))
+_HEX_OFFSETS = (
+    ((1, 0), (0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1)),
+    ((1, 0), (1, -1), (0, -1), (-1, 0), (0, 1), (1, 1)),
+)
+# Neighbor tables are immutable; this many board shapes keep theirs cached.
+NEIGHBOR_TABLE_CACHE_SIZE = 8
+
+
+def _build_neighbor_table(board_type: str, width: int, height: int, diagonal: bool) -> Tuple[Tuple[int, ...], ...]:
+    if board_type == "hex":
+        offsets_by_parity = _HEX_OFFSETS
+    else:
+        offsets = _SQUARE_DIAGONAL_OFFSETS if diagonal else _SQUARE_OFFSETS
+        offsets_by_parity = (offsets, offsets)
+    table = []
+    for y in range(height):
+        offsets = offsets_by_parity[y & 1]
+        deltas = tuple(dx + dy * width for dx, dy in offsets)
+        interior = 0 < y < height - 1
+        for x in range(width):
+            index = y * width + x
+            if interior and 0 < x < width - 1:
+                table.append(tuple([index + delta for delta in deltas]))
+            else:
+                table.append(tuple([(x + dx) + (y + dy) * width for dx, dy in offsets
+                                    if 0 <= x + dx < width and 0 <= y + dy < height]))
+    return tuple(table)
+
+
+def neighbor_table(board_type: str, width: int, height: int, diagonal: bool = False) -> Tuple[Tuple[int, ...], ...]:
+    """Neighbor cell indices of every cell of a board shape, shared by boards of the same shape."""
+    if board_type == "default":
+        board_type = "square"
+    if diagonal and board_type == "hex":
+        raise ValueError("Hex boards have no diagonal neighbors.")
+    return _cached_neighbor_table(board_type, width, height, diagonal)
+
+
+# Boards of one shape share a table; only the most recently used shapes are kept,
+# so the table of a large board that is gone does not stay alive for good.
+_cached_neighbor_table = lru_cache(maxsize=NEIGHBOR_TABLE_CACHE_SIZE)(_build_neighbor_table)
+
+
 @dataclass
 class Board(ContainerContainer):
+    """Rectangular board of cells stored row-major in the flat ``cells`` list.
+
+    Cell ``(x, y)`` lives at ``cells[y * width + x]``. Hex boards use "odd-r"
+    offset coordinates: every row has ``width`` cells and odd rows are shifted
+    half a cell to the right, giving each cell up to six neighbors. Square cells
+    have four edge neighbors, or eight with ``diagonal=True``.
+    """
     width: int = 1
     height: int = 1
     config_path: Optional[str] = None
-    grid: List[List[Container]] = field(init=False)
+    cells: List[Container] = field(init=False)
     board_type: str = "default"
 
     def __post_init__(self):
+        super().__post_init__()
         if self.board_type == "hex":
             self.init_hex_board()
         elif self.board_type in ["square", "default"]:
@@ -201,15 +844,14 @@ class Board(ContainerContainer):
         # else:
         #     self.init_board_from_json()
 
+    def _init_cells(self):
+        self.cells = [Container() for _ in range(self.width * self.height)]
+
     def init_hex_board(self):
-        self.grid = []
-        for y in range(self.height):
-            row_offset = y // 2
-            row = [Container() for _ in range(self.width - row_offset)]
-            self.grid.append(row)
+        self._init_cells()
 
     def init_square_board(self):
-        self.grid = [[Container() for _ in range(self.width)] for _ in range(self.height)]
+        self._init_cells()
 
     # def init_board_from_json(self):
     #     # Assuming the JSON defines a 2D array of cells with their configurations
@@ -224,10 +866,26 @@ class Board(ContainerContainer):
     #                 row.append(container)
     #             self.grid.append(row)
 
+    @property
+    def grid(self) -> List[BoardLine]:
+        """Rows of the board as views over ``cells``."""
+        return self.get_rows()
+
+    def index(self, x: int, y: int) -> int:
+        """Position of cell ``(x, y)`` in ``cells``."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        raise ValueError("Cell coordinates are out of bounds.")
+
+    def coordinates(self, index: int) -> Tuple[int, int]:
+        """Inverse of ``index``."""
+        y, x = divmod(index, self.width)
+        return x, y
+
     def get_cell(self, x: int, y: int):
         """Retrieve the container at the specified coordinates."""
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.grid[y][x]
+            return self.cells[y * self.width + x]
         else:
             raise ValueError("Cell coordinates are out of bounds.")
 
@@ -235,23 +893,43 @@ class Board(ContainerContainer):
         """Set the content of a cell at specified coordinates."""
 
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.grid[y][x] = content
+            index = y * self.width + x
+            previous, self.cells[index] = self.cells[index], content
+            if bus.active:
+                bus.emit("board.set_cell", self, (x, y, previous, content))
         else:
             raise ValueError("Cell coordinates are out of bounds")
 
-    def get_rows(self, index: Optional[int] = None) -> List[List[Container]]:
+    def neighbor_table(self, diagonal: bool = False) -> Tuple[Tuple[int, ...], ...]:
+        """Neighbor indices of every cell, indexed like ``cells``."""
+        return neighbor_table(self.board_type, self.width, self.height, diagonal)
+
+    def neighbor_indices(self, index: int, diagonal: bool = False) -> Tuple[int, ...]:
+        """Indices in ``cells`` of the neighbors of the cell at ``index``."""
+        return neighbor_table(self.board_type, self.width, self.height, diagonal)[index]
+
+    def neighbors(self, x: int, y: int, diagonal: bool = False) -> List[Tuple[int, int]]:
+        """Coordinates of the cells adjacent to ``(x, y)``."""
+        width = self.width
+        return [(index % width, index // width) for index in self.neighbor_indices(self.index(x, y), diagonal)]
+
+    def neighbor_cells(self, x: int, y: int, diagonal: bool = False) -> List[Container]:
+        """Containers of the cells adjacent to ``(x, y)``."""
+        cells = self.cells
+        return [cells[index] for index in self.neighbor_indices(self.index(x, y), diagonal)]
+
+    def get_rows(self, index: Optional[int] = None) -> List[BoardLine]:
         """Retrieve rows of the board, or a specific row if index is provided."""
         if index is not None:
             if 0 <= index < self.height:
-                return [self.grid[index]]
+                return [BoardLine(self.cells, index * self.width, 1, self.width)]
             raise IndexError("Row index out of bounds.")
-        return self.grid
+        return [BoardLine(self.cells, y * self.width, 1, self.width) for y in range(self.height)]
 
-    def get_columns(self, index: Optional[int] = None) -> List[List[Container]]:
+    def get_columns(self, index: Optional[int] = None) -> List[BoardLine]:
         """Retrieve columns of the board, or a specific column if index is provided."""
-        columns = [list(column) for column in zip(*self.grid)]
         if index is not None:
-            if 0 <= index < len(columns):
-                return [columns[index]] if index < len(columns) else []
+            if 0 <= index < self.width:
+                return [BoardLine(self.cells, index, self.width, self.height)]
             raise IndexError("Column index out of bounds.")
-        return columns
+        return [BoardLine(self.cells, x, self.width, self.height) for x in range(self.width)]
@@ -1,11 +1,21 @@
+import sys
+from operator import itemgetter
 from typing import Protocol
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
 from component import Card
+from container import Container
+
+
+class ActionError(ValueError):
+    pass
 
 
 @dataclass
 class Action(Protocol):
+    def validate(self):
+        """Raise ActionError if the action cannot run against the current state."""
+
     def execute(self):
         ...  # pragma: no cover
 
@@ -16,27 +26,236 @@ class Action(Protocol):
         ...  # pragma: no cover
 
 
+CardPile = Union[Container, List[Card]]
+
+
+def _components(pile: CardPile) -> List[Card]:
+    return pile.get_components() if isinstance(pile, Container) else pile
+
+
+def _find(pile: CardPile, card: Card, hint: Optional[int] = None) -> Optional[int]:
+    """Position of ``card`` in ``pile``, trying ``hint`` before searching.
+
+    Containers search through ``index_of`` (O(log n) when indexed); plain lists fall
+    back to ``list.index``.
+    """
+    components = _components(pile)
+    if hint is not None and hint < len(components) and components[hint] is card:
+        return hint
+    if isinstance(pile, Container):
+        return pile.index_of(card)
+    try:
+        return components.index(card)
+    except ValueError:
+        return None
+
+
+def _take(pile: CardPile, position: int) -> Card:
+    return pile.pop_component(position) if isinstance(pile, Container) else pile.pop(position)
+
+
+def _append(pile: CardPile, card: Card) -> int:
+    if isinstance(pile, Container):
+        pile.add_component(card)
+    else:
+        pile.append(card)
+    return len(_components(pile)) - 1
+
+
+def _insert(pile: CardPile, card: Card, position: int):
+    if isinstance(pile, Container):
+        pile.insert_component(card, position)
+    else:
+        pile.insert(position, card)
+
+
+def _check_addable(pile: CardPile, cards: List[Card]):
+    """Raise ActionError if a container ``pile`` would refuse any of ``cards`` (type, capacity, duplicates)."""
+    if isinstance(pile, Container):
+        try:
+            pile.check_addable(cards)
+        except ValueError as error:
+            raise ActionError(f"The destination cannot take these cards: {error}") from error
+
+
 @dataclass
 class MoveCard(Action):
+    """Move ``card`` from ``source`` to the end of ``destination``.
+
+    Either side may be a ``Container`` (kept in sync through its own methods,
+    so its index, type buckets and events stay correct) or a plain list. The
+    card's positions are recorded, so undo puts it back exactly where it was
+    and undo/redo find it without searching. A card that is not in ``source``
+    is left alone.
+    """
     card: Card
-    source: List[Card]
-    destination: List[Card]
+    source: CardPile
+    destination: CardPile
+    _source_position: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    _destination_position: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+
+    def validate(self):
+        if _find(self.source, self.card, self._source_position) is None:
+            raise ActionError(f"{self.card!r} is not in the source.")
+        _check_addable(self.destination, [self.card])
 
     def execute(self):
-        if self.card in self.source:
-            self.source.remove(self.card)
-            self.destination.append(self.card)
+        position = _find(self.source, self.card, self._source_position)
+        if position is None:
+            self._source_position = None
+            return
+        _take(self.source, position)
+        try:
+            self._destination_position = _append(self.destination, self.card)
+        except BaseException:
+            _insert(self.source, self.card, position)
+            raise
+        self._source_position = position
 
     def undo(self):
-        if self.card in self.destination:
-            self.destination.remove(self.card)
-            self.source.append(self.card)
+        if self._source_position is None:
+            return
+        position = _find(self.destination, self.card, self._destination_position)
+        if position is not None:
+            _take(self.destination, position)
+            _insert(self.source, self.card, self._source_position)
 
     def redo(self):
-        if self.card in self.source:
-            self.source.remove(self.card)
-            self.destination.append(self.card)
+        self.execute()
+
 
+@dataclass
+class MoveCards(Action):
+    """Move several cards from ``source`` to ``destination`` as one action.
+
+    The cards are appended to ``destination`` in the order given; undo puts
+    them back where they were in ``source``. Every card must be in ``source``.
+    Plain lists are rebuilt in a single pass, matching cards by identity;
+    containers are updated through their own methods.
+    """
+    cards: List[Card]
+    source: CardPile
+    destination: CardPile
+    # (position, card) pairs taken from the source, in source order.
+    _removed: List[Tuple[int, Card]] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def validate(self):
+        self._positions()
+        _check_addable(self.destination, self.cards)
+
+    def _positions(self) -> List[Tuple[int, Card]]:
+        if isinstance(self.source, Container):
+            found = [(self.source.index_of(card), card) for card in self.cards]
+            removed = sorted((pair for pair in found if pair[0] is not None), key=itemgetter(0))
+            unique = len({position for position, _ in removed})
+        else:
+            moving = {id(card) for card in self.cards}
+            removed = [(position, card) for position, card in enumerate(self.source) if id(card) in moving]
+            unique = len(moving)
+        if len(removed) != len(self.cards) or unique != len(self.cards):
+            raise ActionError("Every card moved must appear in the source exactly once.")
+        return removed
+
+    def execute(self):
+        removed = self._positions()
+        _check_addable(self.destination, self.cards)
+        if isinstance(self.source, Container):
+            for position, _ in reversed(removed):
+                self.source.pop_component(position)
+        else:
+            moving = {id(card) for card in self.cards}
+            self.source[:] = [card for card in self.source if id(card) not in moving]
+        self._removed = removed
+        if isinstance(self.destination, Container):
+            added = 0
+            try:
+                for card in self.cards:
+                    self.destination.add_component(card)
+                    added += 1
+            except BaseException:
+                # Leave both sides as they were, like MoveCard does for one card.
+                for _ in range(added):
+                    self.destination.pop_component()
+                self._restore_source()
+                raise
+        else:
+            self.destination.extend(self.cards)
+
+    def undo(self):
+        if isinstance(self.destination, Container):
+            hint = len(self.destination.get_components()) - 1
+            for card in reversed(self.cards):
+                position = _find(self.destination, card, hint)
+                if position is not None:
+                    self.destination.pop_component(position)
+                hint -= 1
+        else:
+            moving = {id(card) for card in self.cards}
+            self.destination[:] = [card for card in self.destination if id(card) not in moving]
+        self._restore_source()
+
+    def _restore_source(self):
+        if isinstance(self.source, Container):
+            for position, card in self._removed:
+                self.source.insert_component(card, position)
+            return
+        restored = []
+        remaining = iter(self.source)
+        for position, card in self._removed:
+            while len(restored) < position:
+                restored.append(next(remaining))
+            restored.append(card)
+        restored.extend(remaining)
+        self.source[:] = restored
+
+    def redo(self):
+        self.execute()
+
+    def estimated_size(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.__dict__) + sys.getsizeof(self.cards) \
+            + sys.getsizeof(self._removed) + len(self._removed) * sys.getsizeof((0, None))
+
+
+@dataclass
+class Transaction(Action):
+    """A batch of actions that applies, undoes and redoes as one.
+
+    ``execute`` validates and runs each action in turn; if one fails, the ones
+    already run are undone in reverse order and the error is re-raised, so the
+    state is left as it was. Each action is validated just before it runs, so
+    later actions may depend on the effects of earlier ones.
+    """
+    actions: List[Action] = field(default_factory=list)
+
+    def apply(self, action: Action):
+        """Validate and run ``action`` now, adding it to the transaction."""
+        action.validate()
+        action.execute()
+        self.actions.append(action)
+
+    def rollback(self):
+        """Undo every action applied so far, newest first, and empty the transaction."""
+        while self.actions:
+            self.actions.pop().undo()
+
+    def execute(self):
+        applied = 0
+        try:
+            for action in self.actions:
+                action.validate()
+                action.execute()
+                applied += 1
+        except BaseException:
+            for action in reversed(self.actions[:applied]):
+                action.undo()
+            raise
+
+    def undo(self):
+        for action in reversed(self.actions):
+            action.undo()
+
+    def redo(self):
+        self.execute()
 
 
 @dataclass
@@ -1,29 +1,191 @@
+import sys
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from controller.action import Action
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional
+from controller.action import Action, Transaction
+from events import bus
+
+
+def estimate_action_size(action: Action) -> int:
+    """Estimate the bytes an action keeps alive in the history.
+
+    Actions may define ``estimated_size()``; otherwise this is the shallow size of
+    the action and its attribute dict. Objects it merely references (cards,
+    containers) belong to the game, not the history, and are not counted. A
+    ``Transaction`` also counts the actions it holds.
+    """
+    estimated_size = getattr(action, "estimated_size", None)
+    if estimated_size is not None:
+        return estimated_size()
+    size = sys.getsizeof(action)
+    attributes = getattr(action, "__dict__", None)
+    if attributes is not None:
+        size += sys.getsizeof(attributes)
+    if isinstance(action, Transaction):
+        size += sys.getsizeof(action.actions) + sum(estimate_action_size(child) for child in action.actions)
+    return size
+
+
+@dataclass
+class HistoryCheckpoint:
+    """Stands in for undo entries that were evicted from the history.
+
+    ``fold(state, action)``, if given, is called with each evicted action so
+    callers can accumulate whatever they need (a journal offset, a snapshot...)
+    in ``state`` before the action is released.
+    """
+    actions_folded: int = 0
+    bytes_folded: int = 0
+    fold: Optional[Callable[[Any, Action], Any]] = None
+    state: Any = None
+
+    def absorb(self, action: Action, size: int):
+        self.actions_folded += 1
+        self.bytes_folded += size
+        if self.fold is not None:
+            self.state = self.fold(self.state, action)
+
+
+@dataclass(frozen=True)
+class HistoryStats:
+    undo_entries: int
+    redo_entries: int
+    undo_bytes: int
+    redo_bytes: int
+    evicted_entries: int
+    evicted_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.undo_bytes + self.redo_bytes
 
 
 @dataclass
 class ActionController:
-    # actions that can be redone
-    undo_stack: list[Action] = field(default_factory=list)
+    # actions that can be undone, oldest first
+    undo_stack: Deque[Action] = field(default_factory=deque)
     # actions that can be redone
     redo_stack: list[Action] = field(default_factory=list)
+    # Limits on the undo history; the oldest entries are evicted past either one.
+    max_history: Optional[int] = None
+    max_history_bytes: Optional[int] = None
+    # Evicted entries are folded into this checkpoint if set, otherwise dropped.
+    checkpoint: Optional[HistoryCheckpoint] = None
+    # Optional controller.journal.ActionJournal recording every executed, undone and redone action.
+    journal: Optional[Any] = None
+    _undo_sizes: Deque[int] = field(default_factory=deque, init=False, repr=False)
+    _redo_sizes: list[int] = field(default_factory=list, init=False, repr=False)
+    _undo_bytes: int = field(default=0, init=False, repr=False)
+    _redo_bytes: int = field(default=0, init=False, repr=False)
+    _evicted_entries: int = field(default=0, init=False, repr=False)
+    _evicted_bytes: int = field(default=0, init=False, repr=False)
 
     def execute(self, action: Action):
+        # Encode the journal record first: an action the journal cannot record
+        # must not run, or replays of the journal would diverge from the game.
+        record = self._encode(action)
         action.execute()
-        self.undo_stack.append(action)
+        self._record(action, record)
+
+    def execute_batch(self, actions: Iterable[Action]) -> Transaction:
+        """Run ``actions`` as one ``Transaction``: all or nothing, undone in a single step."""
+        transaction = Transaction(list(actions))
+        self.execute(transaction)
+        return transaction
+
+    @contextmanager
+    def transaction(self) -> Iterator[Transaction]:
+        """Group the actions applied inside the block into one undo entry.
+
+        ``transaction.apply(action)`` validates and runs each action straight
+        away, so code in the block sees its effects. If the block raises, the
+        applied actions are rolled back and nothing is recorded::
+
+            with controller.transaction() as transaction:
+                transaction.apply(MoveCard(card, deck, hand))
+                transaction.apply(FlipCard(card))
+        """
+        transaction = Transaction()
+        try:
+            yield transaction
+        except BaseException:
+            transaction.rollback()
+            raise
+        if transaction.actions:
+            try:
+                record = self._encode(transaction)
+            except BaseException:
+                transaction.rollback()
+                raise
+            self._record(transaction, record)
+
+    def _encode(self, action: Action) -> Optional[bytes]:
+        return self.journal.encode(action) if self.journal is not None else None
+
+    def _record(self, action: Action, record: Optional[bytes]):
+        if record is not None:
+            self.journal.write(record)
+        if bus.active:
+            bus.emit("action.execute", self, action)
+        self._push_undo(action, estimate_action_size(action))
         self.redo_stack.clear()
+        self._redo_sizes.clear()
+        self._redo_bytes = 0
+        self._enforce_limits()
 
     def undo(self):
         if not self.undo_stack:
             return
         action = self.undo_stack.pop()
+        size = self._undo_sizes.pop()
+        self._undo_bytes -= size
         action.undo()
+        if self.journal is not None:
+            self.journal.record_undo()
+        if bus.active:
+            bus.emit("action.undo", self, action)
         self.redo_stack.append(action)
+        self._redo_sizes.append(size)
+        self._redo_bytes += size
 
     def redo(self):
         if not self.redo_stack:
             return
         action = self.redo_stack.pop()
+        size = self._redo_sizes.pop()
+        self._redo_bytes -= size
         action.execute()
+        if self.journal is not None:
+            self.journal.record_redo()
+        if bus.active:
+            bus.emit("action.redo", self, action)
+        self._push_undo(action, size)
+
+    def _push_undo(self, action: Action, size: int):
         self.undo_stack.append(action)
+        self._undo_sizes.append(size)
+        self._undo_bytes += size
+
+    def _enforce_limits(self):
+        while self.undo_stack and (
+                (self.max_history is not None and len(self.undo_stack) > self.max_history)
+                or (self.max_history_bytes is not None and self._undo_bytes > self.max_history_bytes)):
+            action = self.undo_stack.popleft()
+            size = self._undo_sizes.popleft()
+            self._undo_bytes -= size
+            self._evicted_entries += 1
+            self._evicted_bytes += size
+            if self.checkpoint is not None:
+                self.checkpoint.absorb(action, size)
+
+    def history_stats(self) -> HistoryStats:
+        """Report how many entries and estimated bytes the history is holding."""
+        return HistoryStats(
+            undo_entries=len(self.undo_stack),
+            redo_entries=len(self.redo_stack),
+            undo_bytes=self._undo_bytes,
+            redo_bytes=self._redo_bytes,
+            evicted_entries=self._evicted_entries,
+            evicted_bytes=self._evicted_bytes,
+        )
@@ -0,0 +1,351 @@
+"""Append-only binary journal of executed actions.
+
+A journal file starts with a header (magic, format version and the seed the
+initial state was built from) followed by fixed-layout records::
+
+    MOVE  <component id> <source handle:u32> <destination handle:u32>
+    FLIP  <component id>
+    UNDO
+    REDO
+    MOVES <source handle:u32> <destination handle:u32> <count:u32> <component id> * count
+    BATCH <count:u32>, followed by the count records of a transaction
+
+Component ids are written as a tag byte plus an int64 or a 16-byte uuid.
+Containers are written as small integer handles assigned by ``ObjectTable``,
+which numbers the containers of a game state in a fixed traversal order. A
+state rebuilt from the same seed (with deterministic component ids, e.g. from
+``component.IdAllocator``) therefore resolves every record to the same
+objects, and ``replay`` can reapply a game while streaming the file in chunks.
+"""
+import struct
+import uuid
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from component import Component
+from container import AbstractContainer, Board, Container, ContainerContainer
+from controller.action import Action, FlipCard, MoveCard, MoveCards, Transaction
+from controller.controller import ActionController
+
+MAGIC = b"BGLJ"
+VERSION = 1
+
+OP_MOVE = 1
+OP_FLIP = 2
+OP_UNDO = 3
+OP_REDO = 4
+OP_MOVES = 5
+OP_BATCH = 6
+
+ID_INT = 0
+ID_UUID = 1
+
+_HEADER = struct.Struct("<4sBq")
+_OP = struct.Struct("<B")
+_INT_ID = struct.Struct("<Bq")
+_UUID_TAG = struct.Struct("<B")
+_HANDLES = struct.Struct("<II")
+_COUNT = struct.Struct("<I")
+_CHUNK_SIZE = 1 << 16
+
+
+class JournalError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class JournalHeader:
+    version: int
+    seed: int
+
+
+class ObjectTable:
+    """Resolves components and containers of one game state to journal keys and back.
+
+    Containers are numbered in the order a depth-first walk over the state's
+    dataclass fields reaches them; components are keyed by ``Component.id``.
+    """
+
+    def __init__(self, root: Any):
+        self.containers: List[AbstractContainer] = []
+        self._handles: Dict[int, int] = {}
+        self.components: Dict[Any, Component] = {}
+        self._visited = set()
+        self._walk(root)
+
+    def _walk(self, obj: Any):
+        if id(obj) in self._visited:
+            return
+        if isinstance(obj, (list, tuple)):
+            for item in obj:
+                self._walk(item)
+            return
+        if isinstance(obj, AbstractContainer):
+            self._visited.add(id(obj))
+            self._handles[id(obj)] = len(self.containers)
+            self.containers.append(obj)
+            if isinstance(obj, Container):
+                for component in obj.get_components():
+                    self._walk(component)
+            elif isinstance(obj, Board):
+                self._walk(obj.cells)
+            if isinstance(obj, ContainerContainer):
+                self._walk(obj.get_components())
+            return
+        if isinstance(obj, Component):
+            self._visited.add(id(obj))
+            self.components[obj.id] = obj
+            if is_dataclass(obj):
+                for f in fields(obj):
+                    self._walk(getattr(obj, f.name))
+
+    def container_handle(self, target: Union[AbstractContainer, list]) -> int:
+        """Handle of a container, or of the container owning a raw components list."""
+        handle = self._handles.get(id(target))
+        if handle is None:
+            # Raw lists are looked up through their owner; refresh in case a
+            # container's list was replaced since the last lookup.
+            for handle, container in enumerate(self.containers):
+                if isinstance(container, Container):
+                    self._handles[id(container.components)] = handle
+            handle = self._handles.get(id(target))
+        if handle is None:
+            raise JournalError(f"{type(target).__name__} is not part of the journaled state.")
+        return handle
+
+    def container(self, handle: int) -> AbstractContainer:
+        return self.containers[handle]
+
+    def component(self, component_id: Any) -> Component:
+        try:
+            return self.components[component_id]
+        except KeyError:
+            raise JournalError(f"Unknown component id {component_id!r}.") from None
+
+
+def _pack_id(component_id: Any) -> bytes:
+    if isinstance(component_id, int):
+        return _INT_ID.pack(ID_INT, component_id)
+    if isinstance(component_id, uuid.UUID):
+        return _UUID_TAG.pack(ID_UUID) + component_id.bytes
+    raise JournalError(f"Cannot journal component id of type {type(component_id).__name__}.")
+
+
+class ActionJournal:
+    """Writes executed, undone and redone actions to an append-only file.
+
+    Attach it to an ``ActionController`` (``ActionController(journal=...)``) to
+    record every action the controller runs.
+    """
+
+    def __init__(self, path: str, table: ObjectTable, seed: int = 0):
+        self.table = table
+        self._file: BinaryIO = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION, seed))
+
+    def encode(self, action: Action) -> bytes:
+        """The record of ``action``, without writing it; raises JournalError if it cannot be journaled.
+
+        Nothing here depends on whether the action has run yet, so a controller
+        can encode an action first and only execute it once it is known to be
+        recordable.
+        """
+        if isinstance(action, MoveCard):
+            return _OP.pack(OP_MOVE) + _pack_id(action.card.id) + _HANDLES.pack(
+                self.table.container_handle(action.source), self.table.container_handle(action.destination))
+        if isinstance(action, FlipCard):
+            return _OP.pack(OP_FLIP) + _pack_id(action.card.id)
+        if isinstance(action, MoveCards):
+            return (_OP.pack(OP_MOVES) + _HANDLES.pack(
+                self.table.container_handle(action.source), self.table.container_handle(action.destination))
+                + _COUNT.pack(len(action.cards)) + b"".join(_pack_id(card.id) for card in action.cards))
+        if isinstance(action, Transaction):
+            return _OP.pack(OP_BATCH) + _COUNT.pack(len(action.actions)) + b"".join(map(self.encode, action.actions))
+        raise JournalError(f"Cannot journal action of type {type(action).__name__}.")
+
+    def write(self, record: bytes):
+        self._file.write(record)
+
+    def record(self, action: Action):
+        self.write(self.encode(action))
+
+    def record_undo(self):
+        self._file.write(_OP.pack(OP_UNDO))
+
+    def record_redo(self):
+        self._file.write(_OP.pack(OP_REDO))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_header(path: str) -> JournalHeader:
+    with open(path, "rb") as journal_file:
+        return _read_header(journal_file)
+
+
+def _read_header(journal_file: BinaryIO) -> JournalHeader:
+    data = journal_file.read(_HEADER.size)
+    if len(data) < _HEADER.size:
+        raise JournalError("Truncated journal header.")
+    magic, version, seed = _HEADER.unpack(data)
+    if magic != MAGIC:
+        raise JournalError("Not an action journal.")
+    if version != VERSION:
+        raise JournalError(f"Unsupported journal version {version}.")
+    return JournalHeader(version, seed)
+
+
+def iter_records(path: str) -> Iterator[Tuple]:
+    """Stream ``(op, ...)`` tuples from a journal without loading it whole.
+
+    Yields ``(OP_MOVE, component_id, source, destination)``,
+    ``(OP_FLIP, component_id)``, ``(OP_UNDO,)``, ``(OP_REDO,)``,
+    ``(OP_MOVES, component_ids, source, destination)`` and ``(OP_BATCH, count)``;
+    the ``count`` records of a batch follow it.
+    """
+    with open(path, "rb") as journal_file:
+        _read_header(journal_file)
+        buffer = b""
+        while True:
+            chunk = journal_file.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            buffer = buffer + chunk if buffer else chunk
+            offset = 0
+            end = len(buffer)
+            while offset < end:
+                record = _parse_record(buffer, offset, end)
+                if record is None:
+                    break
+                offset, item = record
+                yield item
+            buffer = buffer[offset:]
+        if buffer:
+            raise JournalError("Truncated journal record.")
+
+
+def _parse_id(buffer: bytes, offset: int, end: int) -> Optional[Tuple[int, Any]]:
+    if offset >= end:
+        return None
+    tag = buffer[offset]
+    if tag == ID_INT:
+        if offset + _INT_ID.size > end:
+            return None
+        return offset + _INT_ID.size, _INT_ID.unpack_from(buffer, offset)[1]
+    if tag == ID_UUID:
+        if offset + 17 > end:
+            return None
+        return offset + 17, uuid.UUID(bytes=bytes(buffer[offset + 1:offset + 17]))
+    raise JournalError(f"Unknown component id tag {tag}.")
+
+
+def _parse_record(buffer: bytes, offset: int, end: int) -> Optional[Tuple[int, Tuple]]:
+    """Parse one record at ``offset``; None if the buffer ends before the record does."""
+    op = buffer[offset]
+    if op == OP_UNDO or op == OP_REDO:
+        return offset + 1, (op,)
+    if op == OP_BATCH:
+        if offset + 1 + _COUNT.size > end:
+            return None
+        return offset + 1 + _COUNT.size, (op, _COUNT.unpack_from(buffer, offset + 1)[0])
+    if op == OP_MOVES:
+        return _parse_moves(buffer, offset + 1, end)
+    if op != OP_MOVE and op != OP_FLIP:
+        raise JournalError(f"Unknown journal record type {op}.")
+    parsed = _parse_id(buffer, offset + 1, end)
+    if parsed is None:
+        return None
+    offset, component_id = parsed
+    if op == OP_FLIP:
+        return offset, (op, component_id)
+    if offset + _HANDLES.size > end:
+        return None
+    source, destination = _HANDLES.unpack_from(buffer, offset)
+    return offset + _HANDLES.size, (op, component_id, source, destination)
+
+
+def _parse_moves(buffer: bytes, offset: int, end: int) -> Optional[Tuple[int, Tuple]]:
+    if offset + _HANDLES.size + _COUNT.size > end:
+        return None
+    source, destination = _HANDLES.unpack_from(buffer, offset)
+    offset += _HANDLES.size
+    count = _COUNT.unpack_from(buffer, offset)[0]
+    offset += _COUNT.size
+    component_ids = []
+    for _ in range(count):
+        parsed = _parse_id(buffer, offset, end)
+        if parsed is None:
+            return None
+        offset, component_id = parsed
+        component_ids.append(component_id)
+    return offset, (OP_MOVES, component_ids, source, destination)
+
+
+def replay(path: str, state: Any, controller=None) -> int:
+    """Reapply a journal to ``state`` (freshly built from the journal's seed).
+
+    Actions run through ``controller`` (a new ``ActionController`` if omitted) so
+    recorded undos and redos replay too. Returns the number of records applied.
+    """
+    table = ObjectTable(state)
+    controller = ActionController() if controller is None else controller
+    records = iter_records(path)
+    count = 0
+    for record in records:
+        op = record[0]
+        if op == OP_UNDO:
+            controller.undo()
+        elif op == OP_REDO:
+            controller.redo()
+        else:
+            action, read = _action(record, records, table)
+            controller.execute(action)
+            count += read - 1
+        count += 1
+    return count
+
+
+def _action(record: Tuple, records: Iterator[Tuple], table: ObjectTable) -> Tuple[Action, int]:
+    """Rebuild the action of ``record``, reading a batch's records from ``records``.
+
+    Returns the action and the number of records it took.
+    """
+    op = record[0]
+    if op == OP_MOVE:
+        _, component_id, source, destination = record
+        return MoveCard(table.component(component_id),
+                        _target(table.container(source)), _target(table.container(destination))), 1
+    if op == OP_FLIP:
+        return FlipCard(table.component(record[1])), 1
+    if op == OP_MOVES:
+        _, component_ids, source, destination = record
+        return MoveCards([table.component(component_id) for component_id in component_ids],
+                         _target(table.container(source)), _target(table.container(destination))), 1
+    if op == OP_BATCH:
+        actions = []
+        read = 1
+        for _ in range(record[1]):
+            child = next(records, None)
+            if child is None:
+                raise JournalError("Truncated journal batch.")
+            action, child_read = _action(child, records, table)
+            actions.append(action)
+            read += child_read
+        return Transaction(actions), read
+    raise JournalError(f"Journal record {op} cannot appear inside a batch.")
+
+
+def _target(container: AbstractContainer) -> Union[Container, list]:
+    # Moves go through containers so their indexes stay current; other holders move their raw list.
+    return container if isinstance(container, Container) else container.get_components()
@@ -0,0 +1,206 @@
+"""Table-driven hand evaluation for standard playing cards.
+
+Hands may be given as card objects (anything with ``suit`` and ``value``, such
+as ``StandardPlayingCard`` or ``catalog.CatalogCard``), as a container holding
+them, or as the integer codes of ``card_codes`` (``rank * 4 + suit``). The
+``*_codes`` functions skip the conversion and are the fast path for simulations
+that already work with codes.
+
+Blackjack totals are a sum over a per-code points table. Poker hands of 5 to 7
+cards are scored without enumerating 5-card subsets: the ranks of a hand are
+packed into a key (three bits of count per rank) that indexes a table of every
+possible rank multiset, and each suit's ranks are packed into a 13-bit mask
+that indexes a table of flushes and straight flushes. The tables are built on
+the first poker evaluation. ``card_array.ArrayHand`` scores whole batches with
+the same tables.
+
+Poker scores are ints that compare like the hands they score: higher is
+better and equal scores split the pot. ``hand_category`` names the hand.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from card_codes import RANK_INDEX, STANDARD_CARD_COUNT, SUIT_INDEX, VALUES
+
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+HAND_CATEGORIES = ("high card", "pair", "two pair", "three of a kind", "straight", "flush",
+                   "full house", "four of a kind", "straight flush")
+
+# Bits per tie-breaking rank in a score; five ranks follow the category.
+_RANK_BITS = 4
+_CATEGORY_SHIFT = 5 * _RANK_BITS
+
+# Blackjack points per rank index; aces count 1 here and 11 when that does not bust.
+BLACKJACK_POINTS = tuple(1 if value == "A" else 10 if value in ("J", "Q", "K") else int(value) for value in VALUES)
+_POINTS_BY_CODE = tuple(BLACKJACK_POINTS[code >> 2] for code in range(STANDARD_CARD_COUNT))
+# Blackjack points per card value ("A", "2", ..., "K"), e.g. for a dealer's upcard.
+BLACKJACK_POINTS_BY_VALUE = {value: BLACKJACK_POINTS[rank] for value, rank in RANK_INDEX.items()}
+
+_CODE_BY_CARD = {(suit, value): rank * 4 + suit_index
+                 for value, rank in RANK_INDEX.items() for suit, suit_index in SUIT_INDEX.items()}
+# Per code: a rank key (three bits of count per rank) in the low bits, and above
+# it the rank's bit in a 16-bit mask for the card's suit.
+_RANK_KEY_BITS = 3 * len(VALUES)
+_RANK_KEY_MASK = (1 << _RANK_KEY_BITS) - 1
+_SUIT_SHIFT = _RANK_KEY_BITS + 1
+_PACKED = tuple(1 << 3 * (code >> 2) | 1 << (_SUIT_SHIFT + 16 * (code & 3) + (code >> 2))
+                for code in range(STANDARD_CARD_COUNT))
+
+
+def _cards(hand) -> Iterable:
+    return hand.get_components() if hasattr(hand, "get_components") else hand
+
+
+def card_codes(hand) -> List[int]:
+    """Codes of the cards of ``hand``; integer codes are passed through."""
+    return [card if isinstance(card, int) else _CODE_BY_CARD[card.suit, card.value] for card in _cards(hand)]
+
+
+def blackjack_total(hand) -> Tuple[int, bool]:
+    """Best blackjack total of ``hand`` and whether it is soft (an ace counted as 11)."""
+    total = 0
+    has_ace = False
+    points_by_value = BLACKJACK_POINTS_BY_VALUE
+    for card in _cards(hand):
+        points = _POINTS_BY_CODE[card] if isinstance(card, int) else points_by_value[card.value]
+        total += points
+        if points == 1:
+            has_ace = True
+    if has_ace and total <= 11:
+        return total + 10, True
+    return total, False
+
+
+def blackjack_total_codes(codes: Iterable[int]) -> Tuple[int, bool]:
+    """``blackjack_total`` for a sequence of standard codes."""
+    total = 0
+    has_ace = False
+    points_by_code = _POINTS_BY_CODE
+    for code in codes:
+        points = points_by_code[code]
+        total += points
+        if points == 1:
+            has_ace = True
+    if has_ace and total <= 11:
+        return total + 10, True
+    return total, False
+
+
+def _score(category: int, *ranks: int) -> int:
+    score = category
+    for position in range(5):
+        score = score << _RANK_BITS | (ranks[position] if position < len(ranks) else 0)
+    return score
+
+
+def hand_category(score: int) -> str:
+    """Name of the hand a poker score belongs to, e.g. ``"full house"``."""
+    return HAND_CATEGORIES[score >> _CATEGORY_SHIFT]
+
+
+def _straight_high(mask: int) -> int:
+    """Rank index of the top card of the best straight in a rank mask, or -1."""
+    for top in range(len(VALUES) - 1, 3, -1):
+        window = 0b11111 << (top - 4)
+        if mask & window == window:
+            return top
+    wheel = 1 << RANK_INDEX["A"] | 0b1111
+    return RANK_INDEX["5"] if mask & wheel == wheel else -1
+
+
+def _rank_score(counts: Sequence[int]) -> int:
+    """Best 5-card score of a hand with ``counts[rank]`` cards of each rank, ignoring suits."""
+    present = [rank for rank in range(len(VALUES) - 1, -1, -1) if counts[rank]]
+    grouped = sorted(present, key=lambda rank: (counts[rank], rank), reverse=True)
+    first = grouped[0]
+    most = counts[first]
+    if most == 4:
+        return _score(FOUR_OF_A_KIND, first, next(rank for rank in present if rank != first))
+    if most == 3 and len(grouped) > 1 and counts[grouped[1]] >= 2:
+        return _score(FULL_HOUSE, first, grouped[1])
+    straight = _straight_high(sum(1 << rank for rank in present))
+    if straight >= 0:
+        return _score(STRAIGHT, straight)
+    if most == 3:
+        return _score(THREE_OF_A_KIND, first, *[rank for rank in present if rank != first][:2])
+    if most == 2 and counts[grouped[1]] == 2:
+        second = grouped[1]
+        return _score(TWO_PAIR, first, second, next(rank for rank in present if rank not in (first, second)))
+    if most == 2:
+        return _score(PAIR, first, *[rank for rank in present if rank != first][:3])
+    return _score(HIGH_CARD, *present[:5])
+
+
+class PokerTables(NamedTuple):
+    # Rank key (3 bits of count per rank) -> best score ignoring suits, for 5 to 7 cards.
+    ranks: Dict[int, int]
+    # 13-bit rank mask of one suit -> flush or straight flush score, 0 for fewer than 5 cards.
+    flushes: List[int]
+
+
+_tables: Optional[PokerTables] = None
+
+
+def poker_tables() -> PokerTables:
+    """The poker lookup tables, built on first use."""
+    global _tables
+    if _tables is None:
+        _tables = PokerTables(_build_rank_table(), _build_flush_table())
+    return _tables
+
+
+def _build_rank_table() -> Dict[int, int]:
+    table = {}
+    counts = [0] * len(VALUES)
+
+    def fill(rank: int, cards: int, key: int):
+        if rank == len(VALUES):
+            if cards >= 5:
+                table[key] = _rank_score(counts)
+            return
+        for count in range(min(4, 7 - cards) + 1):
+            counts[rank] = count
+            fill(rank + 1, cards + count, key + (count << 3 * rank))
+        counts[rank] = 0
+
+    fill(0, 0, 0)
+    return table
+
+
+def _build_flush_table() -> List[int]:
+    table = [0] * (1 << len(VALUES))
+    for mask in range(len(table)):
+        if bin(mask).count("1") < 5:
+            continue
+        straight = _straight_high(mask)
+        if straight >= 0:
+            table[mask] = _score(STRAIGHT_FLUSH, straight)
+        else:
+            table[mask] = _score(FLUSH, *[rank for rank in range(len(VALUES) - 1, -1, -1) if mask >> rank & 1][:5])
+    return table
+
+
+def poker_score(hand) -> int:
+    """Score of the best 5-card poker hand among 5 to 7 cards (objects or codes)."""
+    return poker_score_codes(card_codes(hand))
+
+
+def poker_score_codes(codes: Sequence[int]) -> int:
+    """``poker_score`` for a sequence of 5 to 7 distinct standard codes."""
+    ranks, flushes = _tables or poker_tables()
+    # Distinct codes never carry into each other's bits, so one sum packs the whole hand.
+    packed = sum(map(_PACKED.__getitem__, codes))
+    score = ranks.get(packed & _RANK_KEY_MASK)
+    if score is None:
+        raise ValueError("Poker hands must be 5 to 7 cards with at most four of a rank.")
+    # A hand with a flush may also hold a full house or four of a kind, so take the better.
+    flush = (flushes[packed >> _SUIT_SHIFT & 0x1FFF] or flushes[packed >> _SUIT_SHIFT + 16 & 0x1FFF]
+             or flushes[packed >> _SUIT_SHIFT + 32 & 0x1FFF] or flushes[packed >> _SUIT_SHIFT + 48])
+    return flush if flush > score else score
@@ -0,0 +1,203 @@
+"""Structured event hooks for containers, decks, boards and the action controller.
+
+Library code reports changes to the module-level ``bus``. Call sites check
+``bus.active`` before building anything, so with no subscribers an event costs
+one attribute lookup. Subscribers receive ``Event`` records; ``BatchingSink``
+hands them to a background thread that writes them to a file or a logging
+handler in batches, keeping I/O off the game loop.
+
+Event kinds and their ``data``:
+
+- ``container.add`` / ``container.remove``: the component (or child container)
+- ``container.clear``: list of the components that were removed
+- ``deck.draw``: list of the cards drawn (from the top or the bottom)
+- ``deck.shuffle``: None
+- ``deck.rebuild``: list of the deck's new cards
+- ``board.set_cell``: ``(x, y, previous_cell, new_cell)``
+- ``action.execute`` / ``action.undo`` / ``action.redo``: the action
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Handler = Callable[["Event"], None]
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    kind: str
+    source: Any
+    data: Any = None
+    time: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly summary; objects are reduced to their type, name and id."""
+        return {"kind": self.kind, "time": self.time, "source": _describe(self.source), "data": _describe(self.data)}
+
+
+def _describe(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    described = {"type": type(value).__name__}
+    for attribute in ("name", "id"):
+        attribute_value = getattr(value, attribute, None)
+        if attribute_value is not None:
+            described[attribute] = attribute_value if isinstance(attribute_value, (str, int)) else str(attribute_value)
+    return described
+
+
+class _Subscription:
+    __slots__ = ("handler", "every", "seen")
+
+    def __init__(self, handler: Handler, every: int):
+        self.handler = handler
+        self.every = every
+        self.seen = 0
+
+    def __call__(self, event: Event):
+        self.seen += 1
+        if self.seen >= self.every:
+            self.seen = 0
+            self.handler(event)
+
+
+class EventBus:
+    """Routes events to subscribers by kind."""
+
+    def __init__(self):
+        self.active = False
+        self._subscriptions: List[Tuple[Optional[frozenset], Handler, Handler]] = []
+        self._routes: Dict[str, Tuple[Handler, ...]] = {}
+
+    def subscribe(self, handler: Handler, kinds: Optional[Iterable[str]] = None, every: int = 1) -> Handler:
+        """Call ``handler`` for events of ``kinds`` (all kinds if None).
+
+        With ``every=n`` only every n-th matching event is delivered (sampling).
+        Returns ``handler`` so it can be used as a decorator.
+        """
+        delivered = handler if every == 1 else _Subscription(handler, every)
+        self._subscriptions.append((frozenset(kinds) if kinds is not None else None, handler, delivered))
+        self._changed()
+        return handler
+
+    def unsubscribe(self, handler: Handler):
+        self._subscriptions = [entry for entry in self._subscriptions if entry[1] != handler]
+        self._changed()
+
+    def clear(self):
+        self._subscriptions = []
+        self._changed()
+
+    def _changed(self):
+        self._routes = {}
+        self.active = bool(self._subscriptions)
+
+    def _route(self, kind: str) -> Tuple[Handler, ...]:
+        route = self._routes[kind] = tuple(
+            delivered for kinds, _, delivered in self._subscriptions if kinds is None or kind in kinds)
+        return route
+
+    def emit(self, kind: str, source: Any, data: Any = None):
+        route = self._routes.get(kind)
+        if route is None:
+            route = self._route(kind)
+        if route:
+            event = Event(kind, source, data, time.time())
+            for handler in route:
+                handler(event)
+
+
+bus = EventBus()
+
+
+class BatchingSink:
+    """Event handler that writes events in batches from a background thread.
+
+    Handling an event only appends it to a queue. The worker thread collects up
+    to ``batch_size`` events, or whatever arrived within ``flush_interval``
+    seconds, and passes them to ``write``. If more than ``max_pending`` events
+    are waiting, new ones are dropped and counted in ``dropped`` rather than
+    slowing the caller down.
+    """
+
+    def __init__(self, write: Callable[[List[Event]], None], batch_size: int = 256,
+                 flush_interval: float = 0.5, max_pending: int = 100_000):
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._queue: "queue.SimpleQueue[Optional[Event]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="bg_lib-event-sink", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def to_file(cls, path: str, **options) -> "BatchingSink":
+        """Append events to ``path`` as JSON lines."""
+        event_file = open(path, "a", encoding="utf-8")
+
+        def write(events: List[Event]):
+            if events:
+                event_file.write("".join(json.dumps(event.to_dict()) + "\n" for event in events))
+                event_file.flush()
+            else:
+                event_file.close()
+
+        return cls(write, **options)
+
+    @classmethod
+    def to_logging(cls, handler: logging.Handler, level: int = logging.INFO, **options) -> "BatchingSink":
+        """Emit each event as a log record (message is its JSON summary) on ``handler``."""
+        def write(events: List[Event]):
+            for event in events:
+                handler.handle(logging.LogRecord("bg_lib.events", level, __file__, 0,
+                                                 json.dumps(event.to_dict()), None, None))
+
+        return cls(write, **options)
+
+    def __call__(self, event: Event):
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return
+        self._queue.put(event)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self.write([])
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            closing = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if event is None:
+                    closing = True
+                    break
+                batch.append(event)
+            self.write(batch)
+            if closing:
+                self.write([])
+                return
+
+    def close(self, timeout: Optional[float] = None):
+        """Write out everything queued so far and stop the worker thread.
+
+        ``write`` is called once more with an empty list so it can release
+        resources (the file sink closes its file).
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
@@ -1,8 +1,25 @@
+from typing import Iterable, Optional, Tuple
+from catalog import CardCatalog
 from component import StandardPlayingCard
 from container import Deck
+from evaluation import blackjack_total
+from game import CardGame
+from player import Player
 
 
-def create_blackjack_deck():
+def create_blackjack_deck(number_of_decks: int = 1, catalog: Optional[CardCatalog] = None):
+    """Build and shuffle a shoe of ``number_of_decks`` standard decks.
+
+    With a ``catalog`` the cards are ``CatalogCard``s sharing the catalog's 52
+    definitions instead of separate ``StandardPlayingCard``s.
+    """
+    if catalog is not None:
+        deck = Deck()
+        for card in catalog.cards(catalog.standard_deck(), copies=number_of_decks):
+            deck.add_component(card)
+        deck.shuffle()
+        return deck
+
     suits = ["H", "D", "C", "S"]
     names_values = [("Ace", "A"), ("2", "2"), ("3", "3"), ("4", "4"),
                     ("5", "5"), ("6", "6"), ("7", "7"), ("8", "8"),
@@ -10,19 +27,30 @@ def create_blackjack_deck():
                     ("Queen", "Q"), ("King", "K")]
 
     deck = Deck()
-    for suit in suits:
-        for name, value in names_values:
-            deck.add_component(StandardPlayingCard(name=name, suit=suit, value=value))
+    for _ in range(number_of_decks):
+        for suit in suits:
+            for name, value in names_values:
+                deck.add_component(StandardPlayingCard(name=name, suit=suit, value=value))
     deck.shuffle()
     return deck
 
 
+def new_game(number_of_decks: int = 1, player_names=("Player", "Dealer")) -> CardGame:
+    """A game with one player per name (the dealer last) and a fresh shoe."""
+    return CardGame(players=[Player(name) for name in player_names], deck=create_blackjack_deck(number_of_decks))
+
+
 def deal_initial_cards(deck, player_hand, dealer_hand):
     for _ in range(2):
         player_hand.add_component(deck.draw_card()[0])
         dealer_hand.add_component(deck.draw_card()[0])
 
 
+def hand_total(cards: Iterable[StandardPlayingCard]) -> Tuple[int, bool]:
+    """Return the best total of the cards and whether it is soft (an ace counted as 11)."""
+    return blackjack_total(cards)
+
+
 def calculate_hand_value(hand):
-    # this could be done by creating a blackjack action manager and calling this action (?)
-    pass
\ No newline at end of file
+    cards = hand.get_components() if hasattr(hand, "get_components") else hand
+    return hand_total(cards)[0]
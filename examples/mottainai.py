@@ -1,9 +1,11 @@
 from container import Deck, CardContainer, ContainerContainer
 from game import Game
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from player import Player
 from controller.controller import ActionController
 from controller.action import *
+from events import Event, bus
+from typing import Dict, List, NamedTuple, Tuple
 
 standard_works_limit = 5
 extended_works_limit = 6
@@ -13,7 +15,7 @@ extended_works_limit = 6
 class MottainaiGame(Game):
     deck: Deck = None
     floor: CardContainer = None
-    action_controller: ActionController = ActionController()
+    action_controller: ActionController = field(default_factory=ActionController)
 
     def __post_init__(self):
         self.deck = Deck()
@@ -55,18 +57,130 @@ def initialize_tableau():
             ]
         )
     )
-    tableau_components = tableau.get_components()
-    for comp in tableau_components:
-        print(comp.name)
-        if comp.name == "left_wing" or comp.name == "right_wing":
+    return tableau
+
+
+def describe_tableau(tableau: ContainerContainer) -> str:
+    lines = []
+    for comp in tableau.get_components():
+        lines.append(comp.name)
+        if isinstance(comp, ContainerContainer):
             for subcomp in comp.get_components():
-                print('-', subcomp.name)
+                lines.append(f"- {subcomp.name}")
+    return "\n".join(lines)
 
-    return tableau
+
+def new_game(player_names=("Me", "You")) -> MottainaiGame:
+    return MottainaiGame(players=[MottainaiPlayer(name=name) for name in player_names])
+
+
+# (name, source, destination): moves of any one card from source to destination.
+# Places are "hand", "floor" or a tableau path such as "left_wing/works".
+MOVE_RULES = (
+    ("lead_task", "hand", "task"),
+    ("start_work", "hand", "craft_bench"),
+    ("complete_left_work", "craft_bench", "left_wing/works"),
+    ("complete_right_work", "craft_bench", "right_wing/works"),
+    ("gather_left", "floor", "left_wing/materials"),
+    ("gather_right", "floor", "right_wing/materials"),
+    ("discard", "hand", "floor"),
+    ("clear_task", "task", "floor"),
+)
+
+
+class Move(NamedTuple):
+    rule: str
+    card: Card
+    source: CardContainer
+    destination: CardContainer
+
+    def action(self) -> MoveCard:
+        return MoveCard(self.card, self.source, self.destination)
+
+
+class MoveGenerator:
+    """Legal moves of each player, cached per rule and kept up to date from ``events.bus``.
+
+    Every rule's moves depend only on its source and destination containers,
+    so each cached list remembers the change counts of those two containers
+    and is rebuilt only after one of them changed. Executing a move therefore
+    invalidates just the rules that read or write the two containers it
+    touched, and asking again costs time in proportion to that, not to the
+    size of the game. Moves must change containers through their methods
+    (as ``MoveCard`` on containers does), and the tableau layout is read once,
+    when the generator is created. Changes are only seen while the generator
+    is attached, so use it as a context manager or call ``attach``.
+    """
+
+    def __init__(self, game: MottainaiGame, rules: Tuple[Tuple[str, str, str], ...] = MOVE_RULES):
+        self.game = game
+        self.rules = rules
+        # Change count per tracked container, by id().
+        self._versions: Dict[int, int] = {}
+        self._places: Dict[int, List[Tuple[str, CardContainer, CardContainer]]] = {}
+        # (player, rule) -> (source version, destination version, moves)
+        self._cache: Dict[Tuple[int, str], Tuple[int, int, List[Move]]] = {}
+        self.rebuilt = 0
+        self._subscribed = False
+        for player in game.players:
+            self._places[id(player)] = [(name, self._place(player, source), self._place(player, destination))
+                                        for name, source, destination in rules]
+
+    def _place(self, player: MottainaiPlayer, path: str) -> CardContainer:
+        if path == "hand":
+            container = player.hand
+        elif path == "floor":
+            container = self.game.floor
+        else:
+            container = player.tableau.resolve(path)
+        self._versions.setdefault(id(container), 0)
+        return container
+
+    def _changed(self, event: Event):
+        versions = self._versions
+        key = id(event.source)
+        if key in versions:
+            versions[key] += 1
+
+    def legal_moves(self, player: MottainaiPlayer) -> List[Move]:
+        moves = []
+        versions = self._versions
+        cache = self._cache
+        for name, source, destination in self._places[id(player)]:
+            key = (id(player), name)
+            source_version, destination_version = versions[id(source)], versions[id(destination)]
+            cached = cache.get(key)
+            if cached is None or cached[0] != source_version or cached[1] != destination_version:
+                cached = cache[key] = (source_version, destination_version, self._generate(name, source, destination))
+                self.rebuilt += 1
+            moves.extend(cached[2])
+        return moves
+
+    @staticmethod
+    def _generate(name: str, source: CardContainer, destination: CardContainer) -> List[Move]:
+        if destination.max_capacity is not None and len(destination.get_components()) >= destination.max_capacity:
+            return []
+        return [Move(name, card, source, destination) for card in source.get_components()]
+
+    def attach(self) -> "MoveGenerator":
+        """Start following container changes on ``events.bus``."""
+        if not self._subscribed:
+            bus.subscribe(self._changed, ("container.add", "container.remove", "container.clear"))
+            self._subscribed = True
+        return self
+
+    def close(self):
+        if self._subscribed:
+            bus.unsubscribe(self._changed)
+            self._subscribed = False
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, *exc_info):
+        self.close()
 
 
-game = MottainaiGame(
-    players=[
-        MottainaiPlayer(name='Me'),
-        MottainaiPlayer(name='You')
-    ])
+if __name__ == "__main__":
+    game = new_game()
+    print(describe_tableau(game.players[0].tableau))
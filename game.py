@@ -1,15 +1,23 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from component import Component
-from typing import List
+from typing import List, Optional
 from player import Player
 from container import Deck
+from rng import RandomStream
 
 
 @dataclass
 class Game(Component):
     players: List[Player] = None
+    # The game's random stream; seed it to make a game reproducible.
+    rng: Optional[RandomStream] = field(default=None, kw_only=True, repr=False, compare=False)
 
 
 @dataclass
 class CardGame(Game):
     deck: Deck = None
+
+    def __post_init__(self):
+        # A deck without its own stream shuffles with one split from the game's.
+        if self.rng is not None and self.deck is not None and self.deck.rng is None:
+            self.deck.rng = self.rng.spawn("deck")
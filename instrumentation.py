@@ -0,0 +1,159 @@
+"""Opt-in call counting and latency histograms for hot library methods.
+
+``enable()`` swaps each target method for a timing wrapper and ``disable()``
+puts the original back, so while instrumentation is off the library runs its
+unmodified methods with no extra cost. Latencies are bucketed by powers of two
+nanoseconds, which keeps recording O(1) and memory constant however many calls
+are made.
+
+    from instrumentation import instruments
+    instruments.enable()
+    ...  # play some games
+    print(instruments.report())
+    instruments.disable()
+"""
+import functools
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from container import Board, Container, Deck
+from controller.controller import ActionController
+
+Target = Tuple[type, str]
+
+DEFAULT_TARGETS: Tuple[Target, ...] = (
+    (Container, "add_component"),
+    (Container, "remove_component"),
+    (Deck, "shuffle"),
+    (Deck, "draw_card"),
+    (ActionController, "execute"),
+    (ActionController, "undo"),
+    (ActionController, "redo"),
+    (Board, "get_cell"),
+)
+
+
+@dataclass
+class LatencyStats:
+    """Call count and latency histogram of one operation.
+
+    ``buckets[b]`` counts calls that took between ``2**(b-1)`` and ``2**b - 1``
+    nanoseconds.
+    """
+    count: int = 0
+    total_ns: int = 0
+    min_ns: Optional[int] = None
+    max_ns: int = 0
+    buckets: Dict[int, int] = field(default_factory=dict)
+
+    def record(self, elapsed_ns: int):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        bucket = elapsed_ns.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile_ns(self, percentile: float) -> int:
+        """Upper bound of the histogram bucket holding the given percentile."""
+        if not self.count:
+            return 0
+        threshold = self.count * percentile / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= threshold:
+                return (1 << bucket) - 1
+        return self.max_ns  # pragma: no cover
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "mean_ns": self.mean_ns,
+            "min_ns": self.min_ns or 0,
+            "max_ns": self.max_ns,
+            "p50_ns": self.percentile_ns(50),
+            "p90_ns": self.percentile_ns(90),
+            "p99_ns": self.percentile_ns(99),
+            "histogram": {str((1 << bucket) - 1): count for bucket, count in sorted(self.buckets.items())},
+        }
+
+
+class Instrumentation:
+    def __init__(self):
+        self.stats: Dict[str, LatencyStats] = {}
+        self._patched: List[Tuple[type, str, Callable]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patched)
+
+    def enable(self, targets: Iterable[Target] = DEFAULT_TARGETS):
+        """Start timing ``targets``, given as ``(class, method name)`` pairs."""
+        for cls, name in targets:
+            if any(patched_cls is cls and patched_name == name for patched_cls, patched_name, _ in self._patched):
+                continue
+            original = cls.__dict__[name]
+            label = f"{cls.__name__}.{name}"
+            stats = self.stats.setdefault(label, LatencyStats())
+            setattr(cls, name, _timed(original, stats))
+            self._patched.append((cls, name, original))
+
+    def disable(self):
+        """Restore the original methods; collected statistics are kept."""
+        for cls, name, original in reversed(self._patched):
+            setattr(cls, name, original)
+        self._patched.clear()
+
+    def reset(self):
+        # Wrappers hold on to their LatencyStats, so reset them in place.
+        for stats in self.stats.values():
+            stats.__init__()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of every operation called at least once, as plain dicts."""
+        return {label: stats.to_dict() for label, stats in sorted(self.stats.items()) if stats.count}
+
+    def to_json(self, path: Optional[str] = None, **dump_options) -> str:
+        """Serialize ``snapshot()``; also write it to ``path`` if given."""
+        text = json.dumps(self.snapshot(), **dump_options)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as output:
+                output.write(text)
+        return text
+
+    def report(self) -> str:
+        """Human readable table of the snapshot, slowest total time first."""
+        rows = sorted(self.snapshot().items(), key=lambda item: item[1]["total_ns"], reverse=True)
+        lines = [f"{'operation':<32}{'calls':>10}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'total ms':>11}"]
+        for label, stats in rows:
+            lines.append(f"{label:<32}{stats['count']:>10}{stats['mean_ns'] / 1e3:>10.2f}"
+                         f"{stats['p50_ns'] / 1e3:>10.2f}{stats['p99_ns'] / 1e3:>10.2f}{stats['total_ns'] / 1e6:>11.2f}")
+        return "\n".join(lines)
+
+
+def _timed(original: Callable, stats: LatencyStats) -> Callable:
+    clock = time.perf_counter_ns
+    record = stats.record
+
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            record(clock() - start)
+
+    return wrapper
+
+
+instruments = Instrumentation()
@@ -0,0 +1,126 @@
+"""Lazily loaded registry of games, component and container types, and actions.
+
+Plugins are declared by kind and name with a ``"module:attribute"`` target,
+the format of ``importlib.metadata`` entry points. Declaring one imports
+nothing: the module is imported the first time the plugin is loaded, so a host
+that can serve many games only pays the import and initialisation cost of the
+ones actually played::
+
+    registry.declare("game", "mottainai", "examples.mottainai:new_game", description="...")
+    game = registry.create("game", "mottainai")
+
+Installed packages can add plugins through entry points in the groups of
+``ENTRY_POINT_GROUPS``; ``load_entry_points`` declares them, again without
+importing them. Metadata given with a declaration (player counts, a
+description...) can be listed without loading anything.
+"""
+import importlib
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+GAME = "game"
+COMPONENT = "component"
+CONTAINER = "container"
+ACTION = "action"
+KINDS = (GAME, COMPONENT, CONTAINER, ACTION)
+ENTRY_POINT_GROUPS = {kind: f"bg_lib.{kind}s" for kind in KINDS}
+
+_UNLOADED = object()
+
+
+class PluginError(LookupError):
+    pass
+
+
+@dataclass
+class Plugin:
+    kind: str
+    name: str
+    # "module:attribute", e.g. "examples.mottainai:new_game".
+    target: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    _value: Any = field(default=_UNLOADED, init=False, repr=False, compare=False)
+
+    @property
+    def loaded(self) -> bool:
+        return self._value is not _UNLOADED
+
+    def load(self) -> Any:
+        """Import the target on first use and return it."""
+        if self._value is _UNLOADED:
+            module_name, _, attribute = self.target.partition(":")
+            try:
+                value = importlib.import_module(module_name)
+                for part in filter(None, attribute.split(".")):
+                    value = getattr(value, part)
+            except (ImportError, AttributeError) as error:
+                raise PluginError(f"Cannot load {self.kind} {self.name!r} from {self.target!r}: {error}") from error
+            self._value = value
+        return self._value
+
+
+class PluginRegistry:
+    def __init__(self):
+        self._plugins: Dict[Tuple[str, str], Plugin] = {}
+
+    def declare(self, kind: str, name: str, target: str, **metadata: Any) -> Plugin:
+        """Declare a plugin without importing it. A later declaration of the same name replaces it."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown plugin kind {kind!r}; expected one of {', '.join(KINDS)}.")
+        if ":" not in target:
+            raise ValueError(f"Plugin target {target!r} must look like 'module:attribute'.")
+        plugin = Plugin(kind, name, target, metadata)
+        self._plugins[kind, name] = plugin
+        return plugin
+
+    def register(self, kind: str, name: Optional[str] = None, **metadata: Any) -> Callable[[Any], Any]:
+        """Decorator declaring an object that is already imported, e.g. a custom ``Component`` class."""
+        def register_object(obj):
+            plugin = self.declare(kind, name or obj.__name__, f"{obj.__module__}:{obj.__qualname__}", **metadata)
+            plugin._value = obj
+            return obj
+        return register_object
+
+    def load_entry_points(self, groups: Optional[Dict[str, str]] = None) -> int:
+        """Declare the plugins installed packages advertise as entry points; return how many."""
+        count = 0
+        for kind, group in (groups or ENTRY_POINT_GROUPS).items():
+            for entry_point in entry_points(group=group):
+                self.declare(kind, entry_point.name, entry_point.value)
+                count += 1
+        return count
+
+    def plugin(self, kind: str, name: str) -> Plugin:
+        try:
+            return self._plugins[kind, name]
+        except KeyError:
+            raise PluginError(f"No {kind} plugin named {name!r}.") from None
+
+    def load(self, kind: str, name: str) -> Any:
+        return self.plugin(kind, name).load()
+
+    def create(self, kind: str, name: str, *args: Any, **kwargs: Any) -> Any:
+        """Load a plugin and call it, e.g. a game factory or an action class."""
+        return self.load(kind, name)(*args, **kwargs)
+
+    def names(self, kind: str) -> List[str]:
+        return [name for plugin_kind, name in self._plugins if plugin_kind == kind]
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._plugins
+
+    def __iter__(self) -> Iterator[Plugin]:
+        return iter(list(self._plugins.values()))
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+
+registry = PluginRegistry()
+registry.declare(GAME, "blackjack", "examples.blackjack:new_game", description="Blackjack against the dealer")
+registry.declare(GAME, "mottainai", "examples.mottainai:new_game", description="Mottainai tableau setup")
+registry.declare(ACTION, "move_card", "controller.action:MoveCard")
+registry.declare(ACTION, "move_cards", "controller.action:MoveCards")
+registry.declare(ACTION, "flip_card", "controller.action:FlipCard")
+registry.declare(ACTION, "transaction", "controller.action:Transaction")
@@ -0,0 +1,51 @@
+"""Seedable, splittable random number streams.
+
+Give each game (or deck) its own ``RandomStream`` instead of using the global
+``random`` module, and runs become reproducible from one seed. ``spawn`` derives
+child streams from the seed and a key rather than from the parent's state, so a
+worker's stream depends only on the root seed and the worker's key, not on how
+much randomness anything else has used::
+
+    root = RandomStream(seed)
+    deck_rng = root.spawn("deck")
+    worker_rngs = root.spawn_many(4)
+"""
+import hashlib
+import os
+import random
+from typing import Hashable, List, Optional
+
+
+def derive_seed(seed: int, key: Hashable) -> int:
+    """Derive an independent 64-bit seed from ``seed`` and ``key``."""
+    digest = hashlib.sha256(f"{seed}/{key}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+class RandomStream(random.Random):
+    """``random.Random`` that remembers its seed and can be split into child streams.
+
+    Without a seed, one is drawn from ``os.urandom`` and kept in ``seed_value`` so the
+    run can be reproduced.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed_value = seed
+        super().__init__(seed)
+
+    def spawn(self, key: Hashable) -> "RandomStream":
+        """The child stream for ``key``; the same seed and key give the same stream."""
+        return RandomStream(derive_seed(self.seed_value, key))
+
+    def spawn_many(self, count: int) -> List["RandomStream"]:
+        """Child streams for the keys ``0 .. count - 1``, e.g. one per worker."""
+        return [self.spawn(index) for index in range(count)]
+
+    def __reduce__(self):
+        # random.Random pickles without constructor arguments, which would lose seed_value.
+        return type(self), (self.seed_value,), self.getstate()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.seed_value})"
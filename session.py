@@ -0,0 +1,316 @@
+"""Asyncio host for many concurrent game sessions in one process.
+
+Each session owns a game state, an ``ActionController`` and a queue of pending
+commands. Clients ``submit`` commands from any coroutine; a single scheduler
+task runs them, so the commands of one session are applied one at a time and in
+submission order. Sessions with queued work take turns, each running at most
+``quantum`` commands before going to the back of the line, so a busy table
+cannot starve the others.
+
+A command is a callable taking the ``Session`` and returning the action to
+execute through the session's controller, or None if it acted on its own (for
+example ``lambda session: session.controller.undo()``). Commands receive the
+session rather than an action because an evicted game is rebuilt from its
+snapshot and objects captured before eviction would be stale.
+
+Sessions idle for ``idle_timeout`` seconds, and the least recently used ones
+beyond ``max_live``, are evicted: their game is replaced by a
+``snapshot.dumps`` of it and restored on the next command. Eviction keeps the
+game state only; the undo history starts afresh after a restore.
+
+    async with SessionHost(idle_timeout=60) as host:
+        host.open("table-1", game)
+        await host.submit("table-1", lambda session: FlipCard(session.game.deck.peek()[0]))
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+import snapshot
+from controller.action import Action
+from controller.controller import ActionController
+from events import bus
+from instrumentation import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+Command = Callable[["Session"], Optional[Action]]
+
+
+class SessionError(RuntimeError):
+    pass
+
+
+@dataclass
+class SessionStats:
+    """Per-session counters; ``latency`` is measured from submission to completion."""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    evictions: int = 0
+    restores: int = 0
+    latency: LatencyStats = field(default_factory=LatencyStats)
+    first_submitted: Optional[float] = None
+    last_completed: Optional[float] = None
+
+    @property
+    def throughput(self) -> float:
+        """Completed commands per second between the first submission and the last completion."""
+        if self.first_submitted is None or self.last_completed is None:
+            return 0.0
+        elapsed = self.last_completed - self.first_submitted
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "evictions": self.evictions,
+            "restores": self.restores,
+            "throughput": self.throughput,
+            "latency": self.latency.to_dict(),
+        }
+
+
+@dataclass(eq=False)
+class Session:
+    id: Hashable
+    game: Any
+    controller: ActionController
+    stats: SessionStats = field(default_factory=SessionStats)
+    # Snapshot of the game while the session is evicted.
+    snapshot: Optional[bytes] = field(default=None, repr=False)
+    last_active: float = 0.0
+    _pending: Deque[Tuple[Command, asyncio.Future, int]] = field(default_factory=deque, repr=False)
+    _scheduled: bool = field(default=False, repr=False)
+
+    @property
+    def evicted(self) -> bool:
+        return self.snapshot is not None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+
+class SessionHost:
+    def __init__(self, quantum: int = 8, idle_timeout: Optional[float] = None, max_live: Optional[int] = None,
+                 controller_factory: Callable[[], ActionController] = ActionController,
+                 sweep_interval: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.quantum = quantum
+        self.idle_timeout = idle_timeout
+        self.max_live = max_live
+        self.controller_factory = controller_factory
+        self.sweep_interval = sweep_interval if sweep_interval is not None else (idle_timeout or 0) / 2 or None
+        self.clock = clock
+        self.sessions: Dict[Hashable, Session] = {}
+        # Sessions whose game is in memory, least recently used first.
+        self._live: "OrderedDict[Hashable, Session]" = OrderedDict()
+        self._ready: Deque[Session] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: list = []
+
+    def open(self, session_id: Hashable, game: Any) -> Session:
+        if session_id in self.sessions:
+            raise SessionError(f"Session {session_id!r} is already open.")
+        session = Session(session_id, game, self.controller_factory(), last_active=self.clock())
+        self.sessions[session_id] = session
+        self._live[session_id] = session
+        try:
+            self._enforce_max_live()
+        except BaseException:
+            # The session is only open once the live limit holds.
+            del self.sessions[session_id]
+            self._live.pop(session_id, None)
+            raise
+        if bus.active:
+            bus.emit("session.open", self, session)
+        return session
+
+    def close(self, session_id: Hashable) -> Any:
+        """Remove a session, failing its pending commands, and return its game."""
+        session = self._session(session_id)
+        while session._pending:
+            _, future, _ = session._pending.popleft()
+            if not future.done():
+                future.set_exception(SessionError(f"Session {session_id!r} was closed."))
+        del self.sessions[session_id]
+        self._live.pop(session_id, None)
+        if session.evicted:
+            session.game = snapshot.loads(session.snapshot)
+            session.snapshot = None
+        if bus.active:
+            bus.emit("session.close", self, session)
+        return session.game
+
+    def _session(self, session_id: Hashable) -> Session:
+        try:
+            return self.sessions[session_id]
+        except KeyError:
+            raise KeyError(f"No session {session_id!r}.") from None
+
+    def submit_nowait(self, session_id: Hashable, command: Command) -> asyncio.Future:
+        """Queue ``command`` and return a future for the action it executed."""
+        session = self._session(session_id)
+        future = asyncio.get_running_loop().create_future()
+        session._pending.append((command, future, time.perf_counter_ns()))
+        stats = session.stats
+        stats.submitted += 1
+        if stats.first_submitted is None:
+            stats.first_submitted = time.perf_counter()
+        if not session._scheduled:
+            session._scheduled = True
+            self._ready.append(session)
+            if self._wakeup is not None:
+                self._wakeup.set()
+        return future
+
+    async def submit(self, session_id: Hashable, command: Command) -> Optional[Action]:
+        return await self.submit_nowait(session_id, command)
+
+    async def undo(self, session_id: Hashable):
+        await self.submit(session_id, lambda session: session.controller.undo())
+
+    async def redo(self, session_id: Hashable):
+        await self.submit(session_id, lambda session: session.controller.redo())
+
+    def _run_command(self, session: Session):
+        command, future, submitted_ns = session._pending.popleft()
+        if future.cancelled():
+            return
+        stats = session.stats
+        try:
+            self._restore(session)
+            action = command(session)
+            if action is not None:
+                session.controller.execute(action)
+        except Exception as error:
+            stats.failed += 1
+            future.set_exception(error)
+        else:
+            stats.completed += 1
+            future.set_result(action)
+        stats.latency.record(time.perf_counter_ns() - submitted_ns)
+        stats.last_completed = time.perf_counter()
+        session.last_active = self.clock()
+
+    async def _schedule(self):
+        ready = self._ready
+        while True:
+            if not ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            session = ready.popleft()
+            for _ in range(self.quantum):
+                if not session._pending:
+                    break
+                self._run_command(session)
+            if session._pending:
+                ready.append(session)
+            else:
+                session._scheduled = False
+            # Let clients run (and queue more work) between turns.
+            await asyncio.sleep(0)
+
+    def _restore(self, session: Session):
+        if session.snapshot is None:
+            self._live.move_to_end(session.id)
+            return
+        session.game = snapshot.loads(session.snapshot)
+        session.snapshot = None
+        session.controller = self.controller_factory()
+        session.stats.restores += 1
+        self._live[session.id] = session
+        if bus.active:
+            bus.emit("session.restore", self, session)
+        self._enforce_max_live(keep=session)
+
+    def evict(self, session_id: Hashable) -> bool:
+        """Snapshot an idle session's game and release it. Sessions with queued work are kept."""
+        session = self._session(session_id)
+        if session.evicted or session._pending:
+            return False
+        session.snapshot = snapshot.dumps(session.game)
+        session.game = None
+        session.controller = None
+        session.stats.evictions += 1
+        del self._live[session_id]
+        if bus.active:
+            bus.emit("session.evict", self, session)
+        return True
+
+    def evict_idle(self) -> int:
+        """Evict every session idle for longer than ``idle_timeout``; return how many were evicted."""
+        return sum(self.evict(session_id) for session_id in self._idle())
+
+    def _idle(self) -> List[Hashable]:
+        if self.idle_timeout is None:
+            return []
+        deadline = self.clock() - self.idle_timeout
+        return [session_id for session_id, session in self._live.items()
+                if session.last_active <= deadline and not session._pending]
+
+    def _enforce_max_live(self, keep: Optional[Session] = None):
+        if self.max_live is None or len(self._live) <= self.max_live:
+            return
+        for session_id, session in list(self._live.items()):
+            if len(self._live) <= self.max_live:
+                break
+            if session is not keep:
+                self.evict(session_id)
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            for session_id in self._idle():
+                # One session that cannot be evicted must not stop the sweeper.
+                try:
+                    self.evict(session_id)
+                except Exception:
+                    logger.exception("Could not evict idle session %r", session_id)
+
+    def start(self):
+        """Start the scheduler (and the idle sweeper) on the running event loop."""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        if self._ready:
+            self._wakeup.set()
+        self._tasks.append(asyncio.create_task(self._schedule()))
+        if self.idle_timeout is not None and self.sweep_interval:
+            self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._wakeup = None
+
+    async def drain(self):
+        """Wait until every queued command has run."""
+        while self._ready:
+            await asyncio.sleep(0)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def stats(self) -> Dict[Hashable, Dict[str, Any]]:
+        return {session_id: session.stats.to_dict() for session_id, session in self.sessions.items()}
+
+    def report(self) -> str:
+        lines = [f"{'session':<16}{'done':>8}{'failed':>8}{'ops/s':>12}{'mean us':>10}{'p99 us':>10}"]
+        for session_id, session in self.sessions.items():
+            stats = session.stats
+            lines.append(f"{str(session_id):<16}{stats.completed:>8}{stats.failed:>8}{stats.throughput:>12.0f}"
+                         f"{stats.latency.mean_ns / 1000:>10.1f}{stats.latency.percentile_ns(99) / 1000:>10.1f}")
+        return "\n".join(lines)
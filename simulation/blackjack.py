@@ -0,0 +1,217 @@
+"""Monte Carlo blackjack built on ``examples.blackjack``.
+
+``run_simulation`` splits the requested rounds into fixed-size chunks. Each
+chunk gets its own RNG seed, derived from the base seed and the chunk number, so
+results only depend on ``seed`` and ``chunk_size``, never on how many worker
+processes ran the chunks. Workers return ``BlackjackStats`` that are merged as
+they arrive, so memory stays constant in the number of rounds.
+
+The game is simplified to hit/stand decisions: no doubling, splitting,
+insurance or surrender.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Protocol, Tuple
+
+from container import Deck, Hand
+from evaluation import BLACKJACK_POINTS_BY_VALUE
+from examples.blackjack import create_blackjack_deck, deal_initial_cards, hand_total
+from rng import RandomStream, derive_seed
+from simulation.stats import RunningStats
+
+
+@dataclass(frozen=True)
+class BlackjackRules:
+    number_of_decks: int = 6
+    # Fraction of the shoe dealt before reshuffling.
+    penetration: float = 0.75
+    dealer_hits_soft_17: bool = False
+    blackjack_payout: float = 1.5
+
+    def __post_init__(self):
+        if not 0 < self.penetration <= 1:
+            raise ValueError(f"Penetration must be in (0, 1], got {self.penetration}.")
+
+
+class Strategy(Protocol):
+    def should_hit(self, total: int, soft: bool, dealer_upcard: int) -> bool:
+        """Decide whether to hit; ``dealer_upcard`` is 1 for an ace, 10 for faces."""
+        ...  # pragma: no cover
+
+
+@dataclass(frozen=True)
+class StandOnStrategy:
+    """Hit until the total reaches ``threshold``, like the dealer does."""
+    threshold: int = 17
+
+    def should_hit(self, total: int, soft: bool, dealer_upcard: int) -> bool:
+        return total < self.threshold
+
+
+@dataclass(frozen=True)
+class BasicStrategy:
+    """Hit/stand part of the standard basic strategy chart."""
+
+    def should_hit(self, total: int, soft: bool, dealer_upcard: int) -> bool:
+        dealer_strong = dealer_upcard >= 7 or dealer_upcard == 1
+        if soft:
+            return total <= 17 or (total == 18 and (dealer_upcard >= 9 or dealer_upcard == 1))
+        if total <= 11:
+            return True
+        if total == 12:
+            return not 4 <= dealer_upcard <= 6
+        if total <= 16:
+            return dealer_strong
+        return False
+
+
+@dataclass
+class BlackjackStats:
+    """Aggregated outcome of many rounds; ``payout`` is in units of the initial bet."""
+    payout: RunningStats = field(default_factory=RunningStats)
+    wins: int = 0
+    losses: int = 0
+    pushes: int = 0
+    busts: int = 0
+    blackjacks: int = 0
+
+    @property
+    def rounds(self) -> int:
+        return self.payout.count
+
+    @property
+    def expected_value(self) -> float:
+        return self.payout.mean
+
+    @property
+    def variance(self) -> float:
+        return self.payout.variance
+
+    @property
+    def bust_rate(self) -> float:
+        return self.busts / self.rounds if self.rounds else 0.0
+
+    def merge(self, other: "BlackjackStats"):
+        self.payout.merge(other.payout)
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.busts += other.busts
+        self.blackjacks += other.blackjacks
+
+
+def chunk_seed(seed: int, chunk_index: int) -> int:
+    """Derive an independent 64-bit seed for one chunk of work."""
+    return derive_seed(seed, chunk_index)
+
+
+class _Shoe:
+    def __init__(self, rules: BlackjackRules, rng: random.Random):
+        # create_blackjack_deck shuffles with the global RNG; put the cards in a
+        # canonical order so the shoe only depends on ``rng``.
+        self.cards = sorted(create_blackjack_deck(rules.number_of_decks).get_components(),
+                            key=lambda card: (card.suit, card.value))
+        self.cut = int(len(self.cards) * (1 - rules.penetration))
+        self.rng = rng
+        # Lazy shuffling only orders the cards dealt before the cut card.
+        self.deck = Deck(rng=rng, lazy_shuffle=True)
+        self.reshuffle()
+
+    def reshuffle(self, *in_play: Hand):
+        """Shuffle every card back into the shoe except those held in ``in_play``."""
+        held = {id(card) for hand in in_play for card in hand.components}
+        self.deck.components = [card for card in self.cards if id(card) not in held]
+        self.deck.shuffle()
+
+    def draw(self, *in_play: Hand):
+        # A deep cut can run the shoe dry mid-round; reshuffle the discards then.
+        if not self.deck.deck_size():
+            self.reshuffle(*in_play)
+        return self.deck.draw_card()[0]
+
+
+def play_round(shoe: _Shoe, strategy: Strategy, rules: BlackjackRules,
+               player: Hand, dealer: Hand, stats: BlackjackStats):
+    """Play one round and record it in ``stats``."""
+    # Reshuffle at the cut card, or when too few cards are left to deal a round.
+    if shoe.deck.deck_size() <= max(shoe.cut, 3):
+        shoe.reshuffle()
+    player.clear_components()
+    dealer.clear_components()
+    deal_initial_cards(shoe.deck, player, dealer)
+
+    player_total, player_soft = hand_total(player.components)
+    dealer_total, dealer_soft = hand_total(dealer.components)
+    if player_total == 21 or dealer_total == 21:
+        if player_total == dealer_total:
+            stats.pushes += 1
+            stats.payout.push(0.0)
+        elif player_total == 21:
+            stats.blackjacks += 1
+            stats.wins += 1
+            stats.payout.push(rules.blackjack_payout)
+        else:
+            stats.losses += 1
+            stats.payout.push(-1.0)
+        return
+
+    upcard = BLACKJACK_POINTS_BY_VALUE[dealer.components[0].value]
+    while player_total < 21 and strategy.should_hit(player_total, player_soft, upcard):
+        player.add_component(shoe.draw(player, dealer))
+        player_total, player_soft = hand_total(player.components)
+    if player_total > 21:
+        stats.busts += 1
+        stats.losses += 1
+        stats.payout.push(-1.0)
+        return
+
+    while dealer_total < 17 or (dealer_total == 17 and dealer_soft and rules.dealer_hits_soft_17):
+        dealer.add_component(shoe.draw(player, dealer))
+        dealer_total, dealer_soft = hand_total(dealer.components)
+
+    if dealer_total > 21 or player_total > dealer_total:
+        stats.wins += 1
+        stats.payout.push(1.0)
+    elif player_total == dealer_total:
+        stats.pushes += 1
+        stats.payout.push(0.0)
+    else:
+        stats.losses += 1
+        stats.payout.push(-1.0)
+
+
+def simulate_chunk(task: Tuple[int, int, Strategy, BlackjackRules]) -> BlackjackStats:
+    """Play ``rounds`` rounds from a fresh shoe seeded with ``seed``."""
+    seed, rounds, strategy, rules = task
+    shoe = _Shoe(rules, RandomStream(seed))
+    player, dealer = Hand(), Hand()
+    stats = BlackjackStats()
+    for _ in range(rounds):
+        play_round(shoe, strategy, rules, player, dealer, stats)
+    return stats
+
+
+def _tasks(rounds: int, chunk_size: int, seed: int, strategy: Strategy,
+           rules: BlackjackRules) -> Iterator[Tuple[int, int, Strategy, BlackjackRules]]:
+    for chunk_index, start in enumerate(range(0, rounds, chunk_size)):
+        yield chunk_seed(seed, chunk_index), min(chunk_size, rounds - start), strategy, rules
+
+
+def run_simulation(rounds: int, strategy: Strategy = BasicStrategy(), rules: BlackjackRules = BlackjackRules(),
+                   seed: int = 0, workers: Optional[int] = None, chunk_size: int = 10_000) -> BlackjackStats:
+    """Play ``rounds`` rounds and return the merged statistics.
+
+    ``workers`` is the process pool size (``None`` for one per CPU); ``workers=1``
+    runs everything in the calling process. Strategies must be picklable.
+    """
+    stats = BlackjackStats()
+    tasks = _tasks(rounds, chunk_size, seed, strategy, rules)
+    if workers == 1:
+        for task in tasks:
+            stats.merge(simulate_chunk(task))
+        return stats
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_stats in executor.map(simulate_chunk, tasks):
+            stats.merge(chunk_stats)
+    return stats
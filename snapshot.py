@@ -0,0 +1,527 @@
+"""Compact binary snapshots of game state.
+
+``dumps`` flattens a state (a ``Game``, ``Player``, container or component, and
+everything reachable from it) into a table of objects and writes it as a single
+``marshal`` blob behind a small versioned header. References between objects
+are table positions and component ids are kept as they are, so a loaded state
+has the same ids and the same sharing as the original.
+
+Objects of the same class reached through the same list (the cards of a deck,
+the cells of a board) are written together, one column per attribute. For
+components, the attributes other than ``INSTANCE_ATTRIBUTES`` (name,
+description, suit, value, ...) form the component's definition, which is stored
+once per snapshot however many components share it: a six-deck shoe stores 52
+definitions, not 312.
+
+``SnapshotArchive`` appends many snapshots to one file with an offset index at
+the end, and memory-maps the file for reading so any single state can be
+loaded without reading the others.
+
+Snapshots name the classes of the objects they contain (``module:qualname``)
+and loading imports those modules, so only load snapshots from trusted sources.
+"""
+import importlib
+import marshal
+import mmap
+import random
+import struct
+import uuid
+from collections import deque
+from dataclasses import is_dataclass
+from itertools import chain, islice, repeat
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from component import AbstractComponent
+from container import AbstractContainer, Deck
+
+MAGIC = b"BGLS"
+ARCHIVE_MAGIC = b"BGLA"
+VERSION = 1
+_MARSHAL_VERSION = 4
+
+# Per-instance attributes of components; all other attributes are definition.
+INSTANCE_ATTRIBUTES = frozenset({"id", "front_side_up", "owner"})
+# Lazily rebuilt caches, reset to None on load.
+_TRANSIENT_ATTRIBUTES = frozenset({"_index", "_buckets"})
+
+_HEADER = struct.Struct("<4sBB")
+_ARCHIVE_HEADER = struct.Struct("<4sB")
+_ARCHIVE_FOOTER = struct.Struct("<QQ4s")
+_LENGTH = struct.Struct("<I")
+_OFFSET = struct.Struct("<Q")
+
+# Tags of encoded non-scalar values; scalars are stored as they are.
+_REF = 0
+_REFS = 1
+_LIST = 2
+_TUPLE = 3
+_DICT = 4
+_SET = 5
+_FROZENSET = 6
+_UUID = 7
+_TYPE = 8
+_RANDOM = 9
+_DEQUE = 10
+
+# Kinds of attribute columns.
+_SCALAR_COLUMN = 0
+_UUID_COLUMN = 1
+_VALUE_COLUMN = 2
+_REFS_COLUMN = 3
+_OBJECT_COLUMN = 4
+
+_SCALAR_TYPES = frozenset({type(None), bool, int, float, complex, str, bytes})
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _type_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+_resolved_types: Dict[str, type] = {}
+
+
+def _resolve_type(name: str) -> type:
+    cls = _resolved_types.get(name)
+    if cls is None:
+        module_name, _, qualname = name.partition(":")
+        try:
+            cls = importlib.import_module(module_name)
+            for part in qualname.split("."):
+                cls = getattr(cls, part)
+        except (ImportError, AttributeError):
+            raise SnapshotError(f"Unknown type {name!r} in snapshot.") from None
+        if not isinstance(cls, type) or not (_is_object(cls) or issubclass(cls, random.Random)):
+            raise SnapshotError(f"{name} cannot be loaded from a snapshot.")
+        _resolved_types[name] = cls
+    return cls
+
+
+def _is_object(cls: type) -> bool:
+    return issubclass(cls, (AbstractComponent, AbstractContainer)) or is_dataclass(cls)
+
+
+def _getter(names: tuple) -> Callable[[dict], tuple]:
+    if len(names) == 1:
+        name = names[0]
+        return lambda attributes: (attributes[name],)
+    if not names:
+        return lambda attributes: ()
+    return itemgetter(*names)
+
+
+class _Plan:
+    """How objects of one class are encoded, shared by all snapshots.
+
+    Components whose definition attributes all hold scalars are written with
+    ``layout`` (instance attributes plus a definition reference); every other
+    object is written with ``unshared_layout`` (all attributes).
+    """
+    __slots__ = ("size", "slots", "compact", "layout", "instance", "definition", "unshared_layout", "unshared")
+
+    def __init__(self, cls: type, names: tuple, slots: bool):
+        self.size = len(names)
+        self.slots = names if slots else None
+        self.compact = issubclass(cls, Deck)
+        kept = tuple(name for name in names if name not in _TRANSIENT_ATTRIBUTES)
+        reset = tuple(name for name in names if name in _TRANSIENT_ATTRIBUTES)
+        self.unshared_layout = (_type_name(cls), kept, (), reset)
+        self.unshared = _getter(kept)
+        self.layout = self.instance = self.definition = None
+        if issubclass(cls, AbstractComponent):
+            instance = tuple(name for name in kept if name in INSTANCE_ATTRIBUTES)
+            definition = tuple(name for name in kept if name not in INSTANCE_ATTRIBUTES)
+            if definition:
+                self.layout = (_type_name(cls), instance, definition, reset)
+                self.instance = _getter(instance)
+                self.definition = _getter(definition)
+
+
+def _slot_names(cls: type) -> tuple:
+    return tuple(name for klass in reversed(cls.__mro__) for name in getattr(klass, "__slots__", ())
+                 if name != "__weakref__")
+
+
+# Plans by class, built from the first object of the class that is encoded.
+_plans: Dict[type, _Plan] = {}
+_attributes_of = attrgetter("__dict__")
+
+
+class _Encoder:
+    def __init__(self):
+        self.layouts: List[tuple] = []
+        # Definitions of each layout, mapped to their position.
+        self.definitions: Dict[int, Dict[tuple, int]] = {}
+        self.groups: List[tuple] = []
+        self.count = 0
+        self._layout_ids: Dict[int, int] = {}
+        self._refs: Dict[int, int] = {}
+        self._object_types: Dict[type, bool] = {}
+
+    def _layout(self, layout: tuple) -> int:
+        index = self._layout_ids.get(id(layout))
+        if index is None:
+            index = self._layout_ids[id(layout)] = len(self.layouts)
+            self.layouts.append(layout)
+        return index
+
+    def ref(self, obj: Any) -> int:
+        index = self._refs.get(id(obj))
+        if index is None:
+            self._add_group([obj])
+            index = self._refs[id(obj)]
+        return index
+
+    def refs(self, items: list) -> tuple:
+        refs = self._refs
+        new = {id(item): item for item in items if id(item) not in refs}
+        if new:
+            new = list(new.values())
+            classes = set(map(type, new))
+            if len(classes) == 1:
+                self._add_group(new)
+            else:
+                by_class: Dict[type, list] = {}
+                for item in new:
+                    by_class.setdefault(type(item), []).append(item)
+                for group in by_class.values():
+                    self._add_group(group)
+        return tuple(map(refs.__getitem__, map(id, items)))
+
+    def _add_group(self, items: list, plan: Optional[_Plan] = None):
+        """Number ``items`` (all of one class) and write them as one group of columns."""
+        cls = type(items[0])
+        if plan is None:
+            plan = _plans.get(cls)
+            if plan is None:
+                attributes = getattr(items[0], "__dict__", None)
+                plan = _plans[cls] = _Plan(cls, _slot_names(cls) if attributes is None else tuple(attributes),
+                                           slots=attributes is None)
+        if plan.compact:
+            for item in items:
+                item._compact()
+        if plan.slots is not None:
+            attributes = [{name: getattr(item, name) for name in plan.slots} for item in items]
+        else:
+            attributes = list(map(_attributes_of, items))
+
+        try:
+            if plan.slots is None and set(map(len, attributes)) != {plan.size}:
+                raise KeyError
+            definitions = None
+            if plan.definition is not None:
+                definitions = list(map(plan.definition, attributes))
+                if _SCALAR_TYPES.issuperset(map(type, chain.from_iterable(definitions))):
+                    rows = list(map(plan.instance, attributes))
+                else:
+                    definitions = None
+            if definitions is None:
+                rows = list(map(plan.unshared, attributes))
+        except KeyError:
+            # Objects whose attributes differ from the rest of their class.
+            for item in items:
+                self._add_group([item], _Plan(cls, tuple(item.__dict__), slots=False))
+            return
+
+        start = self.count
+        self.count += len(items)
+        self._refs.update(zip(map(id, items), range(start, self.count)))
+        if definitions is not None:
+            layout = self._layout(plan.layout)
+            table = self.definitions.setdefault(layout, {})
+            setdefault = table.setdefault
+            definition_column = tuple([setdefault(definition, len(table)) for definition in definitions])
+        else:
+            layout = self._layout(plan.unshared_layout)
+            definition_column = ()
+        columns = [self._column(column) for column in zip(*rows)]
+        self.groups.append((layout, start, len(items), definition_column, *columns))
+
+    def _column(self, values: tuple) -> tuple:
+        classes = set(map(type, values))
+        if classes <= _SCALAR_TYPES:
+            return _SCALAR_COLUMN, values
+        if len(classes) == 1 and uuid.UUID in classes:
+            return _UUID_COLUMN, tuple([value.int for value in values])
+        if all(map(self.is_object, classes)):
+            # e.g. the definition of each CatalogCard.
+            return _OBJECT_COLUMN, self.refs(list(values))
+        if classes == {list}:
+            # e.g. the components of each container: numbered as one batch.
+            items = list(chain.from_iterable(values))
+            if all(map(self.is_object, set(map(type, items)))):
+                return _REFS_COLUMN, tuple(map(len, values)), self.refs(items)
+        return _VALUE_COLUMN, tuple(map(self.value, values))
+
+    def is_object(self, cls: type) -> bool:
+        known = self._object_types.get(cls)
+        if known is None:
+            known = self._object_types[cls] = _is_object(cls)
+        return known
+
+    def value(self, value: Any) -> Any:
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            return value
+        if value_type is uuid.UUID:
+            return _UUID, value.int
+        if value_type is list:
+            if all(map(self.is_object, set(map(type, value)))):
+                return _REFS, self.refs(value)
+            return _LIST, tuple(map(self.value, value))
+        if isinstance(value, type):
+            return _TYPE, _type_name(value)
+        if self.is_object(value_type):
+            return _REF, self.ref(value)
+        if isinstance(value, random.Random):
+            # Random streams (e.g. ``Deck.rng``) keep their exact state.
+            return _RANDOM, _type_name(value_type), value.getstate(), self.value(dict(vars(value)))
+        if value_type is tuple:
+            return _TUPLE, tuple(map(self.value, value))
+        if value_type is dict:
+            return _DICT, tuple(map(self.value, value)), tuple(map(self.value, value.values()))
+        if value_type is set or value_type is frozenset:
+            return _SET if value_type is set else _FROZENSET, tuple(map(self.value, value))
+        if value_type is deque:
+            # E.g. ``ActionController.undo_stack``, bounded by its ``maxlen``.
+            return _DEQUE, tuple(map(self.value, value)), value.maxlen
+        raise SnapshotError(f"Cannot snapshot a value of type {value_type.__name__}.")
+
+
+def dumps(state: Any) -> bytes:
+    """Encode ``state`` and everything reachable from it as a snapshot."""
+    encoder = _Encoder()
+    root = encoder.value(state)
+    definitions = tuple(tuple(encoder.definitions.get(layout, ())) for layout in range(len(encoder.layouts)))
+    payload = (tuple(encoder.layouts), definitions, encoder.count, tuple(encoder.groups), root)
+    return _HEADER.pack(MAGIC, VERSION, _MARSHAL_VERSION) + marshal.dumps(payload, _MARSHAL_VERSION)
+
+
+_new_object = object.__new__
+_set_attribute = object.__setattr__
+_UNKNOWN_SAFETY = uuid.SafeUUID.unknown
+
+
+def _uuid(value: int) -> uuid.UUID:
+    # Same as uuid.UUID(int=value) without re-validating a value we wrote.
+    result = _new_object(uuid.UUID)
+    _set_attribute(result, "int", value)
+    _set_attribute(result, "is_safe", _UNKNOWN_SAFETY)
+    return result
+
+
+def _decode(value: Any, objects: List[Any]) -> Any:
+    if type(value) is not tuple:
+        return value
+    tag, data = value[0], value[1]
+    if tag == _REF:
+        return objects[data]
+    if tag == _REFS:
+        return list(map(objects.__getitem__, data))
+    if tag == _UUID:
+        return _uuid(data)
+    if tag == _TYPE:
+        return _resolve_type(data)
+    if tag == _DICT:
+        return {_decode(key, objects): _decode(item, objects) for key, item in zip(data, value[2])}
+    if tag == _RANDOM:
+        cls = _resolve_type(data)
+        stream = cls.__new__(cls)
+        stream.setstate(value[2])
+        vars(stream).update(_decode(value[3], objects))
+        return stream
+    items = [_decode(item, objects) for item in data]
+    if tag == _LIST:
+        return items
+    if tag == _TUPLE:
+        return tuple(items)
+    if tag == _SET:
+        return set(items)
+    if tag == _FROZENSET:
+        return frozenset(items)
+    if tag == _DEQUE:
+        return deque(items, value[2])
+    raise SnapshotError(f"Unknown value tag {tag}.")
+
+
+def _decode_column(column: tuple, objects: List[Any]) -> Any:
+    kind, values = column[0], column[1]
+    if kind == _SCALAR_COLUMN:
+        return values
+    if kind == _UUID_COLUMN:
+        return map(_uuid, values)
+    if kind == _OBJECT_COLUMN:
+        return map(objects.__getitem__, values)
+    if kind == _REFS_COLUMN:
+        items = iter(list(map(objects.__getitem__, column[2])))
+        return [list(islice(items, length)) for length in values]
+    return [_decode(value, objects) for value in values]
+
+
+def loads(data: bytes) -> Any:
+    """Rebuild the state encoded by ``dumps``. ``data`` may be any bytes-like object."""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated.")
+    magic, version, _ = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SnapshotError("Not a snapshot.")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}.")
+    try:
+        layouts, definitions, count, groups, root = marshal.loads(view[_HEADER.size:])
+    except (EOFError, ValueError, TypeError) as error:
+        raise SnapshotError(f"Corrupt snapshot: {error}") from None
+
+    classes = [_resolve_type(layout[0]) for layout in layouts]
+    objects: List[Any] = [None] * count
+    for layout, start, size, *_ in groups:
+        cls = classes[layout]
+        objects[start:start + size] = [_new_object(cls) for _ in range(size)]
+
+    for layout, start, size, definition_column, *columns in groups:
+        _, instance, definition, reset = layouts[layout]
+        rows = zip(*[_decode_column(column, objects) for column in columns]) if columns else repeat((), size)
+        members = objects[start:start + size]
+        if definition:
+            shared = [dict(zip(definition, values)) for values in definitions[layout]]
+            shared = map(shared.__getitem__, definition_column)
+        else:
+            shared = repeat(None, size)
+        if hasattr(members[0], "__dict__"):
+            cleared = dict.fromkeys(reset)
+            for obj, row, shared_attributes in zip(members, rows, shared):
+                attributes = obj.__dict__
+                attributes.update(zip(instance, row))
+                if shared_attributes:
+                    attributes.update(shared_attributes)
+                if cleared:
+                    attributes.update(cleared)
+        else:
+            for obj, row, shared_attributes in zip(members, rows, shared):
+                for name, value in zip(instance, row):
+                    _set_attribute(obj, name, value)
+                if shared_attributes:
+                    for name, value in shared_attributes.items():
+                        _set_attribute(obj, name, value)
+    return _decode(root, objects)
+
+
+def save(path: str, state: Any):
+    with open(path, "wb") as snapshot_file:
+        snapshot_file.write(dumps(state))
+
+
+def load(path: str) -> Any:
+    with open(path, "rb") as snapshot_file:
+        return loads(snapshot_file.read())
+
+
+class SnapshotArchive:
+    """Many snapshots in one file, readable by position without loading the others.
+
+    The file is a header, then length-prefixed snapshots, then a table of their
+    offsets and a footer pointing at it::
+
+        BGLA <version:u8> (<length:u32> <snapshot>)* <offset:u64>* <index offset:u64> <count:u64> BGLA
+
+    Mode ``"w"`` creates an archive, ``"a"`` appends to an existing one and ``"r"``
+    memory-maps it read-only. The offset table is written by ``close``, so an
+    archive that was never closed cannot be opened again.
+    """
+
+    def __init__(self, path: str, mode: str = "r"):
+        if mode not in ("r", "w", "a"):
+            raise ValueError(f"Invalid archive mode {mode!r}.")
+        self.path = path
+        self.mode = mode
+        self._mmap = None
+        self._offsets: List[int] = []
+        if mode == "w":
+            self._file = open(path, "wb")
+            self._file.write(_ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, VERSION))
+            return
+        self._file = open(path, "rb" if mode == "r" else "r+b")
+        index_offset, count = self._read_footer()
+        if mode == "r":
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index_offset = index_offset
+            self._count = count
+        else:
+            self._file.seek(index_offset)
+            table = self._file.read(count * _OFFSET.size)
+            self._offsets = [offset for offset, in _OFFSET.iter_unpack(table)]
+            self._file.seek(index_offset)
+            self._file.truncate()
+
+    def _read_footer(self) -> Tuple[int, int]:
+        header = self._file.read(_ARCHIVE_HEADER.size)
+        if len(header) < _ARCHIVE_HEADER.size or _ARCHIVE_HEADER.unpack(header)[0] != ARCHIVE_MAGIC:
+            raise SnapshotError(f"{self.path} is not a snapshot archive.")
+        version = _ARCHIVE_HEADER.unpack(header)[1]
+        if version != VERSION:
+            raise SnapshotError(f"Unsupported archive version {version}.")
+        self._file.seek(-_ARCHIVE_FOOTER.size, 2)
+        index_offset, count, magic = _ARCHIVE_FOOTER.unpack(self._file.read(_ARCHIVE_FOOTER.size))
+        if magic != ARCHIVE_MAGIC:
+            raise SnapshotError(f"{self.path} has no index; it was not closed after writing.")
+        return index_offset, count
+
+    def append(self, state: Any) -> int:
+        """Add a snapshot of ``state`` and return its position in the archive."""
+        if self.mode == "r":
+            raise SnapshotError("Archive is open for reading.")
+        data = dumps(state)
+        self._offsets.append(self._file.tell())
+        self._file.write(_LENGTH.pack(len(data)))
+        self._file.write(data)
+        return len(self._offsets) - 1
+
+    def raw(self, position: int) -> memoryview:
+        """The encoded snapshot at ``position``, without copying it out of the map."""
+        if self._mmap is None:
+            raise SnapshotError("Archive is not open for reading.")
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("Archive position out of range.")
+        offset, = _OFFSET.unpack_from(self._mmap, self._index_offset + position * _OFFSET.size)
+        length, = _LENGTH.unpack_from(self._mmap, offset)
+        start = offset + _LENGTH.size
+        return memoryview(self._mmap)[start:start + length]
+
+    def __getitem__(self, position: int) -> Any:
+        raw = self.raw(position)
+        try:
+            return loads(raw)
+        finally:
+            raw.release()
+
+    def __len__(self) -> int:
+        return self._count if self.mode == "r" else len(self._offsets)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self._mmap is not None:
+            self._mmap.close()
+        elif self.mode != "r":
+            index_offset = self._file.tell()
+            for offset in self._offsets:
+                self._file.write(_OFFSET.pack(offset))
+            self._file.write(_ARCHIVE_FOOTER.pack(index_offset, len(self._offsets), ARCHIVE_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,205 @@
+"""Pathfinding, movement range and line-of-sight queries over a ``Board``.
+
+``SpatialQueries`` caches every answer together with the cells the search had
+to look at and whether each of them was blocked. A cached answer is reused as
+long as none of those cells changed occupancy, so repeating a query within a
+turn costs one pass over the cells involved instead of a new search. Paths and
+ranges are returned as copies, so callers may modify them freely.
+"""
+import heapq
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from container import Board, Container
+
+Coordinates = Tuple[int, int]
+
+
+def is_occupied(cell: Container) -> bool:
+    """Default blocking rule: a cell holding any component blocks movement and sight."""
+    return bool(cell.components)
+
+
+def _to_axial(x: int, y: int) -> Tuple[int, int]:
+    # odd-r offset coordinates to axial (q, r)
+    return x - (y - (y & 1)) // 2, y
+
+
+def _from_axial(q: int, r: int) -> Coordinates:
+    return q + (r - (r & 1)) // 2, r
+
+
+def distance(board: Board, start: Coordinates, goal: Coordinates, diagonal: bool = False) -> int:
+    """Number of steps between two cells on an empty board."""
+    if board.board_type == "hex":
+        q1, r1 = _to_axial(*start)
+        q2, r2 = _to_axial(*goal)
+        dq, dr = q1 - q2, r1 - r2
+        return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+    dx, dy = abs(start[0] - goal[0]), abs(start[1] - goal[1])
+    return max(dx, dy) if diagonal else dx + dy
+
+
+def line(board: Board, start: Coordinates, goal: Coordinates) -> List[Coordinates]:
+    """Cells crossed by the straight line from ``start`` to ``goal``, both included."""
+    if board.board_type == "hex":
+        q1, r1 = _to_axial(*start)
+        q2, r2 = _to_axial(*goal)
+        steps = distance(board, start, goal)
+        if steps == 0:
+            return [start]
+        cells = []
+        for step in range(steps + 1):
+            t = step / steps
+            # nudge off cell edges so ties round consistently
+            q = q1 + (q2 - q1) * t + 1e-6
+            r = r1 + (r2 - r1) * t + 2e-6
+            s = -q - r
+            rq, rr, rs = round(q), round(r), round(s)
+            dq, dr, ds = abs(rq - q), abs(rr - r), abs(rs - s)
+            if dq > dr and dq > ds:
+                rq = -rr - rs
+            elif dr > ds:
+                rr = -rq - rs
+            cells.append(_from_axial(rq, rr))
+        return cells
+    # Bresenham
+    x, y = start
+    x2, y2 = goal
+    dx, dy = abs(x2 - x), -abs(y2 - y)
+    sx, sy = (1 if x < x2 else -1), (1 if y < y2 else -1)
+    error = dx + dy
+    cells = [(x, y)]
+    while (x, y) != (x2, y2):
+        doubled = 2 * error
+        if doubled >= dy:
+            error += dy
+            x += sx
+        if doubled <= dx:
+            error += dx
+            y += sy
+        cells.append((x, y))
+    return cells
+
+
+class SpatialQueries:
+    """Cached spatial queries for one board.
+
+    ``blocked(cell)`` decides which cells cannot be entered or seen through; it
+    must depend only on the cell's contents. The start cell of a path or range
+    query is never considered blocked (it usually holds the moving piece).
+    Square boards move orthogonally unless ``diagonal`` is set.
+    """
+
+    def __init__(self, board: Board, blocked: Callable[[Container], bool] = is_occupied,
+                 diagonal: bool = False, cache_size: int = 4096):
+        self.board = board
+        self.blocked = blocked
+        self.diagonal = diagonal
+        self.cache_size = cache_size
+        self._cache: Dict[Hashable, Tuple[object, Tuple[int, ...], Tuple[bool, ...]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key: Hashable, compute: Callable[[], Tuple[object, Iterable[int]]]):
+        cells, blocked = self.board.cells, self.blocked
+        entry = self._cache.get(key)
+        if entry is not None:
+            result, involved, snapshot = entry
+            if tuple([blocked(cells[index]) for index in involved]) == snapshot:
+                self.hits += 1
+                return result
+        self.misses += 1
+        result, involved = compute()
+        involved = tuple(involved)
+        if len(self._cache) >= self.cache_size:
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = (result, involved, tuple([blocked(cells[index]) for index in involved]))
+        return result
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def shortest_path(self, start: Coordinates, goal: Coordinates) -> Optional[List[Coordinates]]:
+        """Fewest-step path from ``start`` to ``goal`` (both included), or None."""
+        path = self._cached(("path", start, goal), lambda: self._a_star(start, goal))
+        return None if path is None else list(path)
+
+    def reachable(self, start: Coordinates, steps: int) -> Dict[Coordinates, int]:
+        """Cells reachable from ``start`` in at most ``steps`` moves, with their distance."""
+        return dict(self._cached(("reach", start, steps), lambda: self._breadth_first(start, steps)))
+
+    def line_of_sight(self, start: Coordinates, goal: Coordinates) -> bool:
+        """Whether no blocked cell lies strictly between ``start`` and ``goal``."""
+        return self._cached(("sight", start, goal), lambda: self._sight(start, goal))
+
+    def _a_star(self, start: Coordinates, goal: Coordinates):
+        board, blocked, cells = self.board, self.blocked, self.board.cells
+        table = _table(board, self.diagonal)
+        start_index, goal_index = board.index(*start), board.index(*goal)
+        # A set: the same cell is often reached from several neighbors.
+        involved = {goal_index}
+        if blocked(cells[goal_index]) and goal_index != start_index:
+            return None, involved
+        width = board.width
+        goal_xy = goal
+
+        def heuristic(index):
+            return distance(board, (index % width, index // width), goal_xy, self.diagonal)
+
+        came_from = {start_index: None}
+        cost = {start_index: 0}
+        frontier = [(heuristic(start_index), 0, start_index)]
+        while frontier:
+            _, steps, current = heapq.heappop(frontier)
+            if current == goal_index:
+                path = []
+                while current is not None:
+                    path.append((current % width, current // width))
+                    current = came_from[current]
+                path.reverse()
+                return path, involved
+            if steps > cost[current]:
+                continue
+            for neighbor in table[current]:
+                if neighbor in cost and cost[neighbor] <= steps + 1:
+                    continue
+                involved.add(neighbor)
+                if blocked(cells[neighbor]):
+                    continue
+                cost[neighbor] = steps + 1
+                came_from[neighbor] = current
+                heapq.heappush(frontier, (steps + 1 + heuristic(neighbor), steps + 1, neighbor))
+        return None, involved
+
+    def _breadth_first(self, start: Coordinates, steps: int):
+        board, blocked, cells = self.board, self.blocked, self.board.cells
+        table = _table(board, self.diagonal)
+        width = board.width
+        start_index = board.index(*start)
+        found = {start_index: 0}
+        involved = set()
+        queue = deque([start_index])
+        while queue:
+            current = queue.popleft()
+            distance_here = found[current]
+            if distance_here == steps:
+                continue
+            for neighbor in table[current]:
+                if neighbor in found:
+                    continue
+                involved.add(neighbor)
+                if blocked(cells[neighbor]):
+                    continue
+                found[neighbor] = distance_here + 1
+                queue.append(neighbor)
+        return {(index % width, index // width): moves for index, moves in found.items()}, involved
+
+    def _sight(self, start: Coordinates, goal: Coordinates):
+        board, blocked, cells = self.board, self.blocked, self.board.cells
+        involved = [board.index(*cell) for cell in line(board, start, goal)[1:-1]]
+        return not any(blocked(cells[index]) for index in involved), involved
+
+
+def _table(board: Board, diagonal: bool):
+    return board.neighbor_table(diagonal and board.board_type != "hex")
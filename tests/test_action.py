@@ -1,6 +1,9 @@
-from controller.action import MoveCard, PlayCard, FlipCard
+import pytest
+
+from controller.action import ActionError, MoveCard, MoveCards, PlayCard, FlipCard, Transaction
 from controller.controller import ActionController
-from component import Card
+from component import Card, Piece
+from container import Container, Deck, Hand
 
 # Test FlipCard action
 def test_flip_card():
@@ -28,3 +31,118 @@ def test_move_card():
     assert card in source and card not in destination
     move_action.redo()
     assert card in destination and card not in source
+
+
+def test_move_cards_restores_positions_on_undo():
+    cards = [Card(f"Card {i}") for i in range(30)]
+    source = list(cards)
+    destination = []
+    dealt = cards[::3]
+    move_action = MoveCards(dealt, source, destination)
+    move_action.execute()
+    assert destination == dealt
+    assert source == [card for card in cards if card not in dealt]
+    move_action.undo()
+    assert source == cards and destination == []
+    move_action.redo()
+    assert destination == dealt
+
+
+def test_move_cards_rejects_missing_card():
+    card = Card("Ace of Spades")
+    source = [Card("Ace of Hearts")]
+    with pytest.raises(ActionError):
+        MoveCards([card], source, []).execute()
+    assert len(source) == 1
+
+
+def test_transaction_rolls_back_on_failure():
+    card = Card("Ace of Spades")
+    source = [card]
+    destination = []
+    transaction = Transaction([FlipCard(card), MoveCard(card, source, destination),
+                               MoveCard(card, source, destination)])
+    with pytest.raises(ActionError):
+        transaction.execute()
+    assert source == [card] and destination == []
+    assert card.front_side_up
+
+
+def test_move_card_undo_restores_position():
+    cards = [Card(f"Card {i}") for i in range(5)]
+    hand = list(cards)
+    table = []
+    controller = ActionController()
+    controller.execute(MoveCard(cards[2], hand, table))
+    controller.execute(MoveCard(cards[0], hand, table))
+    assert hand == [cards[1], cards[3], cards[4]] and table == [cards[2], cards[0]]
+    controller.undo()
+    controller.undo()
+    assert hand == cards and table == []
+    controller.redo()
+    controller.redo()
+    assert table == [cards[2], cards[0]]
+
+
+def test_move_card_between_indexed_containers():
+    cards = [Card(f"Card {i}") for i in range(50)]
+    source = Container(components=list(cards), indexed=True)
+    destination = Container(indexed=True)
+    controller = ActionController()
+    order = list(cards[::7]) + list(cards[3::10])
+    for card in order:
+        controller.execute(MoveCard(card, source, destination))
+    assert destination.get_components() == order
+    for _ in order:
+        controller.undo()
+    assert source.get_components() == cards and destination.get_components() == []
+    assert all(source.index_of(card) == position for position, card in enumerate(cards))
+    for _ in order:
+        controller.redo()
+    assert destination.get_components() == order
+    assert all(destination.index_of(card) == position for position, card in enumerate(order))
+
+
+def test_move_card_rejects_full_destination():
+    card = Card("Ace of Spades")
+    with pytest.raises(ActionError):
+        MoveCard(card, [card], Container(max_capacity=0)).validate()
+
+
+def test_move_cards_between_containers():
+    cards = [Card(f"Card {i}") for i in range(20)]
+    deck = Deck(components=list(cards), indexed=True)
+    hand = Hand(indexed=True)
+    move_action = MoveCards(cards[5:15:2], deck, hand)
+    move_action.execute()
+    assert hand.get_components() == cards[5:15:2]
+    assert deck.find_card(cards[15]) == 10
+    move_action.undo()
+    assert deck.get_components() == cards and hand.get_components() == []
+    assert deck.find_card(cards[19]) == 19
+
+
+def test_move_cards_refused_by_destination_loses_nothing():
+    a, piece, b = Card("a"), Piece("p"), Card("b")
+    source = Container(components=[a, piece, b])
+    hand = Hand()
+    with pytest.raises(ActionError):
+        ActionController().execute_batch([MoveCards([a, piece, b], source, hand)])
+    assert source.get_components() == [a, piece, b]
+    assert hand.get_components() == []
+
+
+def test_move_cards_puts_everything_back_when_an_add_fails():
+    class Refusing(Container):
+        def add_component(self, component):
+            if component.name == "c":
+                raise RuntimeError("refused")
+            super().add_component(component)
+
+    cards = [Card(name) for name in "abcd"]
+    source = Deck(components=list(cards), indexed=True)
+    destination = Refusing(components=[Card("x")])
+    with pytest.raises(RuntimeError):
+        MoveCards(cards[1:4], source, destination).execute()
+    assert source.get_components() == cards
+    assert [card.name for card in destination.get_components()] == ["x"]
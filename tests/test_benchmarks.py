@@ -0,0 +1,24 @@
+from benchmarks import suite
+
+
+def test_compare_flags_only_cases_over_threshold():
+    baseline = {"fast": 1.0, "slow": 1.0, "new_in_baseline": 1.0}
+    results = {"fast": 1.2, "slow": 1.5, "unknown": 9.0}
+    assert suite.compare(results, baseline, threshold=0.25) == {"slow": 1.5}
+
+
+def test_save_baseline_merges_with_existing(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    assert suite.load_baseline(path) == {}
+    suite.save_baseline(path, {"a": 1.0, "b": 2.0})
+    suite.save_baseline(path, {"b": 3.0})
+    assert suite.load_baseline(path) == {"a": 1.0, "b": 3.0}
+
+
+def test_main_fails_on_regression_only_when_asked(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    suite.save_baseline(path, {"board.get_cell_square": 1e-12})
+    args = ["board.get_cell_square", "--baseline", path, "--repeat", "1"]
+    assert suite.main(args) == 0
+    assert suite.main(args + ["--fail"]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
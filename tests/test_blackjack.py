@@ -0,0 +1,25 @@
+from component import StandardPlayingCard
+from container import Hand
+from examples.blackjack import calculate_hand_value, create_blackjack_deck, hand_total
+
+
+def cards(*values):
+    return [StandardPlayingCard(suit="H", value=value) for value in values]
+
+
+def test_hand_total_soft_and_hard():
+    assert hand_total(cards("A", "6")) == (17, True)
+    assert hand_total(cards("A", "6", "10")) == (17, False)
+    assert hand_total(cards("A", "A", "9")) == (21, True)
+    assert hand_total(cards("K", "Q", "2")) == (22, False)
+
+
+def test_calculate_hand_value_accepts_hands():
+    hand = Hand()
+    for card in cards("A", "K"):
+        hand.add_component(card)
+    assert calculate_hand_value(hand) == 21
+
+
+def test_create_blackjack_deck_multiple_decks():
+    assert create_blackjack_deck(6).deck_size() == 312
@@ -0,0 +1,80 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from card_array import ArrayDeck, ArrayHand
+from examples.blackjack import create_blackjack_deck
+
+
+def test_batched_shuffle_draw_and_count():
+    deck = create_blackjack_deck()
+    batch = ArrayDeck.from_deck(deck, batch_size=100, rng=np.random.default_rng(0))
+    batch.shuffle()
+    hands = ArrayHand.empty(100)
+    hands.add(batch.draw(2))
+
+    assert hands.codes.shape == (100, 2)
+    assert batch.deck_size() == 50
+    assert (batch.rank_counts().sum(axis=1) == 50).all()
+    assert (batch.rank_counts() + hands.rank_counts() == 4).all()
+    assert (batch.count(range(52)) == 50).all()
+    # rows are shuffled independently
+    assert len({tuple(row) for row in batch.remaining()}) > 1
+
+
+def test_round_trip_to_objects():
+    deck = create_blackjack_deck()
+    batch = ArrayDeck.from_deck(deck)
+    drawn = batch.draw(3)
+    assert drawn.to_hands()[0].get_components() == deck.get_components()[:3]
+    assert batch.to_decks()[0].get_components() == deck.get_components()[3:]
+
+
+def test_draw_too_many():
+    batch = ArrayDeck.from_deck(create_blackjack_deck(), batch_size=2)
+    with pytest.raises(ValueError):
+        batch.draw(53)
+
+
+def test_batched_evaluation_matches_objects():
+    from evaluation import blackjack_total_codes, poker_score_codes
+    batch = ArrayDeck.from_deck(create_blackjack_deck(), batch_size=200, rng=np.random.default_rng(1))
+    batch.shuffle()
+    hands = batch.draw(7)
+    scores = hands.poker_scores()
+    assert [int(score) for score in scores] == [poker_score_codes(row.tolist()) for row in hands.codes]
+    totals, soft = batch.draw(3).blackjack_totals()
+    rows = batch.codes[:, batch.top - 3:batch.top]
+    assert [(int(total), bool(is_soft)) for total, is_soft in zip(totals, soft)] == \
+        [blackjack_total_codes(row.tolist()) for row in rows]
+
+
+def test_catalog_deck_counts_and_scores_like_standard_cards():
+    from catalog import CardCatalog
+    from evaluation import poker_score
+    deck = create_blackjack_deck(catalog=CardCatalog())
+    batch = ArrayDeck.from_deck(deck, batch_size=50, rng=np.random.default_rng(2))
+    assert (batch.rank_counts() == 4).all()
+    batch.shuffle()
+    hands = batch.draw(7)
+    assert [int(score) for score in hands.poker_scores()] == [poker_score(hand) for hand in hands.to_hands()]
+    assert type(hands.to_hands()[0].get_components()[0]) is type(deck.get_components()[0])
+    # Face-down cards have no standard code and are refused rather than scored as nothing.
+    deck.get_components()[0].flip()
+    with pytest.raises(ValueError):
+        ArrayHand.from_hand(deck.get_components()[:7]).poker_scores()
+
+
+def test_code_tables_are_cached_and_extended_per_codec():
+    from card_array import rank_table, standard_table
+    from card_codes import CardCodec, standard_code
+    from catalog import CardCatalog
+    codec = CardCodec()
+    table = standard_table(codec)
+    assert standard_table(codec) is table and len(table) == 52
+    catalog_cards = create_blackjack_deck(catalog=CardCatalog()).get_components()
+    codes = codec.encode_all(catalog_cards)
+    extended = standard_table(codec)
+    assert len(extended) == 104 and (extended[:52] == table).all()
+    assert [int(extended[code]) for code in codes] == [standard_code(card.suit, card.value) for card in catalog_cards]
+    assert (rank_table(codec)[codes] == extended[codes] >> 2).all()
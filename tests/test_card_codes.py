@@ -0,0 +1,25 @@
+from card_codes import CardCodec, standard_code, code_rank, code_suit
+from component import Card, StandardPlayingCard
+from examples.blackjack import create_blackjack_deck
+
+
+def test_standard_deck_uses_reserved_codes():
+    codec = CardCodec()
+    codes = codec.encode_all(create_blackjack_deck())
+    assert sorted(codes) == list(range(52))
+    assert len(codec) == 52
+
+
+def test_standard_code_layout():
+    code = standard_code("H", "A")
+    assert code_rank(code) == 12
+    assert code_suit(code) == 2
+
+
+def test_round_trip_is_lossless():
+    codec = CardCodec()
+    cards = [StandardPlayingCard(name="Ace", suit="S", value="A", front_side_up=False),
+             Card("Joker", description="wild")]
+    for card in cards:
+        assert codec.decode(codec.encode(card), card.id) == card
+    assert len(codec) == 54
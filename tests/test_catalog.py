@@ -0,0 +1,59 @@
+import pytest
+
+import snapshot
+from catalog import CardCatalog, CardDefinition, CatalogCard
+from component import Card
+from container import Hand
+from examples.blackjack import create_blackjack_deck, hand_total
+
+
+def test_define_interns_definitions():
+    catalog = CardCatalog()
+    fireball = catalog.define("Fireball", cost=3, element="fire")
+    assert catalog.define("Fireball", element="fire", cost=3) is fireball
+    assert catalog.define("Fireball", cost=4, element="fire") is not fireball
+    assert fireball.get("cost") == 3
+    assert len(catalog) == 2 and fireball in catalog
+    with pytest.raises(AttributeError):
+        fireball.cost = 4
+
+
+def test_catalog_cards_hold_only_instance_state():
+    catalog = CardCatalog()
+    fireball = catalog.define("Fireball", cost=3)
+    first, second = catalog.cards([fireball], copies=2, owner="player 1")
+    assert isinstance(first, Card)
+    assert not hasattr(first, "__dict__")
+    assert first.definition is second.definition
+    assert first.id != second.id
+    assert (first.name, first.cost, first.owner) == ("Fireball", 3, "player 1")
+    with pytest.raises(AttributeError):
+        first.power
+    first.flip()
+    assert not first.front_side_up and second.front_side_up
+
+    copy = first.clone()
+    assert copy == first and copy is not first
+    assert copy.definition is first.definition
+
+
+def test_catalog_blackjack_shoe_shares_52_definitions():
+    catalog = CardCatalog()
+    shoe = create_blackjack_deck(6, catalog=catalog)
+    assert shoe.deck_size() == 312
+    assert len({id(card.definition) for card in shoe}) == 52
+    assert len(catalog) == 52
+    ace, king = catalog.define("Ace", suit="H", value="A"), catalog.define("King", suit="S", value="K")
+    hand = Hand(components=[CatalogCard(ace), CatalogCard(king)])
+    assert hand_total(hand.get_components()) == (21, True)
+    assert hand.get_components()[0].get_info() == "A of H"
+
+
+def test_snapshot_round_trip_and_reintern():
+    catalog = CardCatalog()
+    shoe = create_blackjack_deck(1, catalog=catalog)
+    loaded = snapshot.loads(snapshot.dumps(shoe))
+    assert loaded == shoe
+    card = loaded.get_components()[0]
+    assert isinstance(card.definition, CardDefinition)
+    assert catalog.intern(card.definition) is shoe.get_components()[0].definition
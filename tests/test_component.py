@@ -29,4 +29,24 @@ def test_two_sided_card_flip_and_info():
 
 def test_standard_playing_card_get_info():
     card = StandardPlayingCard(suit="Hearts", value="4")
-    assert card.get_info() == "4 of Hearts"
\ No newline at end of file
+    assert card.get_info() == "4 of Hearts"
+
+def test_compact_card_is_slotted_and_counts_as_card():
+    card = CompactStandardPlayingCard(suit="Hearts", value="4")
+    assert not hasattr(card, "__dict__")
+    assert isinstance(card, Card)
+    assert isinstance(card, StandardPlayingCard)
+    assert card.get_info() == "4 of Hearts"
+    card.flip()
+    assert not card.front_side_up
+
+    deck = Deck()
+    deck.add_component(card)
+    assert deck.card_count() == 1
+
+
+def test_id_allocator():
+    with use_id_allocator(IdAllocator(start=10)):
+        assert [CompactPiece().id for _ in range(3)] == [10, 11, 12]
+    with use_id_allocator(uuid_ids):
+        assert isinstance(CompactCard().id, uuid.UUID)
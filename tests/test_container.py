@@ -1,6 +1,7 @@
+import random
 import pytest
 from container import Deck, Container, Board, ContainerContainer, LoggingContainer, CardContainer
-from component import Card, StandardPlayingCard, Component
+from component import Card, StandardPlayingCard, Component, TwoSidedCard, Piece
 # from player import Player
 # from game import Game
 
@@ -207,6 +208,40 @@ def test_deck_draw_card_invalid():
         deck.draw_card(5)  # Assuming the deck is empty or has fewer than 5 cards
 
 
+def test_deck_draw_card_in_order():
+    cards = [Card(f'Card {i}') for i in range(5)]
+    deck = Deck(components=list(cards))
+    assert deck.draw_card(2) == cards[:2]
+    assert deck.draw_card() == [cards[2]]
+    assert deck.deck_size() == 2
+    assert deck.get_components() == cards[3:]
+    assert list(deck) == cards[3:]
+    with pytest.raises(ValueError):
+        deck.draw_card(-1)
+    assert deck.draw_card(0) == [] and deck.deck_size() == 2
+
+
+def test_deck_draw_bottom():
+    cards = [Card(f'Card {i}') for i in range(5)]
+    deck = Deck(components=list(cards))
+    assert deck.draw_bottom(2) == [cards[4], cards[3]]
+    assert deck.draw_card() == [cards[0]]
+    assert deck.peek(2) == cards[1:3]
+    assert deck.deck_size() == 2
+    with pytest.raises(ValueError):
+        deck.draw_bottom(3)
+
+
+def test_deck_add_after_draw():
+    cards = [Card(f'Card {i}') for i in range(3)]
+    deck = Deck(components=list(cards))
+    deck.draw_card()
+    extra = Card('Extra')
+    deck.add_component(extra)
+    assert deck.get_components() == [cards[1], cards[2], extra]
+    assert deck.find_card(extra) == 2
+
+
 def test_deck_peek():
     deck = Deck(shuffle_on_init=False)
     deck.rebuild_and_shuffle([Card('Ace of Spades'), Card('King of Hearts')])
@@ -240,4 +275,346 @@ def test_deck_rebuild_and_shuffle():
 #     board = Board(width=3, height=3, config_path="config.json", board_type="custom")
 #     board.init_board_from_json()
 #     # Assuming specific content in your JSON file
-#     assert len(board.grid) == 3
\ No newline at end of file
+#     assert len(board.grid) == 3
+
+def test_indexed_container_contains_and_remove_by_id():
+    cont = Container(indexed=True)
+    cards = [Card(f'Card {i}') for i in range(5)]
+    for card in cards:
+        cont.add_component(card)
+
+    flipped_copy = Card(cards[2].name, id=cards[2].id, front_side_up=False)
+    assert flipped_copy != cards[2]
+    assert cont.contains(flipped_copy)
+    assert cont.index_of(cards[3]) == 3
+
+    cont.remove_component(flipped_copy)
+    assert cont.get_components() == [cards[0], cards[1], cards[3], cards[4]]
+    assert cont.index_of(cards[4]) == 3
+    assert not cont.contains(cards[2])
+
+    cont.remove_component(cards[0])
+    assert cont.index_of(cards[1]) == 0
+    assert cont.index_of(cards[4]) == 2
+
+
+def test_indexed_container_rejects_duplicates():
+    cont = Container(indexed=True)
+    card = Card()
+    cont.add_component(card)
+    with pytest.raises(ValueError):
+        cont.add_component(card)
+
+
+def test_unindexed_container_matches_by_value():
+    cont = Container()
+    card = Card('Ace of Spades')
+    cont.add_component(card)
+    flipped_copy = Card(card.name, id=card.id, front_side_up=False)
+    cont.remove_component(flipped_copy)
+    assert cont.get_components() == [card]
+    assert cont.contains(flipped_copy)
+
+
+def test_indexed_deck_tracks_draws():
+    cards = [Card(f'Card {i}') for i in range(6)]
+    deck = Deck(components=list(cards), indexed=True)
+    assert deck.find_card(cards[5]) == 5
+    deck.draw_card(2)
+    deck.draw_bottom()
+    assert not deck.contains_card(cards[0])
+    assert not deck.contains_card(cards[5])
+    assert deck.find_card(cards[3]) == 1
+    deck.shuffle()
+    assert deck.get_components()[deck.find_card(cards[4])] is cards[4]
+
+
+def test_indexed_container_insert_and_pop():
+    cont = Container(indexed=True)
+    cards = [Card(f'Card {i}') for i in range(6)]
+    for card in cards[1:5]:
+        cont.add_component(card)
+    cont.insert_component(cards[0], 0)
+    cont.insert_component(cards[5], 99)
+    assert cont.get_components() == cards
+    assert [cont.index_of(card) for card in cards] == list(range(6))
+
+    assert cont.pop_component(2) is cards[2]
+    cont.insert_component(cards[2], 2)
+    assert [cont.index_of(card) for card in cards] == list(range(6))
+    assert cont.pop_component() is cards[5]
+    with pytest.raises(ValueError):
+        cont.insert_component(cards[0], 3)
+    with pytest.raises(IndexError):
+        cont.pop_component(10)
+
+
+def test_indexed_deck_positions_after_shuffle_and_draw():
+    for seed in range(20):
+        random.seed(seed)
+        cards = [Card(name) for name in "abcde"]
+        deck = Deck(indexed=True)
+        for card in cards:
+            deck.add_component(card)
+        deck.shuffle()
+        drawn = deck.draw_card()[0]
+        for card in cards:
+            if card is drawn:
+                assert deck.find_card(card) is None
+            else:
+                assert deck.get_components()[deck.find_card(card)] is card
+        target = next(card for card in cards if card is not drawn)
+        deck.remove_component(target)
+        assert not deck.contains_card(target)
+        assert len(deck.get_components()) == 3 and target not in deck.get_components()
+
+
+def test_indexed_container_positions_after_front_inserts_and_pops():
+    cards = [Card(name) for name in "abcd"]
+    cont = Container(indexed=True)
+    cont.add_component(cards[0])
+    cont.insert_component(cards[1], 0)
+    cont.insert_component(cards[2], 1)
+    cont.pop_component(0)
+    cont.pop_component(0)
+    assert cont.get_components() == [cards[0]]
+    assert cont.index_of(cards[0]) == 0
+    cont.insert_component(cards[3], 0)
+    assert [cont.index_of(card) for card in (cards[3], cards[0])] == [0, 1]
+
+
+
+def test_indexed_removal_from_the_middle_does_not_renumber():
+    cards = [Card(str(i)) for i in range(1000)]
+    cont = Container(components=list(cards), indexed=True)
+    assert cont.index_of(cards[999]) == 999
+    for card in cards[100:900:2]:
+        cont.remove_component(card)
+    # Tombstones, not a rebuild: lookups stay exact without recomputing positions.
+    assert not cont._index.stale
+    assert cont.index_of(cards[999]) == 599
+    cont.insert_component(cards[500], 300)
+    assert not cont._index.stale
+    assert [cont.index_of(card) for card in (cards[499], cards[500], cards[501])] == [299, 300, 301]
+
+
+def test_indexed_positions_match_the_list_under_random_edits():
+    rng = random.Random(11)
+    pool = [Card(str(i)) for i in range(40)]
+    for deck in (False, True):
+        cont = (Deck if deck else Container)(components=pool[:20], indexed=True)
+        outside = pool[20:]
+        for _ in range(400):
+            roll, components = rng.random(), cont.components
+            if roll < 0.25 and outside:
+                cont.insert_component(outside.pop(rng.randrange(len(outside))), rng.randrange(len(components) + 1))
+            elif roll < 0.4 and outside:
+                cont.add_component(outside.pop())
+            elif roll < 0.7 and components:
+                outside.append(cont.pop_component(rng.randrange(len(components))))
+            elif roll < 0.85 and deck and cont.deck_size():
+                outside.extend(cont.draw_card())
+            elif roll < 0.9 and deck:
+                cont.shuffle()
+            components = cont.components
+            for card in rng.sample(pool, 8):
+                expected = components.index(card) if card in components else None
+                assert cont.index_of(card) == expected
+
+def test_board_flat_cells_and_views():
+    board = Board(width=4, height=3, board_type="square")
+    assert len(board.cells) == 12
+    cell = board.get_cell(2, 1)
+    assert board.cells[board.index(2, 1)] is cell
+    assert board.coordinates(board.index(2, 1)) == (2, 1)
+    assert board.get_rows(1)[0][2] is cell
+    assert board.get_columns(2)[0][1] is cell
+    assert len(board.get_columns()) == 4
+    assert all(len(column) == 3 for column in board.get_columns())
+
+    replacement = Container()
+    board.set_cell(2, 1, replacement)
+    assert board.get_rows(1)[0][2] is replacement
+
+
+def test_neighbor_tables_are_shared_but_bounded():
+    import gc
+    import container
+    first, second = Board(width=5, height=4, board_type="hex"), Board(width=5, height=4, board_type="hex")
+    assert first.neighbor_table() is second.neighbor_table()
+    for width in range(2, 2 + 2 * container.NEIGHBOR_TABLE_CACHE_SIZE):
+        Board(width=width, height=2, board_type="square").neighbor_table()
+    assert container._cached_neighbor_table.cache_info().currsize == container.NEIGHBOR_TABLE_CACHE_SIZE
+    assert gc.isenabled()
+
+
+def test_board_square_neighbors():
+    board = Board(width=3, height=3, board_type="square")
+    assert sorted(board.neighbors(1, 1)) == [(0, 1), (1, 0), (1, 2), (2, 1)]
+    assert sorted(board.neighbors(0, 0)) == [(0, 1), (1, 0)]
+    assert len(board.neighbors(1, 1, diagonal=True)) == 8
+    assert len(board.neighbors(0, 0, diagonal=True)) == 3
+
+
+def test_board_hex_neighbors():
+    board = Board(width=4, height=4, board_type="hex")
+    assert all(len(row) == 4 for row in board.grid)
+    assert len(board.get_columns()) == 4
+    # even row: neighbors lean left, odd row: neighbors lean right
+    assert sorted(board.neighbors(1, 2)) == [(0, 1), (0, 2), (0, 3), (1, 1), (1, 3), (2, 2)]
+    assert sorted(board.neighbors(1, 1)) == [(0, 1), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)]
+    # neighborship is symmetric
+    for index in range(len(board.cells)):
+        for neighbor in board.neighbor_indices(index):
+            assert index in board.neighbor_indices(neighbor)
+    with pytest.raises(ValueError):
+        board.neighbors(1, 1, diagonal=True)
+
+
+def test_container_container_resolve_path():
+    works = CardContainer(name="works")
+    wing = ContainerContainer(name="left_wing", containers=[works, CardContainer(name="materials")])
+    tableau = ContainerContainer()
+    tableau.add_component(CardContainer(name="task"))
+    tableau.add_component(wing)
+
+    assert tableau.resolve("left_wing/works") is works
+    assert tableau.get_child("task").name == "task"
+    with pytest.raises(KeyError):
+        tableau.resolve("left_wing/missing")
+    with pytest.raises(KeyError):
+        tableau.resolve("task/works")
+
+    tableau.remove_component(wing)
+    assert tableau.get_child("left_wing") is None
+    tableau.clear_components()
+    assert tableau.get_child("task") is None
+
+
+def test_container_container_type_counts_follow_changes():
+    outer = ContainerContainer(max_capacity_per_type={CardContainer: 2})
+    first, second = CardContainer(name="a"), CardContainer(name="b")
+    outer.add_component(first)
+    outer.add_component(Container())
+    outer.add_component(second)
+    assert outer.count_of_type(CardContainer) == 2
+    assert outer.count_of_type(Container) == 3
+    with pytest.raises(ValueError):
+        outer.add_component(CardContainer())
+
+    outer.remove_component(first)
+    assert outer.count_of_type(CardContainer) == 1
+    outer.add_component(CardContainer())
+    outer.clear_components()
+    assert outer.count_of_type(CardContainer) == 0
+    assert outer.count_of_type(Container) == 0
+
+
+def test_container_of_type_is_subclass_aware():
+    cont = Container()
+    cards = [StandardPlayingCard(suit="H", value=str(i)) for i in range(3)]
+    two_sided = TwoSidedCard(front=Card("Front"), back=Card("Back"))
+    pieces = [Piece(f"Piece {i}") for i in range(2)]
+    for component in cards + pieces + [two_sided]:
+        cont.add_component(component)
+
+    assert cont.count_of_type(Card) == 4
+    assert cont.of_type(StandardPlayingCard) == cards
+    assert cont.of_type(Piece) == pieces
+    assert cont.count_of_type(Component) == 6
+
+    cont.remove_component(cards[1])
+    cont.add_component(Piece("Late"))
+    assert cont.of_type(StandardPlayingCard) == [cards[0], cards[2]]
+    assert cont.count_of_type(Piece) == 3
+    assert cont.count_of_type(TwoSidedCard) == 1
+
+    cont.clear_components()
+    assert cont.count_of_type(Component) == 0
+
+
+def test_container_of_type_with_duplicates_and_draws():
+    cont = Container()
+    piece = Piece()
+    cont.add_component(piece)
+    cont.add_component(piece)
+    assert cont.count_of_type(Piece) == 2
+    cont.remove_component(piece)
+    assert cont.of_type(Piece) == [piece]
+
+    deck = Deck(components=[Card("a"), StandardPlayingCard(suit="S", value="A"), Card("b")])
+    assert deck.count_of_type(Card) == 3
+    deck.draw_card()
+    deck.draw_bottom()
+    assert deck.count_of_type(Card) == 1
+    assert deck.count_of_type(StandardPlayingCard) == 1
+
+
+
+def test_type_buckets_follow_moves_on_plain_lists():
+    from controller.action import MoveCard
+    from container import Hand
+    deck = Deck(components=[Card("a"), Card("b")])
+    hand = Hand()
+    assert hand.count_of_type(Card) == 0 and deck.count_of_type(Card) == 2
+    card = deck.peek()[0]
+    MoveCard(card, deck.get_components(), hand.get_components()).execute()
+    assert hand.count_of_type(Card) == 1 and hand.of_type(Card) == [card]
+    assert deck.count_of_type(Card) == 1
+
+def test_deck_shuffles_reproducibly_with_its_rng():
+    from rng import RandomStream
+    cards = [Card(f'Card {i}') for i in range(20)]
+    first = Deck(components=list(cards), rng=RandomStream(1), shuffle_on_init=True)
+    second = Deck(components=list(cards), rng=RandomStream(1), shuffle_on_init=True)
+    third = Deck(components=list(cards), rng=RandomStream(2), shuffle_on_init=True)
+    assert first.get_components() == second.get_components()
+    assert first.get_components() != third.get_components()
+
+
+def test_lazy_shuffle_draws_settle_only_the_drawn_cards():
+    from rng import RandomStream
+    cards = [Card(f'Card {i}') for i in range(1000)]
+    deck = Deck(components=list(cards), rng=RandomStream(3), lazy_shuffle=True)
+    deck.shuffle()
+    drawn = deck.draw_card(5)
+    assert deck._pending_end - deck._pending == 995
+    peeked = deck.peek(2)
+    assert deck.draw_card(2) == peeked
+    rest = deck.get_components()
+    assert deck._pending == deck._pending_end
+    assert {id(card) for card in drawn + peeked + rest} == {id(card) for card in cards}
+
+
+def test_lazy_shuffle_is_uniform():
+    from rng import RandomStream
+    cards = [Card(str(i)) for i in range(4)]
+    deck = Deck(rng=RandomStream(4), lazy_shuffle=True)
+    counts = {}
+    for _ in range(4000):
+        deck.components = list(cards)
+        deck.shuffle()
+        order = tuple(card.name for card in deck.draw_card(4))
+        counts[order] = counts.get(order, 0) + 1
+    assert len(counts) == 24
+    assert all(110 < count < 230 for count in counts.values())
+
+
+def test_lazy_shuffle_keeps_later_additions_in_order():
+    from rng import RandomStream
+    deck = Deck(components=[Card(str(i)) for i in range(6)], rng=RandomStream(5), lazy_shuffle=True, indexed=True)
+    deck.shuffle()
+    deck.draw_bottom(2)
+    extra = [Card('x'), Card('y')]
+    for card in extra:
+        deck.add_component(card)
+    assert deck.index_of(extra[0]) == 4
+    assert deck.get_components()[-2:] == extra
+    assert deck.draw_card(6)[-2:] == extra
+
+
+def test_card_game_splits_its_rng_for_the_deck():
+    from game import CardGame
+    from rng import RandomStream
+    game = CardGame(players=[], deck=Deck(), rng=RandomStream(6))
+    assert game.deck.rng.seed_value == RandomStream(6).spawn("deck").seed_value
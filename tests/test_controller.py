@@ -1,5 +1,7 @@
-from controller.action import MoveCard, PlayCard, FlipCard
-from controller.controller import ActionController
+import pytest
+
+from controller.action import ActionError, MoveCard, MoveCards, PlayCard, FlipCard, Transaction
+from controller.controller import ActionController, HistoryCheckpoint, estimate_action_size
 from component import Card
 
 
@@ -43,4 +45,84 @@ def test_action_controller_no_undo():
 def test_action_controller_no_redo():
     controller = ActionController()
     controller.redo()
-    assert len(controller.redo_stack) == 0
\ No newline at end of file
+    assert len(controller.redo_stack) == 0
+# Test history limited by number of entries
+def test_action_controller_max_history():
+    controller = ActionController(max_history=3)
+    card = Card("Ace of Spades")
+    actions = [FlipCard(card) for _ in range(5)]
+    for action in actions:
+        controller.execute(action)
+    assert list(controller.undo_stack) == actions[2:]
+    stats = controller.history_stats()
+    assert stats.undo_entries == 3
+    assert stats.evicted_entries == 2
+    for _ in range(5):
+        controller.undo()
+    assert controller.history_stats().redo_entries == 3
+    # only the three retained flips were undone
+    assert card.front_side_up
+
+# Test history limited by estimated bytes, folding into a checkpoint
+class SizedFlip(FlipCard):
+    def estimated_size(self):
+        return 100
+
+
+def test_action_controller_max_history_bytes_checkpoint():
+    card = Card("Ace of Spades")
+    size = estimate_action_size(SizedFlip(card))
+    assert size == 100
+    checkpoint = HistoryCheckpoint(fold=lambda state, action: (state or 0) + 1)
+    controller = ActionController(max_history_bytes=size * 2, checkpoint=checkpoint)
+    for _ in range(4):
+        controller.execute(SizedFlip(card))
+    stats = controller.history_stats()
+    assert stats.undo_entries == 2
+    assert stats.undo_bytes == size * 2
+    assert checkpoint.actions_folded == 2
+    assert checkpoint.bytes_folded == size * 2
+    assert checkpoint.state == 2
+
+    controller.undo()
+    stats = controller.history_stats()
+    assert stats.undo_bytes == size and stats.redo_bytes == size
+    assert stats.total_bytes == size * 2
+
+
+# Test a batch is one undo entry
+def test_action_controller_execute_batch():
+    controller = ActionController()
+    cards = [Card(f"Card {i}") for i in range(20)]
+    deck = list(cards)
+    hands = [[], []]
+    controller.execute_batch([MoveCards(cards[:10], deck, hands[0]), MoveCards(cards[10:], deck, hands[1])]
+                             + [FlipCard(card) for card in cards])
+    assert len(controller.undo_stack) == 1
+    assert deck == [] and hands == [cards[:10], cards[10:]]
+    controller.undo()
+    assert deck == cards and hands == [[], []]
+    assert all(card.front_side_up for card in cards)
+    controller.redo()
+    assert hands == [cards[:10], cards[10:]]
+
+
+# Test the transaction block rolls back when it raises
+def test_action_controller_transaction_rollback():
+    controller = ActionController()
+    card = Card("Ace of Spades")
+    source, destination = [card], []
+    with pytest.raises(ActionError):
+        with controller.transaction() as transaction:
+            transaction.apply(MoveCard(card, source, destination))
+            transaction.apply(FlipCard(card))
+            transaction.apply(MoveCard(card, source, destination))
+    assert source == [card] and destination == [] and card.front_side_up
+    assert len(controller.undo_stack) == 0
+
+    with controller.transaction() as transaction:
+        transaction.apply(MoveCard(card, source, destination))
+        transaction.apply(FlipCard(card))
+    assert isinstance(controller.undo_stack[-1], Transaction)
+    controller.undo()
+    assert source == [card] and card.front_side_up
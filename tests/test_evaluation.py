@@ -0,0 +1,63 @@
+import itertools
+import random
+
+from card_codes import standard_code
+from catalog import CardCatalog
+from component import StandardPlayingCard
+from container import Hand
+from evaluation import (BLACKJACK_POINTS_BY_VALUE, FLUSH, FULL_HOUSE, HAND_CATEGORIES, STRAIGHT, STRAIGHT_FLUSH,
+                        TWO_PAIR, blackjack_total, blackjack_total_codes, card_codes, hand_category, poker_score,
+                        poker_score_codes)
+import pytest
+
+
+def cards(*specs):
+    return [StandardPlayingCard(suit=spec[-1], value=spec[:-1]) for spec in specs]
+
+
+def codes(*specs):
+    return [standard_code(spec[-1], spec[:-1]) for spec in specs]
+
+
+def test_blackjack_soft_and_hard_totals():
+    assert blackjack_total(cards("AH", "6S")) == (17, True)
+    assert blackjack_total(cards("AH", "6S", "10D")) == (17, False)
+    assert blackjack_total(cards("AH", "AS", "9D")) == (21, True)
+    assert blackjack_total(cards("KH", "QS", "2D")) == (22, False)
+    assert blackjack_total_codes(codes("AH", "KS")) == (21, True)
+    assert blackjack_total(Hand(components=cards("5H", "5S"))) == (10, False)
+    assert [BLACKJACK_POINTS_BY_VALUE[value] for value in ("A", "2", "10", "J", "K")] == [1, 2, 10, 10, 10]
+
+
+def test_poker_categories():
+    assert hand_category(poker_score(cards("AH", "KH", "QH", "JH", "10H"))) == HAND_CATEGORIES[STRAIGHT_FLUSH]
+    assert hand_category(poker_score(cards("AH", "2S", "3H", "4H", "5H"))) == HAND_CATEGORIES[STRAIGHT]
+    # A flush and a full house in the same seven cards: the full house wins.
+    full_house = poker_score(cards("AH", "AS", "AD", "KH", "KS", "2H", "7H"))
+    assert full_house >> 20 == FULL_HOUSE
+    assert poker_score(cards("AH", "KH", "2H", "7H", "9H", "9S", "3C")) >> 20 == FLUSH
+    # Three pairs: the best two count, with the third pair's rank as the kicker.
+    assert poker_score(cards("9H", "9S", "5H", "5S", "4H", "4S", "2C")) == \
+        poker_score(cards("9H", "9S", "5H", "5S", "4D"))
+    assert poker_score(cards("9H", "9S", "5H", "5S", "4D")) >> 20 == TWO_PAIR
+
+
+def test_poker_ordering():
+    assert poker_score(cards("AH", "AS", "KD", "4C", "3C")) > poker_score(cards("AH", "AS", "QD", "JC", "10C"))
+    assert poker_score(cards("6H", "2S", "3H", "4H", "5H")) > poker_score(cards("AH", "2S", "3H", "4H", "5H"))
+    assert poker_score(cards("AH", "KS", "QH", "JH", "9H")) == poker_score(cards("AS", "KD", "QC", "JS", "9D"))
+
+
+def test_seven_card_score_is_best_five():
+    rng = random.Random(3)
+    for _ in range(500):
+        hand = rng.sample(range(52), 7)
+        assert poker_score_codes(hand) == max(poker_score_codes(five) for five in itertools.combinations(hand, 5))
+
+
+def test_object_and_code_hands_agree():
+    catalog = CardCatalog()
+    hand = catalog.cards(catalog.standard_deck()[::8])
+    assert poker_score(hand) == poker_score_codes(card_codes(hand))
+    with pytest.raises(ValueError):
+        poker_score_codes(codes("AH", "KH", "QH", "JH"))
@@ -0,0 +1,106 @@
+import json
+import logging
+import pytest
+
+from component import Card
+from container import Board, Container, Deck
+from controller.action import FlipCard
+from controller.controller import ActionController
+from events import BatchingSink, EventBus, bus
+
+
+@pytest.fixture
+def events():
+    received = []
+    bus.subscribe(received.append)
+    yield received
+    bus.unsubscribe(received.append)
+
+
+def test_bus_inactive_without_subscribers():
+    assert not EventBus().active
+    assert not bus.active
+
+
+def test_container_deck_board_and_controller_events(events):
+    container = Container()
+    card = Card("Ace")
+    container.add_component(card)
+    container.remove_component(card)
+    deck = Deck(components=[Card("a"), Card("b")])
+    deck.draw_card()
+    deck.shuffle()
+    board = Board(width=2, height=2)
+    board.set_cell(1, 1, Container())
+    ActionController().execute(FlipCard(card))
+
+    kinds = [event.kind for event in events]
+    assert kinds == ["container.add", "container.remove", "deck.draw", "deck.shuffle",
+                     "board.set_cell", "action.execute"]
+    assert events[0].source is container and events[0].data is card
+    assert events[2].data[0].name == "a"
+
+
+def test_deck_draw_bottom_event_matches_the_drawn_cards():
+    cards = [Card(str(i)) for i in range(4)]
+    deck = Deck(components=list(cards))
+    seen = []
+
+    def record(event):
+        seen.append(list(event.data))
+
+    bus.subscribe(record, ("deck.draw",))
+    try:
+        drawn = deck.draw_bottom(2)
+    finally:
+        bus.unsubscribe(record)
+    assert drawn == [cards[3], cards[2]]
+    assert seen == [drawn]
+
+def test_subscribe_by_kind_and_sampling():
+    local = EventBus()
+    draws, sampled = [], []
+    local.subscribe(draws.append, kinds={"deck.draw"})
+    local.subscribe(sampled.append, every=3)
+    for i in range(6):
+        local.emit("deck.draw" if i % 2 else "deck.shuffle", None, i)
+    assert [event.data for event in draws] == [1, 3, 5]
+    assert [event.data for event in sampled] == [2, 5]
+    local.unsubscribe(draws.append)
+    local.unsubscribe(sampled.append)
+    assert not local.active
+
+
+def test_batching_sink_writes_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = BatchingSink.to_file(str(path), batch_size=2, flush_interval=0.05)
+    bus.subscribe(sink)
+    try:
+        container = Container(name="pile")
+        for i in range(5):
+            container.add_component(Card(f"Card {i}"))
+    finally:
+        bus.unsubscribe(sink)
+        sink.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 5
+    assert records[0]["kind"] == "container.add"
+    assert records[0]["source"]["name"] == "pile"
+    assert records[4]["data"]["name"] == "Card 4"
+
+
+def test_batching_sink_to_logging_handler():
+    records = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    sink = BatchingSink.to_logging(ListHandler(), flush_interval=0.01)
+    local = EventBus()
+    local.subscribe(sink)
+    local.emit("deck.shuffle", None)
+    sink.close()
+    assert len(records) == 1
+    assert json.loads(records[0].getMessage())["kind"] == "deck.shuffle"
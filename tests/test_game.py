@@ -1,8 +1,66 @@
+import uuid
 import pytest
-from game import Game
+from component import Card
+from container import Board, CardContainer, ContainerContainer
+from examples.blackjack import create_blackjack_deck, deal_initial_cards
+from game import CardGame, Game
 from player import Player
 
 
 def test_game_and_player_list():
     game = Game(players=[Player("Jim"), Player("John")])
     assert game.players[0].name == "Jim"
+
+
+def _mutable_ids(obj, seen=None):
+    """ids of every list, dict, set and object reachable from ``obj``."""
+    seen = {} if seen is None else seen
+    if isinstance(obj, (str, int, float, bool, type, uuid.UUID)) or obj is None or id(obj) in seen:
+        return seen
+    seen[id(obj)] = obj
+    if isinstance(obj, dict):
+        children = obj.values()
+    elif isinstance(obj, (list, tuple, set)):
+        children = obj
+    else:
+        children = vars(obj).values()
+    for child in children:
+        _mutable_ids(child, seen)
+    return seen
+
+
+def _build_game():
+    deck = create_blackjack_deck(2)
+    players = [Player("Jim"), Player("John")]
+    deal_initial_cards(deck, players[0].hand, players[1].hand)
+    return CardGame(players=players, deck=deck)
+
+
+def test_clone_game_shares_no_mutable_state():
+    game = _build_game()
+    game.deck.draw_card(3)
+    clone = game.clone()
+
+    assert clone == game
+    assert not set(_mutable_ids(game)) & set(_mutable_ids(clone))
+    # immutable definitions are shared
+    assert clone.deck.get_components()[0].suit is game.deck.get_components()[0].suit
+
+    clone.players[0].hand.get_components()[0].flip()
+    clone.deck.draw_card()
+    assert game.players[0].hand.get_components()[0].front_side_up
+    assert game.deck.deck_size() == clone.deck.deck_size() + 1
+
+
+def test_clone_tableau_and_board():
+    inner = CardContainer(name="works", max_capacity=5)
+    tableau = ContainerContainer(containers=[inner, CardContainer(name="task")])
+    inner.add_component(Card("Work"))
+    board = Board(width=2, height=2, board_type="hex")
+    board.get_cell(1, 1).add_component(Card("Token"))
+
+    tableau_clone = tableau.clone()
+    board_clone = board.clone()
+    assert tableau_clone == tableau and board_clone == board
+    assert not set(_mutable_ids(tableau)) & set(_mutable_ids(tableau_clone))
+    assert not set(_mutable_ids(board)) & set(_mutable_ids(board_clone))
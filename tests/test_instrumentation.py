@@ -0,0 +1,44 @@
+import json
+
+from component import Card
+from container import Board, CardContainer, Container, Deck
+from controller.action import FlipCard
+from controller.controller import ActionController
+from instrumentation import Instrumentation
+
+
+def test_enable_counts_calls_and_disable_restores():
+    original = Container.__dict__["add_component"]
+    instruments = Instrumentation()
+    instruments.enable()
+    try:
+        hand = CardContainer()
+        for i in range(3):
+            hand.add_component(Card(f"Card {i}"))
+        deck = Deck(components=[Card("a"), Card("b")])
+        deck.shuffle()
+        deck.draw_card()
+        controller = ActionController()
+        controller.execute(FlipCard(hand.get_components()[0]))
+        controller.undo()
+        controller.redo()
+        Board(width=2, height=2).get_cell(1, 1)
+    finally:
+        instruments.disable()
+    assert Container.__dict__["add_component"] is original
+
+    snapshot = instruments.snapshot()
+    assert snapshot["Container.add_component"]["count"] == 3
+    assert snapshot["Deck.draw_card"]["count"] == 1
+    assert snapshot["ActionController.undo"]["count"] == 1
+    assert snapshot["Board.get_cell"]["count"] == 1
+    assert "Container.remove_component" not in snapshot
+    stats = snapshot["Container.add_component"]
+    assert stats["min_ns"] <= stats["p50_ns"] + 1 and sum(stats["histogram"].values()) == 3
+    assert json.loads(instruments.to_json()) == snapshot
+    assert "Deck.shuffle" in instruments.report()
+
+    Container().add_component(Card())
+    assert instruments.snapshot()["Container.add_component"]["count"] == 3
+    instruments.reset()
+    assert instruments.snapshot() == {}
@@ -0,0 +1,104 @@
+import random
+import pytest
+
+from component import CompactCard, IdAllocator, use_id_allocator
+from container import Deck, Hand
+from controller.action import FlipCard, MoveCard, MoveCards
+from controller.controller import ActionController
+from controller.journal import (ActionJournal, JournalError, ObjectTable, OP_FLIP, OP_MOVE, OP_UNDO,
+                                iter_records, read_header, replay)
+from game import CardGame
+from player import Player
+
+
+def build_game(seed):
+    rng = random.Random(seed)
+    with use_id_allocator(IdAllocator()):
+        cards = [CompactCard(f"Card {i}") for i in range(20)]
+        rng.shuffle(cards)
+        return CardGame(players=[Player("A"), Player("B")], deck=Deck(components=cards))
+
+
+def state_of(game):
+    return ([card.id for card in game.deck.get_components()],
+            [[(card.id, card.front_side_up) for card in player.hand.get_components()] for player in game.players])
+
+
+def play(game, controller, steps, rng):
+    for _ in range(steps):
+        roll = rng.random()
+        if roll < 0.5 and game.deck.deck_size():
+            player = rng.choice(game.players)
+            card = game.deck.get_components()[0]
+            controller.execute(MoveCard(card, game.deck.get_components(), player.hand.get_components()))
+        elif roll < 0.6 and game.deck.deck_size() >= 3:
+            cards = game.deck.get_components()[:3]
+            hand = rng.choice(game.players).hand.get_components()
+            controller.execute_batch([MoveCards(cards, game.deck.get_components(), hand), FlipCard(cards[0])])
+        elif roll < 0.7:
+            cards = [card for player in game.players for card in player.hand.get_components()]
+            if cards:
+                controller.execute(FlipCard(rng.choice(cards)))
+        elif roll < 0.85:
+            controller.undo()
+        else:
+            controller.redo()
+
+
+def test_journal_replays_game(tmp_path):
+    path = str(tmp_path / "game.journal")
+    game = build_game(seed=11)
+    with ActionJournal(path, ObjectTable(game), seed=11) as journal:
+        play(game, ActionController(journal=journal), 200, random.Random(5))
+
+    assert read_header(path).seed == 11
+    replayed = build_game(read_header(path).seed)
+    count = replay(path, replayed)
+    assert count == sum(1 for _ in iter_records(path))
+    assert state_of(replayed) == state_of(game)
+
+
+def test_journal_record_layout(tmp_path):
+    path = str(tmp_path / "game.journal")
+    game = build_game(seed=1)
+    card = game.deck.get_components()[0]
+    controller = ActionController(journal=ActionJournal(path, ObjectTable(game)))
+    controller.execute(MoveCard(card, game.deck.get_components(), game.players[0].hand.get_components()))
+    controller.execute(FlipCard(card))
+    controller.undo()
+    controller.journal.close()
+
+    table = ObjectTable(game)
+    assert list(iter_records(path)) == [
+        (OP_MOVE, card.id, table.container_handle(game.deck), table.container_handle(game.players[0].hand)),
+        (OP_FLIP, card.id),
+        (OP_UNDO,),
+    ]
+
+
+def test_journal_rejects_foreign_containers(tmp_path):
+    game = build_game(seed=1)
+    journal = ActionJournal(str(tmp_path / "game.journal"), ObjectTable(game))
+    card = game.deck.get_components()[0]
+    with pytest.raises(JournalError):
+        journal.record(MoveCard(card, game.deck.get_components(), Hand().get_components()))
+    journal.close()
+
+
+def test_unjournalable_action_is_not_executed(tmp_path):
+    path = str(tmp_path / "game.journal")
+    game = build_game(seed=1)
+    controller = ActionController(journal=ActionJournal(path, ObjectTable(game)))
+    card = game.deck.peek()[0]
+    stray = Hand()
+    with pytest.raises(JournalError):
+        controller.execute(MoveCard(card, game.deck, stray))
+    with pytest.raises(JournalError):
+        with controller.transaction() as transaction:
+            transaction.apply(FlipCard(card))
+            transaction.apply(MoveCards([card], game.deck, stray))
+    controller.journal.close()
+    assert game.deck.deck_size() == 20 and card.front_side_up
+    assert stray.get_components() == []
+    assert not controller.undo_stack
+    assert list(iter_records(path)) == []
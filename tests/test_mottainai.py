@@ -0,0 +1,51 @@
+from component import Card
+from examples.mottainai import MoveGenerator, new_game
+
+
+def setup_game():
+    game = new_game()
+    me = game.players[0]
+    for index in range(4):
+        me.hand.add_component(Card(f"Hand {index}"))
+    for index in range(3):
+        game.floor.add_component(Card(f"Floor {index}"))
+    return game, me
+
+
+def move_set(moves):
+    return {(move.rule, move.card.name) for move in moves}
+
+
+def test_legal_moves_follow_executed_actions():
+    game, me = setup_game()
+    with MoveGenerator(game) as generator:
+        moves = generator.legal_moves(me)
+        assert len([move for move in moves if move.rule == "lead_task"]) == 4
+        assert len([move for move in moves if move.rule == "gather_left"]) == 3
+        assert not [move for move in moves if move.rule == "complete_left_work"]
+
+        lead = next(move for move in moves if move.rule == "lead_task")
+        game.action_controller.execute(lead.action())
+        moves = generator.legal_moves(me)
+        # The task holds one card, so no more tasks can be led.
+        assert not [move for move in moves if move.rule == "lead_task"]
+        assert ("clear_task", lead.card.name) in move_set(moves)
+
+        game.action_controller.undo()
+        assert move_set(generator.legal_moves(me)) == move_set(MoveGenerator(game).legal_moves(me))
+
+
+def test_only_touched_rules_are_rebuilt():
+    game, me = setup_game()
+    with MoveGenerator(game) as generator:
+        generator.legal_moves(me)
+        assert generator.rebuilt == 8
+        generator.legal_moves(me)
+        assert generator.rebuilt == 8
+
+        # Floor -> left materials touches the four rules reading or writing those containers.
+        gather = next(move for move in generator.legal_moves(me) if move.rule == "gather_left")
+        game.action_controller.execute(gather.action())
+        generator.legal_moves(me)
+        assert generator.rebuilt == 12
+        assert move_set(generator.legal_moves(me)) == move_set(MoveGenerator(game).legal_moves(me))
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from component import Component
+from plugins import ACTION, COMPONENT, GAME, PluginError, PluginRegistry, registry
+
+
+def test_declared_plugins_import_on_first_load(tmp_path, monkeypatch):
+    (tmp_path / "lazy_game_plugin.py").write_text("LOADS = []\ndef new_game(name):\n    LOADS.append(name)\n"
+                                                  "    return name\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    plugins = PluginRegistry()
+    plugin = plugins.declare(GAME, "lazy", "lazy_game_plugin:new_game", description="A lazy game")
+    assert "lazy_game_plugin" not in sys.modules
+    assert plugins.names(GAME) == ["lazy"] and plugin.metadata["description"] == "A lazy game"
+    assert not plugin.loaded
+
+    assert plugins.create(GAME, "lazy", "table") == "table"
+    assert plugin.loaded
+    assert sys.modules["lazy_game_plugin"].LOADS == ["table"]
+
+
+def test_register_decorator_and_errors():
+    plugins = PluginRegistry()
+
+    @plugins.register(COMPONENT)
+    class Meeple(Component):
+        pass
+
+    assert plugins.load(COMPONENT, "Meeple") is Meeple
+    with pytest.raises(PluginError):
+        plugins.load(GAME, "missing")
+    plugins.declare(GAME, "broken", "no_such_module_here:new_game")
+    with pytest.raises(PluginError):
+        plugins.load(GAME, "broken")
+    with pytest.raises(ValueError):
+        plugins.declare("ruleset", "x", "module:attribute")
+    assert plugins.load_entry_points({GAME: "bg_lib.tests.no_such_group"}) == 0
+
+
+def test_builtin_games_load_lazily_and_quietly():
+    code = ("import sys, plugins; assert 'examples.mottainai' not in sys.modules; "
+            "game = plugins.registry.create('game', 'mottainai'); print(len(game.players))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "2\n"
+    assert registry.load(ACTION, "move_card").__name__ == "MoveCard"
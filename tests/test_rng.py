@@ -0,0 +1,28 @@
+import pickle
+
+from rng import RandomStream, derive_seed
+
+
+def test_spawned_streams_depend_only_on_seed_and_key():
+    root = RandomStream(42)
+    child = root.spawn("deck")
+    root.random()
+    assert root.spawn("deck").random() == child.random()
+    assert RandomStream(42).spawn("deck").seed_value == derive_seed(42, "deck")
+    workers = RandomStream(42).spawn_many(3)
+    assert len({worker.seed_value for worker in workers}) == 3
+    assert workers[1].seed_value == root.spawn(1).seed_value
+
+
+def test_unseeded_stream_records_its_seed():
+    stream = RandomStream()
+    replay = RandomStream(stream.seed_value)
+    assert [stream.random() for _ in range(3)] == [replay.random() for _ in range(3)]
+
+
+def test_pickled_stream_keeps_seed_and_state():
+    stream = RandomStream(9)
+    stream.random()
+    copy = pickle.loads(pickle.dumps(stream))
+    assert copy.seed_value == 9
+    assert copy.random() == stream.random()
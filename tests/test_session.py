@@ -0,0 +1,212 @@
+import asyncio
+import random
+
+import pytest
+
+import snapshot
+from component import Card
+from container import Deck
+from controller.action import FlipCard, MoveCard
+from game import CardGame
+from player import Player
+from session import SessionError, SessionHost
+
+
+def new_game(cards=10):
+    return CardGame(players=[Player("A")], deck=Deck(components=[Card(f"Card {i}") for i in range(cards)]))
+
+
+def draw(session):
+    game = session.game
+    return MoveCard(game.deck.peek()[0], game.deck.get_components(), game.players[0].hand.get_components())
+
+
+def test_commands_of_a_session_run_in_order():
+    async def main():
+        async with SessionHost(quantum=3) as host:
+            host.open("t", new_game())
+            order = []
+
+            async def client(name, count):
+                for i in range(count):
+                    await asyncio.sleep(0)
+                    await host.submit("t", lambda session, tag=(name, i): order.append(tag))
+
+            await asyncio.gather(*(client(name, 20) for name in "abc"))
+            futures = [host.submit_nowait("t", draw) for _ in range(4)]
+            await asyncio.gather(*futures)
+            return host, order
+
+    host, order = asyncio.run(main())
+    for name in "abc":
+        assert [i for tag, i in order if tag == name] == list(range(20))
+    game = host.sessions["t"].game
+    assert [card.name for card in game.players[0].hand.get_components()] == [f"Card {i}" for i in range(4)]
+    assert host.sessions["t"].stats.completed == 64
+
+
+def test_busy_session_does_not_starve_others():
+    async def main():
+        host = SessionHost(quantum=8)
+        host.open("busy", new_game())
+        host.open("light", new_game())
+        finished = []
+        busy = [host.submit_nowait("busy", lambda session: finished.append("busy")) for _ in range(500)]
+        light = [host.submit_nowait("light", lambda session: finished.append("light")) for _ in range(5)]
+        async with host:
+            await asyncio.gather(*busy, *light)
+        return finished
+
+    finished = asyncio.run(main())
+    last_light = len(finished) - finished[::-1].index("light")
+    assert last_light <= 8 + 5
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_idle_sessions_are_evicted_and_restored():
+    async def main():
+        clock = FakeClock()
+        host = SessionHost(idle_timeout=10, sweep_interval=0, clock=clock)
+        async with host:
+            host.open("idle", new_game())
+            host.open("active", new_game())
+            await host.submit("idle", draw)
+            clock.now = 8
+            await host.submit("active", draw)
+            clock.now = 12
+            assert host.evict_idle() == 1
+            assert host.sessions["idle"].evicted and host.sessions["idle"].game is None
+            assert not host.sessions["active"].evicted
+
+            await host.submit("idle", lambda session: FlipCard(session.game.players[0].hand.get_components()[0]))
+            session = host.sessions["idle"]
+            assert not session.evicted
+            assert session.stats.to_dict()["evictions"] == session.stats.restores == 1
+            return host.close("idle")
+
+    game = asyncio.run(main())
+    assert game.deck.deck_size() == 9
+    assert not game.players[0].hand.get_components()[0].front_side_up
+
+
+def test_max_live_evicts_least_recently_used():
+    async def main():
+        async with SessionHost(max_live=2) as host:
+            for name in "abc":
+                host.open(name, new_game())
+            assert host.sessions["a"].evicted
+            await host.submit("a", draw)
+            return {name: session.evicted for name, session in host.sessions.items()}
+
+    assert asyncio.run(main()) == {"a": False, "b": True, "c": False}
+
+
+def test_max_live_with_example_games():
+    from examples import blackjack, mottainai
+
+    async def main():
+        async with SessionHost(max_live=1) as host:
+            host.open("mottainai", mottainai.new_game())
+            host.open("blackjack", blackjack.new_game())
+            assert host.sessions["mottainai"].evicted and not host.sessions["blackjack"].evicted
+            await host.submit("mottainai", lambda session: None)
+            assert host.sessions["blackjack"].evicted
+            return host.close("mottainai"), host.close("blackjack")
+
+    game, other = asyncio.run(main())
+    assert [player.name for player in game.players] == ["Me", "You"]
+    assert len(game.players[0].tableau.get_components()) == 4
+    assert other.deck.deck_size() == 52
+
+
+def unsnapshottable_game():
+    game = new_game()
+    game.notes = (note for note in ())
+    return game
+
+
+def test_open_is_rolled_back_when_eviction_fails():
+    host = SessionHost(max_live=1)
+    host.open("stuck", unsnapshottable_game())
+    with pytest.raises(snapshot.SnapshotError):
+        host.open("new", new_game())
+    assert list(host.sessions) == ["stuck"] and not host.sessions["stuck"].evicted
+    # Not left half-open: a retry fails the same way rather than as a duplicate.
+    with pytest.raises(snapshot.SnapshotError):
+        host.open("new", new_game())
+
+
+def test_sweeper_survives_a_failed_eviction(caplog):
+    async def main():
+        clock = FakeClock()
+        async with SessionHost(idle_timeout=10, sweep_interval=0.001, clock=clock) as host:
+            host.open("stuck", unsnapshottable_game())
+            host.open("idle", new_game())
+            clock.now = 20
+            await asyncio.sleep(0.02)
+            assert not host.sessions["stuck"].evicted and host.sessions["idle"].evicted
+            host.open("later", new_game())
+            clock.now = 40
+            await asyncio.sleep(0.02)
+            assert host.sessions["later"].evicted
+
+    asyncio.run(main())
+    assert "Could not evict idle session 'stuck'" in caplog.text
+
+
+def test_failures_stats_and_closing():
+    async def main():
+        async with SessionHost() as host:
+            host.open("t", new_game(cards=1))
+            await host.submit("t", draw)
+            with pytest.raises(ValueError):
+                await host.submit("t", lambda session: session.game.deck.draw_card())
+            await host.undo("t")
+            assert host.sessions["t"].game.deck.deck_size() == 1
+            await host.redo("t")
+            with pytest.raises(SessionError):
+                host.open("t", new_game())
+            report = host.report()
+            stats = host.stats()["t"]
+            pending = host.submit_nowait("t", draw)
+            host.close("t")
+            with pytest.raises(SessionError):
+                await pending
+            with pytest.raises(KeyError):
+                host.submit_nowait("t", draw)
+            return stats, report
+
+    stats, report = asyncio.run(main())
+    assert (stats["submitted"], stats["completed"], stats["failed"]) == (4, 3, 1)
+    assert stats["latency"]["count"] == 4
+    assert stats["throughput"] > 0
+    assert report.splitlines()[1].startswith("t ")
+
+
+def test_many_simulated_tables():
+    async def main():
+        async with SessionHost(quantum=4, max_live=50) as host:
+            for table in range(200):
+                host.open(table, new_game(cards=20))
+
+            async def client(table, rng):
+                for _ in range(5):
+                    await host.submit(table, draw)
+                    await asyncio.sleep(rng.random() / 1000)
+
+            await asyncio.gather(*(client(table, random.Random(table)) for table in range(200)))
+            return host
+
+    host = asyncio.run(main())
+    assert all(session.stats.completed == 5 for session in host.sessions.values())
+    assert sum(not session.evicted for session in host.sessions.values()) <= 50
+    for table, session in host.sessions.items():
+        if not session.evicted:
+            assert session.game.deck.deck_size() == 15
@@ -0,0 +1,46 @@
+import pytest
+
+from simulation.blackjack import BasicStrategy, BlackjackRules, StandOnStrategy, run_simulation
+from simulation.stats import RunningStats
+
+
+def test_running_stats_merge_matches_single_pass():
+    values = [1.0, -1.0, 0.0, 1.5, -1.0, -1.0, 1.0]
+    whole = RunningStats()
+    for value in values:
+        whole.push(value)
+    left, right = RunningStats(), RunningStats()
+    for value in values[:3]:
+        left.push(value)
+    for value in values[3:]:
+        right.push(value)
+    left.merge(right)
+    assert left.count == whole.count
+    assert abs(left.mean - whole.mean) < 1e-12
+    assert abs(left.variance - whole.variance) < 1e-12
+
+
+def test_simulation_is_reproducible_across_worker_counts():
+    serial = run_simulation(2000, seed=7, workers=1, chunk_size=500)
+    parallel = run_simulation(2000, seed=7, workers=2, chunk_size=500)
+    assert serial == parallel
+    assert serial.rounds == 2000
+    assert serial.wins + serial.losses + serial.pushes == 2000
+
+
+def test_strategies_are_pluggable():
+    basic = run_simulation(5000, BasicStrategy(), seed=3, workers=1)
+    # never hits a total of 12 or more, so it can never bust
+    timid = run_simulation(5000, StandOnStrategy(threshold=12), seed=3, workers=1)
+    assert timid.bust_rate == 0.0
+    assert 0.0 < basic.bust_rate < 1.0
+
+
+def test_single_deck_shoe_dealt_to_the_last_card():
+    for penetration in (0.85, 0.95, 1.0):
+        rules = BlackjackRules(number_of_decks=1, penetration=penetration)
+        for strategy in (BasicStrategy(), StandOnStrategy(21)):
+            stats = run_simulation(2000, strategy, rules, seed=5, workers=1)
+            assert stats.wins + stats.losses + stats.pushes == 2000
+    with pytest.raises(ValueError):
+        BlackjackRules(penetration=1.5)
@@ -0,0 +1,147 @@
+import marshal
+
+import pytest
+
+import snapshot
+from component import Card, CompactStandardPlayingCard, IdAllocator, Piece, use_id_allocator
+from container import Board, Container, ContainerContainer, Deck, Hand
+from examples.blackjack import create_blackjack_deck
+from game import CardGame
+from player import Player
+from snapshot import SnapshotArchive, SnapshotError
+
+
+def dealt_game(number_of_decks=1):
+    game = CardGame(players=[Player("A"), Player("B")], deck=create_blackjack_deck(number_of_decks))
+    for player in game.players:
+        for card in game.deck.draw_card(2):
+            player.hand.add_component(card)
+    game.players[0].hand.get_components()[0].flip()
+    return game
+
+
+def payload(data):
+    return marshal.loads(data[snapshot._HEADER.size:])
+
+
+def test_game_round_trip_keeps_ids_and_state():
+    game = dealt_game()
+    loaded = snapshot.loads(snapshot.dumps(game))
+    assert loaded == game
+    assert loaded is not game
+    assert [card.id for card in loaded.deck] == [card.id for card in game.deck]
+    assert not loaded.players[0].hand.get_components()[0].front_side_up
+    assert loaded.deck.draw_card()[0] == game.deck.draw_card()[0]
+
+
+def test_definitions_are_stored_once():
+    data = snapshot.dumps(dealt_game(number_of_decks=6))
+    layouts, definitions, count, groups, root = payload(data)
+    assert sum(map(len, definitions)) == 52
+    assert count == 6 * 52 + 6
+
+
+def test_shared_objects_stay_shared():
+    card = Card("shared")
+    first, second = Hand(components=[card]), Hand(components=[card])
+    loaded_first, loaded_second = snapshot.loads(snapshot.dumps([first, second]))
+    assert loaded_first.get_components()[0] is loaded_second.get_components()[0]
+
+
+def test_board_and_tableau_indexes_work_after_loading():
+    board = Board(width=3, height=2, board_type="hex")
+    board.get_cell(2, 1).add_component(Piece("pawn"))
+    tableau = ContainerContainer(containers=[Container(name="stock"), Container(name="waste", indexed=True)])
+    tableau.get_child("waste").add_component(Card("x"))
+    assert tableau.get_child("waste").contains(tableau.get_child("waste").get_components()[0])
+
+    loaded_board, loaded_tableau = snapshot.loads(snapshot.dumps((board, tableau)))
+    assert loaded_board.get_cell(2, 1).get_components()[0].name == "pawn"
+    assert loaded_board.neighbors(0, 0) == board.neighbors(0, 0)
+    waste = loaded_tableau.get_child("waste")
+    assert waste._index is None
+    assert waste.contains(waste.get_components()[0])
+    assert loaded_tableau.resolve("stock") is loaded_tableau.containers[0]
+
+
+def test_compact_components_and_integer_ids():
+    with use_id_allocator(IdAllocator()):
+        deck = Deck(components=[CompactStandardPlayingCard(name=f"{v} of Hearts", suit="Hearts", value=v)
+                                for v in ("2", "3", "4")])
+    deck.draw_card()
+    loaded = snapshot.loads(snapshot.dumps(deck))
+    assert [card.id for card in loaded] == [1, 2]
+    assert loaded.get_components() == deck.get_components()
+
+
+def test_rejects_foreign_or_unknown_data():
+    data = snapshot.dumps(Card("x"))
+    with pytest.raises(SnapshotError):
+        snapshot.loads(b"XXXX" + data[4:])
+    with pytest.raises(SnapshotError):
+        snapshot.loads(data[:4] + bytes([snapshot.VERSION + 1]) + data[5:])
+    with pytest.raises(SnapshotError):
+        snapshot.loads(data[:-3])
+    with pytest.raises(SnapshotError):
+        snapshot.dumps(Container(components=[object()]))
+
+
+def test_archive_random_access_and_append(tmp_path):
+    path = str(tmp_path / "games.bgla")
+    games = []
+    with SnapshotArchive(path, "w") as archive:
+        for _ in range(20):
+            games.append(dealt_game())
+            archive.append(games[-1])
+    with SnapshotArchive(path, "a") as archive:
+        games.append(dealt_game())
+        assert archive.append(games[-1]) == 20
+
+    with SnapshotArchive(path) as archive:
+        assert len(archive) == 21
+        assert archive[7] == games[7]
+        assert archive[-1] == games[-1]
+        assert snapshot.loads(archive.raw(3)) == games[3]
+        with pytest.raises(IndexError):
+            archive[21]
+
+
+def test_unclosed_archive_cannot_be_read(tmp_path):
+    path = str(tmp_path / "partial.bgla")
+    archive = SnapshotArchive(path, "w")
+    archive.append(Card("x"))
+    archive._file.flush()
+    with pytest.raises(SnapshotError):
+        SnapshotArchive(path)
+    archive.close()
+
+
+def test_deck_rng_and_lazy_shuffle_survive_a_round_trip():
+    from rng import RandomStream
+    deck = Deck(components=[Card(str(i)) for i in range(30)], rng=RandomStream(8), lazy_shuffle=True)
+    deck.shuffle()
+    deck.draw_card(3)
+    loaded = snapshot.loads(snapshot.dumps(deck))
+    assert loaded.rng.seed_value == 8
+    assert [card.name for card in loaded.draw_card(10)] == [card.name for card in deck.draw_card(10)]
+
+
+def test_mottainai_game_round_trip_keeps_controller_history():
+    from collections import deque
+    from controller.action import MoveCard
+    from examples.mottainai import MottainaiGame, new_game
+    game = new_game()
+    game.floor.add_component(Card("Crane"))
+    game.floor.add_component(Card("Bell"))
+    game.action_controller.execute(MoveCard(game.floor.get_components()[0], game.floor, game.players[0].hand))
+    game.action_controller.undo_stack = deque(game.action_controller.undo_stack, 5)
+
+    loaded = snapshot.loads(snapshot.dumps(game))
+    assert isinstance(loaded, MottainaiGame)
+    assert [player.name for player in loaded.players] == ["Me", "You"]
+    assert [comp.name for comp in loaded.players[0].tableau.get_components()] == \
+        ["task", "craft_bench", "left_wing", "right_wing"]
+    assert loaded.action_controller.undo_stack.maxlen == 5
+    loaded.action_controller.undo()
+    assert [card.name for card in loaded.floor.get_components()] == ["Crane", "Bell"]
+    assert loaded.players[0].hand.get_components() == []
@@ -0,0 +1,83 @@
+from component import Piece
+from container import Board
+from spatial import SpatialQueries, distance, line
+
+
+def wall(board, cells):
+    for x, y in cells:
+        board.get_cell(x, y).add_component(Piece("Wall"))
+
+
+def test_square_shortest_path_goes_around_walls():
+    board = Board(width=5, height=5, board_type="square")
+    wall(board, [(2, 0), (2, 1), (2, 2), (2, 3)])
+    queries = SpatialQueries(board)
+    path = queries.shortest_path((0, 0), (4, 0))
+    assert path[0] == (0, 0) and path[-1] == (4, 0)
+    assert (2, 4) in path
+    assert len(path) == 13
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+
+
+def test_path_blocked_returns_none():
+    board = Board(width=3, height=3, board_type="square")
+    wall(board, [(1, 0), (1, 1), (1, 2)])
+    assert SpatialQueries(board).shortest_path((0, 0), (2, 2)) is None
+
+
+def test_hex_reachable_and_distance():
+    board = Board(width=7, height=7, board_type="hex")
+    queries = SpatialQueries(board)
+    reach = queries.reachable((3, 3), 2)
+    assert len(reach) == 19
+    assert all(distance(board, (3, 3), cell) == moves for cell, moves in reach.items())
+
+    wall(board, board.neighbors(3, 3))
+    assert queries.reachable((3, 3), 2) == {(3, 3): 0}
+
+
+def test_line_of_sight():
+    board = Board(width=5, height=5, board_type="square")
+    queries = SpatialQueries(board)
+    assert line(board, (0, 0), (4, 2))[0] == (0, 0)
+    assert queries.line_of_sight((0, 0), (4, 0))
+    wall(board, [(2, 0)])
+    assert not queries.line_of_sight((0, 0), (4, 0))
+
+    hex_board = Board(width=5, height=5, board_type="hex")
+    hex_line = line(hex_board, (0, 0), (4, 4))
+    assert len(hex_line) == distance(hex_board, (0, 0), (4, 4)) + 1
+    for a, b in zip(hex_line, hex_line[1:]):
+        assert b in hex_board.neighbors(*a)
+
+
+def test_cache_invalidated_only_by_involved_cells():
+    board = Board(width=20, height=20, board_type="square")
+    queries = SpatialQueries(board)
+    queries.reachable((2, 2), 2)
+    queries.reachable((2, 2), 2)
+    assert (queries.hits, queries.misses) == (1, 1)
+
+    wall(board, [(15, 15)])  # far away from the query
+    queries.reachable((2, 2), 2)
+    assert (queries.hits, queries.misses) == (2, 1)
+
+    wall(board, [(3, 2)])
+    reach = queries.reachable((2, 2), 2)
+    assert (queries.hits, queries.misses) == (2, 2)
+    assert (3, 2) not in reach
+
+
+def test_cached_answers_are_copies_and_involve_each_cell_once():
+    board = Board(width=8, height=8, board_type="square")
+    wall(board, [(3, y) for y in range(6)])
+    queries = SpatialQueries(board)
+    path = queries.shortest_path((0, 0), (7, 0))
+    path.clear()
+    queries.reachable((0, 0), 3).clear()
+    assert queries.shortest_path((0, 0), (7, 0))[-1] == (7, 0)
+    assert (0, 0) in queries.reachable((0, 0), 3)
+    assert queries.hits == 2
+    for _, involved, _ in queries._cache.values():
+        assert len(involved) == len(set(involved))
@@ -0,0 +1,117 @@
+import random
+
+from component import Card, CompactCard, IdAllocator, use_id_allocator
+from container import Board, Container, ContainerContainer, Deck
+from controller.action import FlipCard, MoveCard, MoveCards
+from controller.controller import ActionController
+from game import CardGame
+from player import Player
+from zobrist import TranspositionTable, ZobristHasher, zobrist_hash
+
+
+def build_game():
+    with use_id_allocator(IdAllocator()):
+        cards = [CompactCard(f"Card {i}") for i in range(30)]
+        return CardGame(players=[Player("A"), Player("B")], deck=Deck(components=cards))
+
+
+def test_incremental_hash_matches_full_hash():
+    game = build_game()
+    controller = ActionController()
+    rng = random.Random(4)
+    with ZobristHasher(game) as hasher:
+        start = hasher.value
+        for _ in range(300):
+            roll = rng.random()
+            hands = [player.hand for player in game.players]
+            held = [card for hand in hands for card in hand.get_components()]
+            if roll < 0.3 and game.deck.deck_size():
+                controller.execute(MoveCard(game.deck.peek()[0], game.deck, rng.choice(hands)))
+            elif roll < 0.4 and game.deck.deck_size() >= 2:
+                # Plain component lists are followed through the action events.
+                cards = game.deck.peek(2)
+                controller.execute(MoveCards(cards, game.deck.get_components(),
+                                             rng.choice(hands).get_components()))
+            elif roll < 0.55 and held:
+                controller.execute(FlipCard(rng.choice(held)))
+            elif roll < 0.8:
+                controller.undo()
+            else:
+                controller.redo()
+            assert hasher.value == hasher.recompute()
+        while controller.undo_stack:
+            controller.undo()
+        game.deck.shuffle()
+        assert hasher.value == start
+        game.players[0].hand.add_component(game.deck.draw_card()[0])
+        assert hasher.value != start and hasher.value == hasher.recompute()
+
+
+def test_moves_between_a_container_and_a_plain_list():
+    game = build_game()
+    controller = ActionController()
+    hand = game.players[0].hand
+    with ZobristHasher(game) as hasher:
+        start = hasher.value
+        card = game.deck.peek()[0]
+        controller.execute(MoveCard(card, game.deck, hand.get_components()))
+        assert hand.get_components() == [card]
+        assert hasher.value != start and hasher.value == hasher.recompute()
+        cards = game.deck.peek(2)
+        controller.execute(MoveCards(cards, game.deck, hand.get_components()))
+        assert hasher.value == hasher.recompute()
+        controller.execute(MoveCard(card, hand.get_components(), game.deck))
+        assert hasher.value == hasher.recompute()
+        while controller.undo_stack:
+            controller.undo()
+            assert hasher.value == hasher.recompute()
+        assert hasher.value == start
+
+
+def test_hash_distinguishes_placement_and_face():
+    game = build_game()
+    card = game.deck.peek()[0]
+    other = build_game()
+    assert zobrist_hash(game) == zobrist_hash(other)
+    game.players[0].hand.add_component(game.deck.draw_card()[0])
+    other.players[1].hand.add_component(other.deck.draw_card()[0])
+    assert zobrist_hash(game) != zobrist_hash(other)
+    before = zobrist_hash(game)
+    card.flip()
+    assert zobrist_hash(game) != before
+
+
+def test_hash_follows_child_containers_and_board_cells():
+    tableau = ContainerContainer()
+    board = Board(width=2, height=2, board_type="square")
+    state = Player("A")
+    state.hand.add_component(Card("In hand"))
+    with ZobristHasher([state, tableau, board]) as hasher:
+        pile = Container(components=[Card("Piled")])
+        tableau.add_component(pile)
+        cell = Container(components=[Card("On board")])
+        board.set_cell(1, 1, cell)
+        assert hasher.value == hasher.recompute()
+        tableau.remove_component(pile)
+        rebuilt = Deck(components=[Card("Old")])
+        board.set_cell(0, 0, rebuilt)
+        rebuilt.rebuild_and_shuffle([Card("New"), Card("Newer")])
+        assert hasher.value == hasher.recompute()
+        state.hand.clear_components()
+        assert hasher.value == hasher.recompute()
+
+
+def test_transposition_table_prefers_deep_results():
+    table = TranspositionTable(buckets=1)
+    table.store(1, "deep", depth=5)
+    table.store(2, "shallow", depth=1)
+    table.store(3, "newer", depth=0)
+    assert table.lookup(1) == "deep"
+    assert table.lookup(2) is None
+    assert table.lookup(3) == "newer"
+    assert table.lookup(1, min_depth=6) is None
+    table.store(1, "shallower", depth=2)
+    assert table.lookup(1) == "deep"
+    table.store(4, "deeper", depth=7)
+    assert table.lookup(4) == "deeper" and 1 not in table
+    assert len(table) == 2 and table.stats.replacements == 2
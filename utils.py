@@ -1,5 +1,60 @@
-from typing import Type
+import copy
+import uuid
+from typing import Any, Dict, Iterable, Optional, Type
 
 
 def type_as_string(data_type: Type) -> str:
     return data_type.__name__
+
+
+# Values of these types are immutable and shared between an object and its clones.
+_IMMUTABLE_TYPES = frozenset({type(None), bool, int, float, complex, str, bytes, uuid.UUID, type, range})
+
+
+def clone_value(value: Any, memo: Dict[int, Any]) -> Any:
+    """Copy ``value`` for a clone, sharing immutable values.
+
+    Objects with a ``clone(memo)`` method (components and containers) copy
+    themselves, built-in containers are copied element-wise, and anything else
+    falls back to ``copy.deepcopy`` with the same memo, so an object reachable
+    along two paths is copied once.
+    """
+    value_type = type(value)
+    if value_type in _IMMUTABLE_TYPES:
+        return value
+    copied = memo.get(id(value))
+    if copied is not None:
+        return copied
+    if isinstance(value, type):
+        return value
+    clone = getattr(value, "clone", None)
+    if clone is not None:
+        return clone(memo)
+    if value_type is list:
+        copied = memo[id(value)] = []
+        copied.extend([clone_value(item, memo) for item in value])
+        return copied
+    if value_type is dict:
+        copied = memo[id(value)] = {}
+        copied.update({key: clone_value(item, memo) for key, item in value.items()})
+        return copied
+    if value_type is set:
+        copied = memo[id(value)] = {clone_value(item, memo) for item in value}
+        return copied
+    return copy.deepcopy(value, memo)
+
+
+def clone_object(obj: Any, memo: Optional[Dict[int, Any]] = None, reset: Iterable[str] = ()) -> Any:
+    """Copy a plain (``__dict__``-based) object attribute by attribute with ``clone_value``.
+
+    Attributes named in ``reset`` (e.g. caches) are set to None on the copy.
+    """
+    memo = {} if memo is None else memo
+    copied = object.__new__(type(obj))
+    memo[id(obj)] = copied
+    attributes = copied.__dict__
+    for name, value in obj.__dict__.items():
+        attributes[name] = clone_value(value, memo)
+    for name in reset:
+        attributes[name] = None
+    return copied
@@ -0,0 +1,309 @@
+"""Incremental Zobrist hashing of game states, and a transposition table keyed on it.
+
+A ``ZobristHasher`` holds a 64-bit hash of one game state: the XOR of a key
+for every (component, container) placement, where a face-down component uses
+a different key from a face-up one. After one walk over the state it follows
+``events.bus``, so every change costs O(1) per component moved:
+
+- components added to or removed from containers, drawn from decks, cleared,
+  or put in a rebuilt deck, and whole containers added to or removed from a
+  ``ContainerContainer`` or set into a ``Board`` cell;
+- ``FlipCard`` actions, and ``MoveCard``/``MoveCards`` on plain component lists
+  of the state's containers, run through an ``ActionController``, including
+  their undo and redo.
+
+Containers are numbered in the order ``journal.ObjectTable`` reaches them, and
+containers that join the state later in the order they join; components are
+keyed by ``id``. States built the same way (with deterministic ids) therefore
+hash alike, and moves, flips and draws never renumber anything. The hash covers which container holds each component and which
+way up it is, not the order within a container: a shuffle leaves it unchanged.
+Faces changed without a ``FlipCard`` action (e.g. ``card.flip()``) are not
+seen; report them with ``flipped``.
+
+    with ZobristHasher(game) as hasher:
+        controller.execute(MoveCard(card, deck, hand))
+        table.store(hasher.value, evaluation, depth=3)
+"""
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from container import AbstractContainer, Container
+from controller.action import FlipCard, MoveCard, MoveCards, Transaction
+from controller.journal import ObjectTable
+from events import Event, bus
+
+_MASK = (1 << 64) - 1
+_FACE_DOWN = 0x9E3779B97F4A7C15
+
+EVENT_KINDS = ("container.add", "container.remove", "container.clear", "deck.draw", "deck.rebuild",
+               "board.set_cell", "action.execute", "action.undo", "action.redo")
+
+
+def _mix(value: int) -> int:
+    # splitmix64 finalizer: spreads every input bit over the whole 64-bit key.
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK
+    return value ^ (value >> 31)
+
+
+def _component_number(component_id: Any) -> int:
+    if isinstance(component_id, int):
+        return component_id & _MASK
+    if isinstance(component_id, uuid.UUID):
+        return component_id.int & _MASK ^ component_id.int >> 64
+    return hash(component_id) & _MASK
+
+
+class ZobristHasher:
+    def __init__(self, state: Any, seed: int = 0):
+        self.state = state
+        self.seed = seed
+        self.value = 0
+        self._containers: List[AbstractContainer] = []
+        self._handles: Dict[int, int] = {}
+        # XOR of the placement keys of each container's components, by handle.
+        self._contents: List[int] = []
+        # id(component) -> handle of the container holding it.
+        self._placed: Dict[int, int] = {}
+        self._list_handles: Dict[int, int] = {}
+        self._subscribed = False
+        self._attach(state)
+
+    def key(self, component: Any, handle: int) -> int:
+        """Placement key of ``component`` in the container with ``handle``, for its current face."""
+        number = _component_number(component.id) ^ self.seed
+        key = _mix(_mix(number) + handle + 1)
+        if not getattr(component, "front_side_up", True):
+            key ^= _mix(number ^ _FACE_DOWN)
+        return key
+
+    def _handle(self, container: AbstractContainer) -> int:
+        handle = self._handles.get(id(container))
+        if handle is None:
+            handle = self._handles[id(container)] = len(self._containers)
+            self._containers.append(container)
+            self._contents.append(0)
+        return handle
+
+    def _add(self, component: Any, handle: int):
+        key = self.key(component, handle)
+        self.value ^= key
+        self._contents[handle] ^= key
+        self._placed[id(component)] = handle
+
+    def _remove(self, component: Any, handle: int):
+        key = self.key(component, handle)
+        self.value ^= key
+        self._contents[handle] ^= key
+        self._placed.pop(id(component), None)
+
+    def _attach(self, root: Any):
+        for container in ObjectTable(root).containers:
+            handle = self._handle(container)
+            if isinstance(container, Container):
+                for component in container.get_components():
+                    self._add(component, handle)
+
+    def _detach(self, root: Any):
+        for container in ObjectTable(root).containers:
+            handle = self._handles.get(id(container))
+            if handle is None:
+                continue
+            self.value ^= self._contents[handle]
+            self._contents[handle] = 0
+            if isinstance(container, Container):
+                for component in container.get_components():
+                    self._placed.pop(id(component), None)
+
+    def flipped(self, component: Any):
+        """Account for a face change made outside a ``FlipCard`` action."""
+        handle = self._placed.get(id(component))
+        if handle is not None:
+            key = _mix(_component_number(component.id) ^ self.seed ^ _FACE_DOWN)
+            self.value ^= key
+            self._contents[handle] ^= key
+
+    def recompute(self) -> int:
+        """Hash of the state from scratch with the current container numbering, e.g. to check ``value``."""
+        value = 0
+        for container in ObjectTable(self.state).containers:
+            if isinstance(container, Container):
+                handle = self._handle(container)
+                for component in container.get_components():
+                    value ^= self.key(component, handle)
+        return value
+
+    def _list_handle(self, target: Any) -> Optional[int]:
+        if isinstance(target, AbstractContainer):
+            return None
+        handle = self._list_handles.get(id(target))
+        if handle is None:
+            for handle, container in enumerate(self._containers):
+                if isinstance(container, Container):
+                    self._list_handles[id(container.get_components())] = handle
+            handle = self._list_handles.get(id(target))
+        return handle
+
+    def _apply(self, action: Any, undo: bool):
+        if isinstance(action, FlipCard):
+            self.flipped(action.card)
+        elif isinstance(action, Transaction):
+            for child in action.actions:
+                self._apply(child, undo)
+        elif isinstance(action, (MoveCard, MoveCards)):
+            # Container sides arrive as container events; only plain list sides need handling here.
+            source, destination = self._list_handle(action.source), self._list_handle(action.destination)
+            if source is None and destination is None:
+                return
+            if isinstance(action, MoveCard):
+                if action._source_position is None:
+                    return
+                cards = (action.card,)
+            else:
+                cards = action.cards
+            if undo:
+                source, destination = destination, source
+            for card in cards:
+                if source is not None:
+                    self._remove(card, source)
+                if destination is not None:
+                    self._add(card, destination)
+
+    def __call__(self, event: Event):
+        kind = event.kind
+        if kind.startswith("action."):
+            self._apply(event.data, kind == "action.undo")
+            return
+        handle = self._handles.get(id(event.source))
+        if handle is None:
+            return
+        data = event.data
+        if kind == "container.add":
+            if isinstance(data, AbstractContainer):
+                self._attach(data)
+            else:
+                self._add(data, handle)
+        elif kind == "container.remove":
+            if isinstance(data, AbstractContainer):
+                self._detach(data)
+            else:
+                self._remove(data, handle)
+        elif kind == "container.clear" or kind == "deck.draw":
+            for item in data:
+                if isinstance(item, AbstractContainer):
+                    self._detach(item)
+                else:
+                    self._remove(item, handle)
+        elif kind == "deck.rebuild":
+            # The replaced cards are not reported, so drop the deck's whole contribution.
+            self.value ^= self._contents[handle]
+            self._contents[handle] = 0
+            for card in data:
+                self._add(card, handle)
+        elif kind == "board.set_cell":
+            _, _, previous, content = data
+            if previous is not None:
+                self._detach(previous)
+            if content is not None:
+                self._attach(content)
+
+    def attach(self) -> "ZobristHasher":
+        """Start following changes on ``events.bus``."""
+        if not self._subscribed:
+            bus.subscribe(self, EVENT_KINDS)
+            self._subscribed = True
+        return self
+
+    def close(self):
+        if self._subscribed:
+            bus.unsubscribe(self)
+            self._subscribed = False
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def zobrist_hash(state: Any, seed: int = 0) -> int:
+    """Hash of ``state`` computed from scratch."""
+    return ZobristHasher(state, seed).value
+
+
+@dataclass
+class TranspositionStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    replacements: int = 0
+
+
+class TranspositionTable:
+    """Fixed-size cache of search results keyed on 64-bit state hashes.
+
+    Each hash maps to a bucket of two slots. The first keeps the entry searched
+    to the greatest depth and is only replaced by an equal or deeper search;
+    the second always takes the newest entry. Deep, expensive results survive a
+    stream of shallow ones, recent positions stay findable, and memory stays
+    at ``2 * buckets`` entries however long the search runs.
+    """
+
+    def __init__(self, buckets: int = 1 << 16):
+        if buckets <= 0:
+            raise ValueError("A transposition table needs at least one bucket.")
+        self.buckets = buckets
+        self._keys: List[Optional[int]] = [None] * (2 * buckets)
+        self._depths: List[int] = [0] * (2 * buckets)
+        self._values: List[Any] = [None] * (2 * buckets)
+        self._size = 0
+        self.stats = TranspositionStats()
+
+    def _slot(self, key: int) -> Optional[int]:
+        slot = key % self.buckets * 2
+        keys = self._keys
+        if keys[slot] == key:
+            return slot
+        if keys[slot + 1] == key:
+            return slot + 1
+        return None
+
+    def lookup(self, key: int, min_depth: int = 0) -> Optional[Any]:
+        """The value stored for ``key`` from a search at least ``min_depth`` deep, or None."""
+        slot = self._slot(key)
+        if slot is None or self._depths[slot] < min_depth:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return self._values[slot]
+
+    def store(self, key: int, value: Any, depth: int = 0):
+        self.stats.stores += 1
+        slot = self._slot(key)
+        if slot is None:
+            slot = key % self.buckets * 2
+            if self._keys[slot] is not None and depth < self._depths[slot]:
+                slot += 1
+            if self._keys[slot] is None:
+                self._size += 1
+            else:
+                self.stats.replacements += 1
+        elif slot % 2 == 0 and depth < self._depths[slot]:
+            # Keep the deeper result already stored for this position.
+            return
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._values[slot] = value
+
+    def __contains__(self, key: int) -> bool:
+        return self._slot(key) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        self._keys = [None] * (2 * self.buckets)
+        self._depths = [0] * (2 * self.buckets)
+        self._values = [None] * (2 * self.buckets)
+        self._size = 0